@@ -31,6 +31,7 @@ class AdminUserListResponseDTO(BaseModel):
     page: int
     page_size: int
     total_pages: int
+    next_cursor: Optional[str] = None
 
 
 class AdminUserDetailDTO(BaseModel):
@@ -3,6 +3,7 @@
 
 from typing import List, Optional
 from pydantic import BaseModel
+from app.domain.entities.farm import PackedCoordinates
 
 class CoordinateDTO(BaseModel):
     lat: float
@@ -23,6 +24,7 @@ class FarmAreaUpdateDTO(BaseModel):
     crop_type: Optional[str] = None
 
 class FarmAreaResponseDTO(FarmAreaCreateDTO):
+    coordinates: PackedCoordinates
     id: int
     user_id: int
     
@@ -41,6 +43,6 @@ class CropDistributionDTO(BaseModel):
 class FarmLocationDTO(BaseModel):
     id: int
     name: str
-    coordinates: List[CoordinateDTO]
+    coordinates: PackedCoordinates
     crop_type: Optional[str] = None
     owner_name: str
@@ -19,3 +19,4 @@ class NDVIResponse(BaseModel):
     max_ndvi: float
     acquisition_date: str
     chart_data: List[dict] # List of {'date': str, 'value': float}
+    granularity: str = "raw"  # 'raw', or the rollup bucket of each chart point: 'week', 'month', 'season'
@@ -0,0 +1,26 @@
+# Copyright (c) 2025 CuongKenn and ICTU-OpenAgri Contributors
+# Licensed under the MIT License. See LICENSE file in the project root for full license information.
+
+from pydantic import BaseModel, Field
+from typing import List, Optional
+
+class BulkHistoryRequest(BaseModel):
+    """Request satellite history for several farms at once."""
+    farm_ids: Optional[List[int]] = Field(None, description="Farm IDs; omit for all of the caller's farms")
+    data_types: List[str] = ["NDVI", "SOIL_MOISTURE"]
+    start_date: str  # YYYY-MM-DD or ISO format
+    end_date: str    # YYYY-MM-DD or ISO format
+
+class BulkHistorySeries(BaseModel):
+    """One farm/data type series; dates[i] pairs with values[i] (null when not a number)."""
+    farm_id: int
+    data_type: str
+    dates: List[str]
+    values: List[Optional[float]]
+
+class BulkHistoryResponse(BaseModel):
+    """Shape of the streamed /satellite/history/bulk response (documentation only)."""
+    start_date: str
+    end_date: str
+    series: List[BulkHistorySeries]
+    error: Optional[str] = Field(None, description="Set when the stream was cut short; series may be incomplete")
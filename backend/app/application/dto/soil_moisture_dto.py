@@ -32,3 +32,4 @@ class SoilMoistureQueryResponse(BaseModel):
     max_value: float = 0.0
     acquisition_date: str = ""
     chart_data: List[dict] = []  # [{date, value}]
+    granularity: str = "raw"  # 'raw', or the rollup bucket of each chart point: 'week', 'month', 'season'
@@ -4,7 +4,7 @@
 """
 Weather API DTOs.
 """
-from typing import Optional, List
+from typing import Dict, Optional, List
 from pydantic import BaseModel, Field
 
 
@@ -58,6 +58,52 @@ class ForecastResponseDTO(BaseModel):
         from_attributes = True
 
 
+class HourlyWeatherColumnsDTO(BaseModel):
+    """Hourly weather data as parallel arrays; index i of each is hour time[i]."""
+    time: List[str]
+    temperature_2m: List[Optional[float]]
+    relative_humidity_2m: List[Optional[int]]
+    weather_code: List[Optional[int]]
+    wind_speed_10m: List[Optional[float]]
+    precipitation: List[Optional[float]]
+    soil_moisture_0_to_1cm: List[Optional[float]]
+
+
+class ColumnarForecastResponseDTO(BaseModel):
+    """Shape of the /weather/forecast?format=columnar response (documentation only)."""
+    location: LocationDTO
+    current: CurrentWeatherDTO
+    hourly: HourlyWeatherColumnsDTO
+
+
+class BatchForecastLocationDTO(BaseModel):
+    """A coordinate in a batch forecast request."""
+    latitude: float = Field(..., ge=-90, le=90)
+    longitude: float = Field(..., ge=-180, le=180)
+    name: Optional[str] = None
+
+
+class BatchForecastRequestDTO(BaseModel):
+    """Batch forecast request: farm IDs and/or explicit coordinates."""
+    farm_ids: Optional[List[int]] = Field(None, description="Farm IDs; omit both lists for all of your farms")
+    locations: Optional[List[BatchForecastLocationDTO]] = None
+    hours_ahead: int = Field(24, ge=1, le=240)
+
+
+class BatchForecastItemDTO(BaseModel):
+    """Forecast for one farm or requested location."""
+    farm_id: Optional[int] = None
+    location: LocationDTO
+    current: CurrentWeatherDTO
+    hourly: List[HourlyWeatherDTO]
+
+
+class BatchForecastResponseDTO(BaseModel):
+    """Batch forecast response, in request order (farms first)."""
+    forecasts: List[BatchForecastItemDTO]
+    count: int
+
+
 class LocationSearchDTO(BaseModel):
     """Location search result."""
     name: str
@@ -92,3 +138,73 @@ class ReverseGeocodeDTO(BaseModel):
     
     class Config:
         from_attributes = True
+
+
+class DailyWeatherDTO(BaseModel):
+    """Daily aggregates of archived hourly weather."""
+    date: str
+    hours: int
+    temperature_min: Optional[float] = None
+    temperature_max: Optional[float] = None
+    temperature_mean: Optional[float] = None
+    precipitation_sum: Optional[float] = None
+    relative_humidity_mean: Optional[float] = None
+    wind_speed_max: Optional[float] = None
+    humid_hours: int = Field(0, description="Hours with relative humidity >= 90%")
+
+
+class DailyWeatherHistoryResponseDTO(BaseModel):
+    """Daily weather history for a grid cell; days without data are omitted."""
+    latitude: float
+    longitude: float
+    start_date: str
+    end_date: str
+    days: List[DailyWeatherDTO]
+    count: int
+
+
+class AgroIndicesOptionsDTO(BaseModel):
+    """Parameters of the agro-meteorological indices."""
+    base_temp: float = Field(10.0, ge=-10, le=40, description="GDD base temperature (°C)")
+    upper_temp: Optional[float] = Field(None, ge=0, le=50, description="GDD upper cutoff (°C)")
+    wetness_rh: float = Field(90.0, ge=50, le=100, description="Relative humidity (%) counted as leaf wetness")
+    rain_windows: List[int] = Field([3, 7, 30], description="Rolling rainfall windows (days)")
+    past_days: int = Field(7, ge=0, description="Days of history to return")
+    forecast_days: int = Field(7, ge=1, description="Days from today on to return")
+
+
+class AgroIndicesBatchRequestDTO(AgroIndicesOptionsDTO):
+    """Agro indices for several farms."""
+    farm_ids: Optional[List[int]] = Field(None, description="Farm IDs; omit for all of your farms")
+
+
+class AgroIndicesDayDTO(BaseModel):
+    """Agro-meteorological indices for one local day."""
+    date: str
+    is_forecast: bool
+    temperature_min: Optional[float] = None
+    temperature_max: Optional[float] = None
+    gdd: Optional[float] = Field(None, description="Growing degree days (°C·day)")
+    gdd_cumulative: Optional[float] = Field(None, description="GDD summed from the first returned day")
+    et0: Optional[float] = Field(None, description="FAO-56 reference evapotranspiration (mm)")
+    leaf_wetness_hours: int
+    precipitation: float = Field(..., description="Daily precipitation (mm)")
+    rain_totals: Dict[str, Optional[float]] = Field(
+        ..., description="Rolling rainfall (mm) ending on this day, by window, e.g. '7d'"
+    )
+
+
+class AgroIndicesResponseDTO(BaseModel):
+    """Agro-meteorological indices for a grid cell (or a farm in it)."""
+    farm_id: Optional[int] = None
+    latitude: float
+    longitude: float
+    elevation: Optional[float] = None
+    days: List[AgroIndicesDayDTO]
+    count: int
+
+
+class AgroIndicesBatchResponseDTO(BaseModel):
+    """Agro indices per farm."""
+    results: List[AgroIndicesResponseDTO]
+    count: int
@@ -5,6 +5,7 @@
 Admin user management use cases.
 """
 from typing import Optional
+from datetime import datetime
 from math import ceil
 from sqlalchemy import select, func
 from app.application.use_cases.base import BaseUseCase
@@ -18,6 +19,15 @@ from app.application.dto.admin_user_dto import (
     AdminUserStatsDTO
 )
 from app.infrastructure.database.models.user_model import UserModel
+from app.infrastructure.cache.user_cache import invalidate_cached_user
+from app.infrastructure.cache.count_cache import USERS, cached_count, invalidate_counts
+from app.infrastructure.cache.admin_stats import (
+    get_admin_stats,
+    invalidate_admin_stats,
+    record_user_status_changed
+)
+from app.infrastructure.database.pagination import decode_cursor, encode_cursor
+from app.infrastructure.database.search_index import user_search_condition
 
 
 class ListUsersUseCase(BaseUseCase):
@@ -30,18 +40,22 @@ class ListUsersUseCase(BaseUseCase):
         self, 
         page: int = 1, 
         page_size: int = 10,
-        search: Optional[str] = None
+        search: Optional[str] = None,
+        cursor: Optional[str] = None
     ) -> AdminUserListResponseDTO:
         """
         List all users with pagination and optional search.
         
         Args:
-            page: Page number (1-indexed)
+            page: Page number (1-indexed), used when no cursor is given
             page_size: Number of items per page
             search: Optional search query for email, username, or full_name
-        """
-        skip = (page - 1) * page_size
+            cursor: Opaque ``next_cursor`` from the previous page; continues
+                after that row instead of using OFFSET
         
+        Raises:
+            ValueError: If the cursor is invalid
+        """
         # Get session from repository
         session = self.user_repository.session
         
@@ -49,24 +63,39 @@ class ListUsersUseCase(BaseUseCase):
         query = select(UserModel)
         
         # Add search filter if provided
-        if search:
-            search_filter = f"%{search}%"
+        if search and search.strip():
+            query = query.where(await user_search_condition(session, search))
+        
+        async def count() -> int:
+            result = await session.execute(select(func.count()).select_from(query.subquery()))
+            return result.scalar()
+        
+        # Total is cached briefly instead of counted on every page
+        total = await cached_count(USERS, search, count)
+        
+        # Newest first; id breaks ties so the order is total
+        if cursor:
+            created_at, last_id = decode_cursor(cursor, 2)
+            try:
+                created_at = datetime.fromisoformat(created_at)
+                last_id = int(last_id)
+            except (TypeError, ValueError) as e:
+                raise ValueError("Invalid pagination cursor") from e
             query = query.where(
-                (UserModel.email.ilike(search_filter)) |
-                (UserModel.username.ilike(search_filter)) |
-                (UserModel.full_name.ilike(search_filter))
+                (UserModel.created_at < created_at) |
+                ((UserModel.created_at == created_at) & (UserModel.id < last_id))
             )
-        
-        # Get total count
-        count_query = select(func.count()).select_from(query.subquery())
-        total_result = await session.execute(count_query)
-        total = total_result.scalar()
-        
-        # Get paginated results
-        query = query.offset(skip).limit(page_size).order_by(UserModel.created_at.desc())
+        else:
+            query = query.offset((page - 1) * page_size)
+        query = query.order_by(UserModel.created_at.desc(), UserModel.id.desc()).limit(page_size + 1)
         result = await session.execute(query)
         users = result.scalars().all()
         
+        next_cursor = None
+        if len(users) > page_size:
+            users = users[:page_size]
+            next_cursor = encode_cursor(users[-1].created_at, users[-1].id)
+        
         # Convert to DTOs
         user_dtos = [
             AdminUserListItemDTO.model_validate(user) for user in users
@@ -79,7 +108,8 @@ class ListUsersUseCase(BaseUseCase):
             total=total,
             page=page,
             page_size=page_size,
-            total_pages=total_pages
+            total_pages=total_pages,
+            next_cursor=next_cursor
         )
 
 
@@ -135,6 +165,9 @@ class DeleteUserUseCase(BaseUseCase):
         if not success:
             raise ValueError(f"Failed to delete user with ID {user_id}")
         
+        invalidate_cached_user(user_id)
+        invalidate_counts(USERS)
+        invalidate_admin_stats()
         return True
 
 
@@ -161,12 +194,16 @@ class UpdateUserStatusUseCase(BaseUseCase):
             raise ValueError(f"User with ID {user_id} not found")
         
         # Update status
+        was_active = user.is_active
         user.is_active = status_dto.is_active
         updated_user = await self.user_repository.update(user_id, user)
         
         if not updated_user:
             raise ValueError(f"Failed to update user with ID {user_id}")
         
+        invalidate_cached_user(user_id)
+        record_user_status_changed(was_active, updated_user.is_active)
+        
         return AdminUserDetailDTO(
             id=updated_user.id,
             email=updated_user.email,
@@ -187,29 +224,11 @@ class GetUserStatsUseCase(BaseUseCase):
     
     async def execute(self) -> AdminUserStatsDTO:
         """Get statistics about users in the system."""
-        session = self.user_repository.session
-        
-        # Total users
-        total_query = select(func.count()).select_from(UserModel)
-        total_result = await session.execute(total_query)
-        total_users = total_result.scalar()
-        
-        # Active users
-        active_query = select(func.count()).select_from(UserModel).where(UserModel.is_active == True)
-        active_result = await session.execute(active_query)
-        active_users = active_result.scalar()
-        
-        # Inactive users
-        inactive_users = total_users - active_users
-        
-        # Superusers
-        super_query = select(func.count()).select_from(UserModel).where(UserModel.is_superuser == True)
-        super_result = await session.execute(super_query)
-        superusers = super_result.scalar()
+        stats = await get_admin_stats(self.user_repository.session)
         
         return AdminUserStatsDTO(
-            total_users=total_users,
-            active_users=active_users,
-            inactive_users=inactive_users,
-            superusers=superusers
+            total_users=stats.total_users,
+            active_users=stats.active_users,
+            inactive_users=stats.inactive_users,
+            superusers=stats.superusers
         )
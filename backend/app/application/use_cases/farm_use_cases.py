@@ -2,16 +2,18 @@
 # Licensed under the MIT License. See LICENSE file in the project root for full license information.
 
 from typing import List, Optional
-from app.domain.entities.farm import FarmArea, Coordinate
+from app.domain.entities.farm import FarmArea, PackedCoordinates
 from app.application.dto.farm_dto import FarmAreaCreateDTO, FarmAreaUpdateDTO
 from app.domain.repositories.farm_repository import FarmRepository
+from app.infrastructure.cache.count_cache import FARMS, invalidate_counts
+from app.infrastructure.cache.admin_stats import invalidate_admin_stats, record_farm_created
 
 class CreateFarmAreaUseCase:
     def __init__(self, farm_repository: FarmRepository):
         self.farm_repository = farm_repository
 
     async def execute(self, user_id: int, dto: FarmAreaCreateDTO) -> FarmArea:
-        coordinates = [Coordinate(lat=c.lat, lng=c.lng) for c in dto.coordinates]
+        coordinates = PackedCoordinates.from_coordinates(dto.coordinates)
         
         farm = FarmArea(
             name=dto.name,
@@ -22,7 +24,10 @@ class CreateFarmAreaUseCase:
             user_id=user_id
         )
         
-        return await self.farm_repository.save(farm)
+        saved = await self.farm_repository.save(farm)
+        invalidate_counts(FARMS)
+        record_farm_created(saved.crop_type)
+        return saved
 
 class GetUserFarmsUseCase:
     def __init__(self, farm_repository: FarmRepository):
@@ -38,9 +43,9 @@ class UpdateFarmAreaUseCase:
     async def execute(self, farm_id: int, user_id: int, dto: FarmAreaUpdateDTO) -> Optional[FarmArea]:
         coordinates = None
         if dto.coordinates is not None:
-            coordinates = [Coordinate(lat=c.lat, lng=c.lng) for c in dto.coordinates]
+            coordinates = PackedCoordinates.from_coordinates(dto.coordinates)
         
-        return await self.farm_repository.update(
+        updated = await self.farm_repository.update(
             farm_id=farm_id,
             user_id=user_id,
             name=dto.name,
@@ -49,10 +54,17 @@ class UpdateFarmAreaUseCase:
             area_size=dto.area_size,
             crop_type=dto.crop_type
         )
+        if updated is not None and dto.crop_type is not None:
+            invalidate_admin_stats()
+        return updated
 
 class DeleteFarmAreaUseCase:
     def __init__(self, farm_repository: FarmRepository):
         self.farm_repository = farm_repository
 
     async def execute(self, farm_id: int, user_id: int) -> bool:
-        return await self.farm_repository.delete(farm_id, user_id)
+        deleted = await self.farm_repository.delete(farm_id, user_id)
+        if deleted:
+            invalidate_counts(FARMS)
+            invalidate_admin_stats()
+        return deleted
@@ -17,6 +17,7 @@ from app.infrastructure.image_processing.ndvi_processing import find_band_paths,
 from app.infrastructure.image_processing.utils import convert_tiff_to_base64_png
 from app.infrastructure.config.settings import get_settings
 from app.infrastructure.repositories.satellite_repository_impl import SatelliteRepositoryImpl
+from app.infrastructure.database.satellite_rollups import choose_granularity, rollup_chart_point
 from app.infrastructure.database.models.satellite_data_model import SatelliteDataModel
 
 settings = get_settings()
@@ -136,12 +137,18 @@ class CalculateNDVIUseCase:
             
             # --- CHECK DB FIRST ---
             if req.farm_id:
-                history = await repo.get_data_by_farm(req.farm_id, 'NDVI', start_d, end_d)
-                if history:
-                    # Found data in DB - return without downloading
-                    chart_data = []
-                    latest_record = None
-                    
+                # Long ranges are served from pre-aggregated buckets
+                granularity = choose_granularity(start_d, end_d)
+                chart_data = []
+                latest_record = None
+                
+                if granularity:
+                    latest_record = await repo.get_latest_record(req.farm_id, 'NDVI', start_d, end_d)
+                    if latest_record:
+                        rollups = await repo.get_rollups(req.farm_id, 'NDVI', granularity, start_d, end_d)
+                        chart_data = [rollup_chart_point(r) for r in rollups]
+                else:
+                    history = await repo.get_data_by_farm(req.farm_id, 'NDVI', start_d, end_d)
                     for record in history:
                         chart_data.append({
                             'date': record.acquisition_date.strftime('%Y-%m-%d'),
@@ -151,8 +158,10 @@ class CalculateNDVIUseCase:
                             latest_record = record
                     
                     chart_data.sort(key=lambda x: x['date'])
-                    
-                    logger.info(f"Returning {len(history)} NDVI records from DB for farm {req.farm_id}")
+                
+                if latest_record:
+                    # Found data in DB - return without downloading
+                    logger.info(f"Returning {len(chart_data)} NDVI points ({granularity or 'raw'}) from DB for farm {req.farm_id}")
                     
                     return NDVIResponse(
                         status="success",
@@ -162,7 +171,8 @@ class CalculateNDVIUseCase:
                         min_ndvi=round(latest_record.min_value, 2) if latest_record.min_value else 0.0,
                         max_ndvi=round(latest_record.max_value, 2) if latest_record.max_value else 0.0,
                         acquisition_date=latest_record.acquisition_date.strftime('%Y-%m-%d'),
-                        chart_data=chart_data
+                        chart_data=chart_data,
+                        granularity=granularity or 'raw'
                     )
             
             # --- NO DATA IN DB - DOWNLOAD FROM SENTINEL ---
@@ -0,0 +1,121 @@
+# Copyright (c) 2025 CuongKenn and ICTU-OpenAgri Contributors
+# Licensed under the MIT License. See LICENSE file in the project root for full license information.
+
+import datetime
+import json
+import logging
+import math
+from typing import AsyncIterator, List, Optional, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.application.dto.satellite_history_dto import BulkHistoryRequest
+from app.infrastructure.database.database import AsyncSessionLocal
+from app.infrastructure.repositories.satellite_repository_impl import SatelliteRepositoryImpl
+
+logger = logging.getLogger(__name__)
+
+# Max farm IDs per request; "all my farms" (farm_ids omitted) is not capped
+MAX_BULK_FARMS = 500
+
+
+class StreamBulkHistoryUseCase:
+    """
+    Stream NDVI/soil moisture history for many farms as columnar JSON.
+
+    All series come from one query; rows are encoded as they arrive, so
+    memory is bounded by the longest single series rather than the
+    whole response.
+    """
+
+    def __init__(self, session_factory: async_sessionmaker[AsyncSession] = AsyncSessionLocal):
+        # The stream outlives request-scoped dependencies, so it opens its own session
+        self.session_factory = session_factory
+
+    async def execute(self, user_id: int, req: BulkHistoryRequest) -> AsyncIterator[bytes]:
+        """
+        Validate the request, start the query and return the response body iterator.
+
+        The first row is read before returning, so a failing query raises
+        here, before any response is sent.
+        """
+        try:
+            start_d = datetime.datetime.strptime(req.start_date.split('T')[0], '%Y-%m-%d').date()
+            end_d = datetime.datetime.strptime(req.end_date.split('T')[0], '%Y-%m-%d').date()
+        except ValueError:
+            raise HTTPException(status_code=400, detail='start_date and end_date must be YYYY-MM-DD')
+        if start_d > end_d:
+            raise HTTPException(status_code=400, detail='start_date must not be after end_date')
+        if not req.data_types:
+            raise HTTPException(status_code=400, detail='data_types must not be empty')
+        if req.farm_ids is not None and len(req.farm_ids) > MAX_BULK_FARMS:
+            raise HTTPException(status_code=400, detail=f'At most {MAX_BULK_FARMS} farm_ids per request')
+
+        session = self.session_factory()
+        rows = SatelliteRepositoryImpl(session).stream_history(
+            user_id, req.farm_ids, req.data_types, start_d, end_d
+        )
+        try:
+            first = await anext(rows, None)
+        except BaseException:
+            await rows.aclose()
+            await session.close()
+            raise
+        return self._stream(session, rows, first, start_d, end_d)
+
+    async def _stream(self, session: AsyncSession, rows: AsyncIterator[Tuple[int, str, datetime.date, float]],
+                      first: Optional[Tuple[int, str, datetime.date, float]],
+                      start_d: datetime.date, end_d: datetime.date) -> AsyncIterator[bytes]:
+        """
+        Encode the rows as they arrive. The status line is already sent, so
+        a database error mid-stream ends the document with an ``"error"``
+        member (the series before it may be incomplete) instead of
+        truncating it.
+        """
+        try:
+            yield (
+                '{"start_date":' + json.dumps(start_d.isoformat())
+                + ',"end_date":' + json.dumps(end_d.isoformat())
+                + ',"series":['
+            ).encode()
+
+            key = None
+            dates: List[str] = []
+            values: List[Optional[float]] = []
+            separator = ''
+            error = None
+
+            row = first
+            try:
+                while row is not None:
+                    farm_id, data_type, acquisition_date, mean_value = row
+                    if (farm_id, data_type) != key:
+                        if key is not None:
+                            yield (separator + self._encode_series(key, dates, values)).encode()
+                            separator = ','
+                        key = (farm_id, data_type)
+                        dates, values = [], []
+                    dates.append(acquisition_date.isoformat())
+                    values.append(mean_value)
+                    row = await anext(rows, None)
+            except Exception as e:
+                logger.error(f"Bulk history stream failed: {e}")
+                error = 'History stream interrupted; series may be incomplete'
+
+            if key is not None:
+                yield (separator + self._encode_series(key, dates, values)).encode()
+            yield (']' + (',"error":' + json.dumps(error) if error else '') + '}').encode()
+        finally:
+            await rows.aclose()
+            await session.close()
+
+    @staticmethod
+    def _encode_series(key: tuple, dates: List[str], values: List[Optional[float]]) -> str:
+        farm_id, data_type = key
+        # NaN/inf aren't valid JSON: missing values are null
+        values = [value if value is not None and math.isfinite(value) else None for value in values]
+        return json.dumps(
+            {"farm_id": farm_id, "data_type": data_type, "dates": dates, "values": values},
+            separators=(',', ':'), allow_nan=False
+        )
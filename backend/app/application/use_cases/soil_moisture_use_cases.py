@@ -18,6 +18,7 @@ from app.infrastructure.image_processing.soil_moisture_processing import find_s1
 from app.infrastructure.image_processing.utils import convert_tiff_to_base64_png
 from app.infrastructure.config.settings import get_settings
 from app.infrastructure.repositories.satellite_repository_impl import SatelliteRepositoryImpl
+from app.infrastructure.database.satellite_rollups import choose_granularity, rollup_chart_point
 
 settings = get_settings()
 
@@ -36,11 +37,18 @@ class GetSoilMoistureUseCase:
             repo = SatelliteRepositoryImpl(db)
             
             if req.farm_id:
-                history = await repo.get_data_by_farm(req.farm_id, 'SOIL_MOISTURE', start_d, end_d)
-                if history:
-                    chart_data = []
-                    latest_record = None
-                    
+                # Long ranges are served from pre-aggregated buckets
+                granularity = choose_granularity(start_d, end_d)
+                chart_data = []
+                latest_record = None
+                
+                if granularity:
+                    latest_record = await repo.get_latest_record(req.farm_id, 'SOIL_MOISTURE', start_d, end_d)
+                    if latest_record:
+                        rollups = await repo.get_rollups(req.farm_id, 'SOIL_MOISTURE', granularity, start_d, end_d)
+                        chart_data = [rollup_chart_point(r) for r in rollups]
+                else:
+                    history = await repo.get_data_by_farm(req.farm_id, 'SOIL_MOISTURE', start_d, end_d)
                     for record in history:
                         chart_data.append({
                             'date': record.acquisition_date.strftime('%Y-%m-%d'),
@@ -50,8 +58,9 @@ class GetSoilMoistureUseCase:
                             latest_record = record
                     
                     chart_data.sort(key=lambda x: x['date'])
-                    
-                    logger.info(f"Returning {len(history)} Soil Moisture records from DB for farm {req.farm_id}")
+                
+                if latest_record:
+                    logger.info(f"Returning {len(chart_data)} Soil Moisture points ({granularity or 'raw'}) from DB for farm {req.farm_id}")
                     
                     return SoilMoistureQueryResponse(
                         status="success",
@@ -59,7 +68,8 @@ class GetSoilMoistureUseCase:
                         min_value=round(latest_record.min_value, 2) if latest_record.min_value else 0.0,
                         max_value=round(latest_record.max_value, 2) if latest_record.max_value else 1.0,
                         acquisition_date=latest_record.acquisition_date.strftime('%Y-%m-%d'),
-                        chart_data=chart_data
+                        chart_data=chart_data,
+                        granularity=granularity or 'raw'
                     )
             
             # No data found
@@ -9,7 +9,11 @@ from app.application.use_cases.base import BaseUseCase
 from app.domain.entities.user import User
 from app.domain.repositories.user_repository import UserRepository
 from app.application.dto.user_dto import CreateUserDTO, UserDTO, UserLoginDTO, TokenDTO, ChangePasswordDTO
-from app.infrastructure.security.jwt import get_password_hash, verify_password, create_access_token
+from app.infrastructure.security.jwt import create_access_token
+from app.infrastructure.security.password_hasher import hash_password_async, verify_password_async
+from app.infrastructure.cache.user_cache import invalidate_cached_user
+from app.infrastructure.cache.count_cache import USERS, invalidate_counts
+from app.infrastructure.cache.admin_stats import record_user_created
 
 
 class CreateUserUseCase(BaseUseCase[CreateUserDTO, UserDTO]):
@@ -29,7 +33,7 @@ class CreateUserUseCase(BaseUseCase[CreateUserDTO, UserDTO]):
         user = User(
             email=input_dto.email,
             username=input_dto.username,
-            hashed_password=get_password_hash(input_dto.password),
+            hashed_password=await hash_password_async(input_dto.password),
             full_name=input_dto.full_name,
             is_active=True,
             is_superuser=False
@@ -37,6 +41,8 @@ class CreateUserUseCase(BaseUseCase[CreateUserDTO, UserDTO]):
         
         # Save to repository
         created_user = await self.user_repository.create(user)
+        invalidate_counts(USERS)
+        record_user_created(created_user.is_active, created_user.is_superuser)
         
         return UserDTO.from_entity(created_user)
 
@@ -50,7 +56,7 @@ class LoginUserUseCase(BaseUseCase[UserLoginDTO, TokenDTO]):
     async def execute(self, input_dto: UserLoginDTO) -> TokenDTO:
         """Authenticate user and return token."""
         user = await self.user_repository.get_by_email(input_dto.email)
-        if not user or not verify_password(input_dto.password, user.hashed_password):
+        if not user or not await verify_password_async(input_dto.password, user.hashed_password):
             raise ValueError("Incorrect email or password")
         
         if not user.is_active:
@@ -85,10 +91,11 @@ class ChangePasswordUseCase(BaseUseCase[ChangePasswordDTO, bool]):
         if not user:
             raise ValueError("User not found")
             
-        if not verify_password(input_dto.current_password, user.hashed_password):
+        if not await verify_password_async(input_dto.current_password, user.hashed_password):
             raise ValueError("Incorrect current password")
             
-        user.hashed_password = get_password_hash(input_dto.new_password)
+        user.hashed_password = await hash_password_async(input_dto.new_password)
         await self.user_repository.update(self.user_id, user)
+        invalidate_cached_user(self.user_id)
         return True
 
@@ -4,18 +4,37 @@
 """
 Weather use cases - business logic layer.
 """
+import asyncio
 import logging
-from typing import Optional, List, Dict, Any
-from datetime import datetime
+import math
+from typing import Optional, List, Dict, Any, Tuple
+from datetime import date, datetime, timedelta
 
+from app.domain.repositories.farm_repository import FarmRepository
+from app.domain.repositories.weather_archive_repository import WeatherArchiveRepository
+from app.infrastructure.agronomy.agro_indices import compute_agro_indices, local_date
+from app.infrastructure.cache.forecast_cache import snap_to_grid
+from app.infrastructure.config.settings import get_settings
+from app.infrastructure.geo.gazetteer import COUNTRY, COUNTRY_CODE, Gazetteer, GazetteerMatch, Place, get_gazetteer
+from app.infrastructure.geo.place_search import FUZZY, PlaceSearchIndex, get_place_search_index
 from app.infrastructure.external_services.weather_service import (
     OpenMeteoService,
     PhotonGeocodingService
 )
 from app.application.dto.weather_dto import (
+    AgroIndicesBatchRequestDTO,
+    AgroIndicesBatchResponseDTO,
+    AgroIndicesDayDTO,
+    AgroIndicesOptionsDTO,
+    AgroIndicesResponseDTO,
+    BatchForecastItemDTO,
+    BatchForecastRequestDTO,
+    BatchForecastResponseDTO,
     ForecastResponseDTO,
     LocationDTO,
     CurrentWeatherDTO,
+    DailyWeatherDTO,
+    DailyWeatherHistoryResponseDTO,
     HourlyWeatherDTO,
     LocationSearchResponseDTO,
     LocationSearchDTO,
@@ -23,6 +42,127 @@ from app.application.dto.weather_dto import (
 )
 
 logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+# Hourly variables of the columnar format and their fill value when
+# Open-Meteo returns a shorter array than ``time``
+HOURLY_COLUMNS = {
+    "temperature_2m": 0.0,
+    "relative_humidity_2m": 0,
+    "weather_code": 0,
+    "wind_speed_10m": 0.0,
+    "precipitation": 0.0,
+    "soil_moisture_0_to_1cm": 0.0,
+}
+
+
+# Hourly variables requested from the Open-Meteo archive and stored locally
+ARCHIVE_COLUMNS = ("temperature_2m", "relative_humidity_2m", "precipitation", "wind_speed_10m")
+
+
+def parse_current(forecast_data: Dict[str, Any]) -> CurrentWeatherDTO:
+    """Build the current weather DTO from an Open-Meteo forecast response."""
+    current = forecast_data.get("current", {})
+    return CurrentWeatherDTO(
+        time=current.get("time", ""),
+        temperature_2m=current.get("temperature_2m", 0.0),
+        relative_humidity_2m=current.get("relative_humidity_2m", 0),
+        weather_code=current.get("weather_code", 0),
+        wind_speed_10m=current.get("wind_speed_10m", 0.0),
+        precipitation=current.get("precipitation", 0.0),
+        is_day=current.get("is_day", 0)
+    )
+
+
+def forecast_columns(forecast_data: Dict[str, Any], hours_ahead: int) -> Dict[str, list]:
+    """
+    Hourly forecast as parallel arrays, sliced to ``hours_ahead``.
+
+    Values are passed through from Open-Meteo without per-row conversion;
+    arrays shorter than ``time`` are padded with the row format's defaults.
+    """
+    hourly = forecast_data.get("hourly", {})
+    times = hourly.get("time", [])[:hours_ahead]
+    columns = {"time": times}
+    for name, fill in HOURLY_COLUMNS.items():
+        values = hourly.get(name, [])[:len(times)]
+        if len(values) < len(times):
+            values = values + [fill] * (len(times) - len(values))
+        columns[name] = values
+    return columns
+
+
+def parse_forecast(
+    forecast_data: Dict[str, Any],
+    hours_ahead: int
+) -> Tuple[CurrentWeatherDTO, List[HourlyWeatherDTO]]:
+    """Build current and hourly DTOs from an Open-Meteo forecast response."""
+    current_weather = parse_current(forecast_data)
+    
+    # Parse hourly data
+    hourly = forecast_data.get("hourly", {})
+    hourly_times = hourly.get("time", [])
+    hourly_temps = hourly.get("temperature_2m", [])
+    hourly_humidity = hourly.get("relative_humidity_2m", [])
+    hourly_weather_code = hourly.get("weather_code", [])
+    hourly_wind_speed = hourly.get("wind_speed_10m", [])
+    hourly_precipitation = hourly.get("precipitation", [])
+    hourly_soil_moisture = hourly.get("soil_moisture_0_to_1cm", [])
+    
+    hourly_weather_list = []
+    for i in range(min(len(hourly_times), hours_ahead)):
+        hourly_weather_list.append(
+            HourlyWeatherDTO(
+                time=hourly_times[i] if i < len(hourly_times) else "",
+                temperature_2m=hourly_temps[i] if i < len(hourly_temps) else 0.0,
+                relative_humidity_2m=int(hourly_humidity[i]) if i < len(hourly_humidity) else 0,
+                weather_code=int(hourly_weather_code[i]) if i < len(hourly_weather_code) else 0,
+                wind_speed_10m=hourly_wind_speed[i] if i < len(hourly_wind_speed) else 0.0,
+                precipitation=hourly_precipitation[i] if i < len(hourly_precipitation) else 0.0,
+                soil_moisture_0_to_1cm=hourly_soil_moisture[i] if i < len(hourly_soil_moisture) else 0.0
+            )
+        )
+    
+    return current_weather, hourly_weather_list
+
+
+def archive_hours(archive_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Rows for the weather archive from an Open-Meteo archive response.
+    
+    Hours without a temperature (not yet published) are dropped, so their
+    days stay incomplete and are fetched again by the next backfill.
+    """
+    hourly = archive_data.get("hourly", {})
+    columns = {name: hourly.get(name) or [] for name in ARCHIVE_COLUMNS}
+    rows = []
+    for i, time_str in enumerate(hourly.get("time", [])):
+        values = {name: column[i] if i < len(column) else None for name, column in columns.items()}
+        if values["temperature_2m"] is None:
+            continue
+        moment = datetime.fromisoformat(time_str)
+        rows.append({"time": moment, "day": moment.date(), **values})
+    return rows
+
+
+def date_ranges(days: List[date], max_days: int) -> List[Tuple[date, date]]:
+    """Group sorted days into contiguous (first, last) ranges of at most ``max_days`` days."""
+    ranges: List[Tuple[date, date]] = []
+    for day in days:
+        if ranges:
+            first, last = ranges[-1]
+            if day == last + timedelta(days=1) and (day - first).days < max_days:
+                ranges[-1] = (first, day)
+                continue
+        ranges.append((day, day))
+    return ranges
+
+
+def _round(value: Optional[float]) -> Optional[float]:
+    if value is None or math.isnan(value):
+        return None
+    return round(float(value), 2)
 
 
 class GetWeatherForecastUseCase:
@@ -31,10 +171,12 @@ class GetWeatherForecastUseCase:
     def __init__(
         self,
         open_meteo_service: OpenMeteoService,
-        photon_service: PhotonGeocodingService
+        photon_service: PhotonGeocodingService,
+        gazetteer: Optional[Gazetteer] = None
     ):
         self.open_meteo_service = open_meteo_service
         self.photon_service = photon_service
+        self.gazetteer = gazetteer or get_gazetteer()
     
     async def execute(
         self,
@@ -55,62 +197,71 @@ class GetWeatherForecastUseCase:
         Returns:
             ForecastResponseDTO with current and hourly weather data
         """
+        location, forecast_data = await self._load(latitude, longitude, location_name, hours_ahead)
+        current_weather, hourly_weather_list = parse_forecast(forecast_data, hours_ahead)
+        return ForecastResponseDTO(
+            location=location,
+            current=current_weather,
+            hourly=hourly_weather_list
+        )
+    
+    async def execute_columnar(
+        self,
+        latitude: float,
+        longitude: float,
+        location_name: Optional[str] = None,
+        hours_ahead: int = 24
+    ) -> Dict[str, Any]:
+        """
+        Same as ``execute`` but with the hourly data as parallel arrays.
+        
+        Returns a plain, JSON-ready dict (see ``ColumnarForecastResponseDTO``)
+        so that no per-hour models are built or validated.
+        """
+        location, forecast_data = await self._load(latitude, longitude, location_name, hours_ahead)
+        return {
+            "location": location.model_dump(),
+            "current": parse_current(forecast_data).model_dump(),
+            "hourly": forecast_columns(forecast_data, hours_ahead),
+        }
+    
+    async def _load(
+        self,
+        latitude: float,
+        longitude: float,
+        location_name: Optional[str],
+        hours_ahead: int
+    ) -> Tuple[LocationDTO, Dict[str, Any]]:
+        """Fetch the raw forecast and resolve the location."""
         try:
-            # Get location name if not provided
-            if not location_name:
-                geo_data = await self.photon_service.reverse_geocode(latitude, longitude)
-                if geo_data.get("features"):
-                    props = geo_data["features"][0].get("properties", {})
-                    location_name = props.get("name", "Unknown")
-                    country = props.get("country", "Unknown")
-                else:
-                    location_name = "Unknown"
-                    country = "Unknown"
-            else:
-                country = "Unknown"
-            
-            # Get weather forecast
-            forecast_data = await self.open_meteo_service.get_forecast(
-                latitude, 
-                longitude,
-                hours_ahead
-            )
-            
-            # Parse current weather
-            current = forecast_data.get("current", {})
-            current_weather = CurrentWeatherDTO(
-                time=current.get("time", ""),
-                temperature_2m=current.get("temperature_2m", 0.0),
-                relative_humidity_2m=current.get("relative_humidity_2m", 0),
-                weather_code=current.get("weather_code", 0),
-                wind_speed_10m=current.get("wind_speed_10m", 0.0),
-                precipitation=current.get("precipitation", 0.0),
-                is_day=current.get("is_day", 0)
-            )
+            loop = asyncio.get_running_loop()
+            started = loop.time()
             
-            # Parse hourly data
-            hourly = forecast_data.get("hourly", {})
-            hourly_times = hourly.get("time", [])
-            hourly_temps = hourly.get("temperature_2m", [])
-            hourly_humidity = hourly.get("relative_humidity_2m", [])
-            hourly_weather_code = hourly.get("weather_code", [])
-            hourly_wind_speed = hourly.get("wind_speed_10m", [])
-            hourly_precipitation = hourly.get("precipitation", [])
-            hourly_soil_moisture = hourly.get("soil_moisture_0_to_1cm", [])
+            # Name the location from the gazetteer, or reverse geocode it
+            # with Photon while the forecast loads
+            country = "Unknown"
+            geocode = None
+            match = self.gazetteer.lookup(latitude, longitude) if self.gazetteer else None
+            if match is not None:
+                location_name = location_name or match.place.name
+                country = COUNTRY
+            elif not location_name:
+                geocode = asyncio.ensure_future(self._reverse_geocode(latitude, longitude))
             
-            hourly_weather_list = []
-            for i in range(min(len(hourly_times), hours_ahead)):
-                hourly_weather_list.append(
-                    HourlyWeatherDTO(
-                        time=hourly_times[i] if i < len(hourly_times) else "",
-                        temperature_2m=hourly_temps[i] if i < len(hourly_temps) else 0.0,
-                        relative_humidity_2m=int(hourly_humidity[i]) if i < len(hourly_humidity) else 0,
-                        weather_code=int(hourly_weather_code[i]) if i < len(hourly_weather_code) else 0,
-                        wind_speed_10m=hourly_wind_speed[i] if i < len(hourly_wind_speed) else 0.0,
-                        precipitation=hourly_precipitation[i] if i < len(hourly_precipitation) else 0.0,
-                        soil_moisture_0_to_1cm=hourly_soil_moisture[i] if i < len(hourly_soil_moisture) else 0.0
-                    )
+            try:
+                forecast_data = await asyncio.wait_for(
+                    self.open_meteo_service.get_forecast(latitude, longitude, hours_ahead),
+                    timeout=settings.WEATHER_FORECAST_DEADLINE_SECONDS
                 )
+            except BaseException:
+                if geocode is not None:
+                    geocode.cancel()
+                raise
+            
+            if geocode is not None:
+                # The geocoder gets what is left of its budget; weather data never waits longer
+                remaining = settings.WEATHER_GEOCODE_TIMEOUT_SECONDS - (loop.time() - started)
+                location_name, country = await self._await_location(geocode, remaining)
             
             location = LocationDTO(
                 name=location_name,
@@ -118,23 +269,396 @@ class GetWeatherForecastUseCase:
                 latitude=latitude,
                 longitude=longitude
             )
-            
-            return ForecastResponseDTO(
-                location=location,
-                current=current_weather,
-                hourly=hourly_weather_list
-            )
+            return location, forecast_data
         
         except Exception as e:
             logger.error(f"Error in GetWeatherForecastUseCase: {str(e)}")
             raise
+    
+    async def _reverse_geocode(self, latitude: float, longitude: float) -> Tuple[str, str]:
+        """Return (name, country) for coordinates."""
+        geo_data = await self.photon_service.reverse_geocode(latitude, longitude)
+        if geo_data.get("features"):
+            props = geo_data["features"][0].get("properties", {})
+            return props.get("name", "Unknown"), props.get("country", "Unknown")
+        return "Unknown", "Unknown"
+    
+    @staticmethod
+    async def _await_location(geocode: "asyncio.Future[Tuple[str, str]]", timeout: float) -> Tuple[str, str]:
+        """Wait up to ``timeout`` for the geocoder; fall back to a placeholder name."""
+        try:
+            return await asyncio.wait_for(geocode, timeout=max(timeout, 0))
+        except asyncio.TimeoutError:
+            logger.warning("Reverse geocoding exceeded its deadline, using placeholder name")
+        except Exception as e:
+            logger.warning(f"Reverse geocoding failed, using placeholder name: {str(e)}")
+        return "Unknown", "Unknown"
+
+
+class GetBatchWeatherForecastUseCase:
+    """Get weather forecasts for many farms/locations with few upstream calls."""
+    
+    def __init__(
+        self,
+        open_meteo_service: OpenMeteoService,
+        farm_repository: FarmRepository
+    ):
+        self.open_meteo_service = open_meteo_service
+        self.farm_repository = farm_repository
+    
+    async def execute(
+        self,
+        user_id: int,
+        request: BatchForecastRequestDTO
+    ) -> BatchForecastResponseDTO:
+        """
+        Get forecasts for the user's farms and/or explicit coordinates.
+        
+        Farms are located by their centroid and only the caller's own farms
+        are included (unknown IDs and farms without geometry are skipped).
+        With neither ``farm_ids`` nor ``locations``, all of the user's farms
+        are used. Location names are not reverse geocoded.
+        
+        Raises:
+            ValueError: If more than ``WEATHER_BATCH_MAX_FARMS`` points are requested
+        """
+        farms = []
+        if request.farm_ids is not None or not request.locations:
+            farms = await self.farm_repository.get_centroids(user_id, request.farm_ids)
+        locations = request.locations or []
+        
+        if len(farms) + len(locations) > settings.WEATHER_BATCH_MAX_FARMS:
+            raise ValueError(f"At most {settings.WEATHER_BATCH_MAX_FARMS} locations per request")
+        
+        points = [(lat, lng) for _, _, lat, lng in farms]
+        points += [(loc.latitude, loc.longitude) for loc in locations]
+        if not points:
+            return BatchForecastResponseDTO(forecasts=[], count=0)
+        
+        forecasts = await self.open_meteo_service.get_forecasts(points, request.hours_ahead)
+        
+        labels = [(farm_id, name) for farm_id, name, _, _ in farms]
+        labels += [(None, loc.name or "Unknown") for loc in locations]
+        
+        items = []
+        for (farm_id, name), (lat, lng), forecast_data in zip(labels, points, forecasts):
+            current_weather, hourly_weather_list = parse_forecast(forecast_data, request.hours_ahead)
+            items.append(BatchForecastItemDTO(
+                farm_id=farm_id,
+                location=LocationDTO(name=name, country="Unknown", latitude=lat, longitude=lng),
+                current=current_weather,
+                hourly=hourly_weather_list
+            ))
+        
+        return BatchForecastResponseDTO(forecasts=items, count=len(items))
+
+
+class PrefetchWeatherForecastsUseCase:
+    """Warm the forecast cache for many locations under an upstream rate limit."""
+    
+    def __init__(self, open_meteo_service: OpenMeteoService):
+        self.open_meteo_service = open_meteo_service
+    
+    async def execute(
+        self,
+        points: List[Tuple[float, float]],
+        hours_ahead: int = 24,
+        concurrency: int = 1,
+        requests_per_minute: int = 0
+    ) -> Tuple[int, int]:
+        """
+        Fetch fresh forecasts for the grid cells of ``points``.
+        
+        Points are grouped by grid cell and the cells are requested in
+        multi-location chunks of ``WEATHER_BATCH_MAX_LOCATIONS``. At most
+        ``concurrency`` chunks are in flight and chunk starts are spaced
+        ``60 / requests_per_minute`` seconds apart (no spacing when 0). A
+        failed chunk is logged and skipped.
+        
+        Returns:
+            (cells cached, cells failed)
+        """
+        cells = sorted({snap_to_grid(lat, lng) for lat, lng in points})
+        size = settings.WEATHER_BATCH_MAX_LOCATIONS
+        chunks = [cells[i:i + size] for i in range(0, len(cells), size)]
+        
+        interval = 60.0 / requests_per_minute if requests_per_minute > 0 else 0.0
+        semaphore = asyncio.Semaphore(max(concurrency, 1))
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        
+        async def prefetch(index: int, chunk: List[Tuple[float, float]]) -> int:
+            async with semaphore:
+                delay = started + index * interval - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                try:
+                    return await self.open_meteo_service.prefetch_forecasts(chunk, hours_ahead)
+                except Exception as e:
+                    logger.warning(f"Forecast prefetch failed for {len(chunk)} cells: {e}")
+                    return 0
+        
+        cached = sum(await asyncio.gather(*(prefetch(i, chunk) for i, chunk in enumerate(chunks))))
+        return cached, len(cells) - cached
+
+
+class GetAgroIndicesUseCase:
+    """Agro-meteorological indices (GDD, ET0, leaf wetness, rainfall) for locations and farms."""
+    
+    MAX_RAIN_WINDOWS = 5
+    
+    def __init__(
+        self,
+        open_meteo_service: OpenMeteoService,
+        farm_repository: Optional[FarmRepository] = None
+    ):
+        self.open_meteo_service = open_meteo_service
+        self.farm_repository = farm_repository
+    
+    async def execute(
+        self,
+        latitude: float,
+        longitude: float,
+        options: AgroIndicesOptionsDTO
+    ) -> AgroIndicesResponseDTO:
+        """
+        Get daily indices for the point's grid cell.
+        
+        Raises:
+            ValueError: If the options exceed the configured history/forecast
+        """
+        self._validate(options)
+        weather, = await self.open_meteo_service.get_agro_hourly([(latitude, longitude)])
+        return self._build(weather, snap_to_grid(latitude, longitude), options)
+    
+    async def execute_batch(
+        self,
+        user_id: int,
+        request: AgroIndicesBatchRequestDTO
+    ) -> AgroIndicesBatchResponseDTO:
+        """
+        Get daily indices for the user's farms (located by centroid).
+        
+        Uncached grid cells are fetched with multi-location requests and
+        farms in the same cell share one computation.
+        
+        Raises:
+            ValueError: If the options are invalid or there are more than
+                ``WEATHER_BATCH_MAX_FARMS`` farms
+        """
+        self._validate(request)
+        farms = await self.farm_repository.get_centroids(user_id, request.farm_ids)
+        if len(farms) > settings.WEATHER_BATCH_MAX_FARMS:
+            raise ValueError(f"At most {settings.WEATHER_BATCH_MAX_FARMS} farms per request")
+        if not farms:
+            return AgroIndicesBatchResponseDTO(results=[], count=0)
+        
+        weather_list = await self.open_meteo_service.get_agro_hourly([(lat, lng) for _, _, lat, lng in farms])
+        
+        by_cell: Dict[Tuple[float, float], AgroIndicesResponseDTO] = {}
+        results = []
+        for (farm_id, _, lat, lng), weather in zip(farms, weather_list):
+            cell = snap_to_grid(lat, lng)
+            if cell not in by_cell:
+                by_cell[cell] = self._build(weather, cell, request)
+            results.append(by_cell[cell].model_copy(update={"farm_id": farm_id}))
+        return AgroIndicesBatchResponseDTO(results=results, count=len(results))
+    
+    def _validate(self, options: AgroIndicesOptionsDTO) -> None:
+        if options.past_days > settings.WEATHER_AGRO_PAST_DAYS:
+            raise ValueError(f"past_days must be at most {settings.WEATHER_AGRO_PAST_DAYS}")
+        if options.forecast_days > settings.WEATHER_AGRO_FORECAST_DAYS:
+            raise ValueError(f"forecast_days must be at most {settings.WEATHER_AGRO_FORECAST_DAYS}")
+        if len(options.rain_windows) > self.MAX_RAIN_WINDOWS:
+            raise ValueError(f"At most {self.MAX_RAIN_WINDOWS} rain windows")
+        for window in options.rain_windows:
+            if not 1 <= window <= settings.WEATHER_AGRO_PAST_DAYS + 1:
+                raise ValueError(f"Rain windows must be between 1 and {settings.WEATHER_AGRO_PAST_DAYS + 1} days")
+        if options.upper_temp is not None and options.upper_temp <= options.base_temp:
+            raise ValueError("upper_temp must be above base_temp")
+    
+    @staticmethod
+    def _build(
+        weather: Dict[str, Any],
+        cell: Tuple[float, float],
+        options: AgroIndicesOptionsDTO
+    ) -> AgroIndicesResponseDTO:
+        windows = list(dict.fromkeys(options.rain_windows))
+        indices = compute_agro_indices(
+            weather,
+            base_temp=options.base_temp,
+            upper_temp=options.upper_temp,
+            wetness_rh=options.wetness_rh,
+            rain_windows=windows
+        )
+        dates = indices["date"]
+        
+        # The series starts WEATHER_AGRO_PAST_DAYS before the cell's local today
+        today = local_date(weather.get("utc_offset_seconds") or 0).isoformat()
+        today_index = dates.index(today) if today in dates else min(settings.WEATHER_AGRO_PAST_DAYS, len(dates))
+        first = max(today_index - options.past_days, 0)
+        last = min(today_index + options.forecast_days, len(dates))
+        
+        days = []
+        gdd_cumulative = 0.0
+        for i in range(first, last):
+            gdd = _round(indices["gdd"][i])
+            gdd_cumulative += gdd or 0.0
+            days.append(AgroIndicesDayDTO(
+                date=dates[i],
+                is_forecast=i >= today_index,
+                temperature_min=_round(indices["temperature_min"][i]),
+                temperature_max=_round(indices["temperature_max"][i]),
+                gdd=gdd,
+                gdd_cumulative=round(gdd_cumulative, 2),
+                et0=_round(indices["et0"][i]),
+                leaf_wetness_hours=int(indices["leaf_wetness_hours"][i]),
+                precipitation=_round(indices["precipitation"][i]) or 0.0,
+                rain_totals={f"{w}d": _round(indices[f"rain_{w}d"][i]) for w in windows}
+            ))
+        
+        return AgroIndicesResponseDTO(
+            latitude=cell[0],
+            longitude=cell[1],
+            elevation=weather.get("elevation"),
+            days=days,
+            count=len(days)
+        )
+
+
+class BackfillWeatherArchiveUseCase:
+    """Fill missing days of the local hourly weather archive."""
+    
+    def __init__(
+        self,
+        open_meteo_service: OpenMeteoService,
+        archive_repository: WeatherArchiveRepository
+    ):
+        self.open_meteo_service = open_meteo_service
+        self.archive_repository = archive_repository
+    
+    async def execute(
+        self,
+        latitude: float,
+        longitude: float,
+        start_date: date,
+        end_date: date,
+        max_days: Optional[int] = None
+    ) -> int:
+        """
+        Download and store the days in ``[start_date, end_date]`` that the
+        archive doesn't have yet for the point's grid cell.
+        
+        Contiguous missing days are fetched together (at most
+        ``WEATHER_ARCHIVE_FETCH_MAX_DAYS`` per request), so a nightly run
+        over an up-to-date cell makes one small request.
+        
+        Args:
+            max_days: Only fetch the latest this many missing days
+        
+        Returns:
+            Number of hourly rows stored
+        """
+        cell_lat, cell_lng = snap_to_grid(latitude, longitude)
+        complete = await self.archive_repository.get_complete_days(cell_lat, cell_lng, start_date, end_date)
+        missing = [
+            start_date + timedelta(days=offset)
+            for offset in range((end_date - start_date).days + 1)
+            if start_date + timedelta(days=offset) not in complete
+        ]
+        if max_days is not None:
+            missing = missing[-max_days:] if max_days > 0 else []
+        
+        stored = 0
+        for first, last in date_ranges(missing, settings.WEATHER_ARCHIVE_FETCH_MAX_DAYS):
+            archive_data = await self.open_meteo_service.get_historical_data(
+                cell_lat, cell_lng, first.isoformat(), last.isoformat()
+            )
+            stored += await self.archive_repository.replace_days(cell_lat, cell_lng, archive_hours(archive_data))
+        return stored
+
+
+class GetDailyWeatherHistoryUseCase:
+    """Daily weather history from the local archive."""
+    
+    def __init__(
+        self,
+        open_meteo_service: OpenMeteoService,
+        archive_repository: WeatherArchiveRepository
+    ):
+        self.open_meteo_service = open_meteo_service
+        self.archive_repository = archive_repository
+    
+    async def execute(
+        self,
+        latitude: float,
+        longitude: float,
+        start_date: date,
+        end_date: date
+    ) -> DailyWeatherHistoryResponseDTO:
+        """
+        Get daily aggregates for the point's grid cell, computed in the database.
+        
+        Days missing from the archive (e.g. a cell no farm is in) are
+        backfilled first, at most the latest ``WEATHER_ARCHIVE_ON_DEMAND_MAX_DAYS``
+        of them so a request makes one bounded download; the nightly job
+        (for farm cells) and later requests fill in the rest. If Open-Meteo is unavailable the stored days are
+        returned as they are.
+        
+        Raises:
+            ValueError: If the range is reversed or longer than ``WEATHER_ARCHIVE_MAX_QUERY_DAYS``
+        """
+        if end_date < start_date:
+            raise ValueError("end_date must not be before start_date")
+        if (end_date - start_date).days + 1 > settings.WEATHER_ARCHIVE_MAX_QUERY_DAYS:
+            raise ValueError(f"At most {settings.WEATHER_ARCHIVE_MAX_QUERY_DAYS} days per request")
+        
+        cell_lat, cell_lng = snap_to_grid(latitude, longitude)
+        latest = date.today() - timedelta(days=settings.WEATHER_ARCHIVE_LAG_DAYS)
+        if start_date <= latest:
+            try:
+                await BackfillWeatherArchiveUseCase(self.open_meteo_service, self.archive_repository).execute(
+                    cell_lat, cell_lng, start_date, min(end_date, latest),
+                    max_days=settings.WEATHER_ARCHIVE_ON_DEMAND_MAX_DAYS
+                )
+            except Exception as e:
+                logger.warning(f"Weather archive backfill failed, serving stored days only: {str(e)}")
+        
+        aggregates = await self.archive_repository.get_daily_aggregates(cell_lat, cell_lng, start_date, end_date)
+        days = [
+            DailyWeatherDTO(
+                date=row["day"].isoformat(),
+                hours=row["hours"],
+                temperature_min=_round(row["temperature_min"]),
+                temperature_max=_round(row["temperature_max"]),
+                temperature_mean=_round(row["temperature_mean"]),
+                precipitation_sum=_round(row["precipitation_sum"]),
+                relative_humidity_mean=_round(row["relative_humidity_mean"]),
+                wind_speed_max=_round(row["wind_speed_max"]),
+                humid_hours=row["humid_hours"] or 0
+            )
+            for row in aggregates
+        ]
+        return DailyWeatherHistoryResponseDTO(
+            latitude=cell_lat,
+            longitude=cell_lng,
+            start_date=start_date.isoformat(),
+            end_date=end_date.isoformat(),
+            days=days,
+            count=len(days)
+        )
 
 
 class SearchLocationUseCase:
     """Search for locations by query."""
     
-    def __init__(self, photon_service: PhotonGeocodingService):
+    def __init__(
+        self,
+        photon_service: PhotonGeocodingService,
+        search_index: Optional[PlaceSearchIndex] = None
+    ):
         self.photon_service = photon_service
+        self.search_index = search_index or get_place_search_index()
     
     async def execute(
         self,
@@ -144,6 +668,11 @@ class SearchLocationUseCase:
         """
         Search for locations matching the query.
         
+        Vietnamese places are matched in-process against the gazetteer,
+        ignoring diacritics. Photon is only skipped when a name matches
+        (exactly or by prefix); typo-tolerant matches are appended after
+        Photon's results, or returned alone if Photon finds nothing.
+        
         Args:
             query: Search query
             limit: Maximum number of results
@@ -152,7 +681,19 @@ class SearchLocationUseCase:
             List of matching locations with coordinates
         """
         try:
-            search_data = await self.photon_service.search_location(query, limit)
+            matches = self.search_index.search_with_match(query, limit) if self.search_index else []
+            local = [self._from_place(place) for place, match in matches if match != FUZZY]
+            if local:
+                return LocationSearchResponseDTO(results=local, count=len(local))
+            suggestions = [self._from_place(place) for place, _ in matches]
+            
+            try:
+                search_data = await self.photon_service.search_location(query, limit)
+            except Exception:
+                if not suggestions:
+                    raise
+                logger.warning(f"Photon search failed, returning local suggestions for {query!r}")
+                search_data = {}
             
             results = []
             for feature in search_data.get("features", []):
@@ -169,6 +710,9 @@ class SearchLocationUseCase:
                 )
                 results.append(result)
             
+            names = {result.name for result in results}
+            results += [suggestion for suggestion in suggestions if suggestion.name not in names][:max(limit - len(results), 0)]
+            
             return LocationSearchResponseDTO(
                 results=results,
                 count=len(results)
@@ -177,13 +721,29 @@ class SearchLocationUseCase:
         except Exception as e:
             logger.error(f"Error in SearchLocationUseCase: {str(e)}")
             raise
+    
+    def _from_place(self, place: Place) -> LocationSearchDTO:
+        province, _ = self.search_index.gazetteer.hierarchy(place)
+        return LocationSearchDTO(
+            name=place.name,
+            latitude=place.lat,
+            longitude=place.lng,
+            country=COUNTRY,
+            state=province.name,
+            type=place.level
+        )
 
 
 class ReverseGeocodeUseCase:
     """Get location information from coordinates."""
     
-    def __init__(self, photon_service: PhotonGeocodingService):
+    def __init__(
+        self,
+        photon_service: PhotonGeocodingService,
+        gazetteer: Optional[Gazetteer] = None
+    ):
         self.photon_service = photon_service
+        self.gazetteer = gazetteer or get_gazetteer()
     
     async def execute(
         self,
@@ -193,6 +753,9 @@ class ReverseGeocodeUseCase:
         """
         Get location details from coordinates.
         
+        Points covered by the offline gazetteer are answered locally;
+        Photon is only called outside its coverage.
+        
         Args:
             latitude: Location latitude
             longitude: Location longitude
@@ -201,6 +764,10 @@ class ReverseGeocodeUseCase:
             Location information (name, address, country, etc.)
         """
         try:
+            match = self.gazetteer.lookup(latitude, longitude) if self.gazetteer else None
+            if match is not None:
+                return self._from_gazetteer(match, latitude, longitude)
+            
             geo_data = await self.photon_service.reverse_geocode(latitude, longitude, limit=1)
             
             if not geo_data.get("features"):
@@ -229,3 +796,18 @@ class ReverseGeocodeUseCase:
         except Exception as e:
             logger.error(f"Error in ReverseGeocodeUseCase: {str(e)}")
             raise
+    
+    @staticmethod
+    def _from_gazetteer(match: GazetteerMatch, latitude: float, longitude: float) -> ReverseGeocodeDTO:
+        address_parts = [match.place.name] if match.place is not match.province else []
+        if match.district is not None and match.district is not match.place:
+            address_parts.append(match.district.name)
+        return ReverseGeocodeDTO(
+            name=match.place.name,
+            country=COUNTRY,
+            country_code=COUNTRY_CODE,
+            state=match.province.name,
+            address=", ".join(address_parts) if address_parts else None,
+            latitude=latitude,
+            longitude=longitude
+        )
@@ -1,18 +1,153 @@
 # Copyright (c) 2025 CuongKenn and ICTU-OpenAgri Contributors
 # Licensed under the MIT License. See LICENSE file in the project root for full license information.
 
-from typing import List, Optional
-from pydantic import BaseModel
+import sys
+from array import array
+from typing import Any, Iterable, Iterator, List, Optional, Sequence, Tuple, Union, overload
+from pydantic import BaseModel, GetCoreSchemaHandler
+from pydantic_core import core_schema
 from .base import BaseEntity
 
 class Coordinate(BaseModel):
     lat: float
     lng: float
 
+
+class PackedCoordinates(Sequence[Coordinate]):
+    """
+    Polygon vertices packed as little-endian float64 (lat, lng) pairs.
+
+    Repositories hand out the stored buffer as-is; ``Coordinate`` objects are
+    only created when a vertex is actually indexed or iterated. Serialization
+    (``model_dump`` / JSON responses) goes straight from the buffer to
+    ``{"lat", "lng"}`` dicts without building or validating per-vertex models.
+    """
+
+    __slots__ = ("_buffer",)
+
+    _VERTEX_SIZE = 16
+
+    def __init__(self, buffer: bytes = b""):
+        if len(buffer) % self._VERTEX_SIZE:
+            raise ValueError("Packed coordinate buffer must hold whole (lat, lng) float64 pairs")
+        self._buffer = bytes(buffer)
+
+    @classmethod
+    def from_coordinates(cls, coordinates: Iterable[Any]) -> "PackedCoordinates":
+        """Pack Coordinate objects, ``{"lat", "lng"}`` dicts or (lat, lng) pairs."""
+        if isinstance(coordinates, PackedCoordinates):
+            return coordinates
+        values = array("d")
+        for c in coordinates:
+            if isinstance(c, dict):
+                values.append(float(c["lat"]))
+                values.append(float(c["lng"]))
+            elif isinstance(c, (tuple, list)):
+                values.append(float(c[0]))
+                values.append(float(c[1]))
+            else:
+                values.append(float(c.lat))
+                values.append(float(c.lng))
+        if sys.byteorder != "little":
+            values.byteswap()
+        return cls(values.tobytes())
+
+    def _values(self) -> array:
+        values = array("d")
+        values.frombytes(self._buffer)
+        if sys.byteorder != "little":
+            values.byteswap()
+        return values
+
+    def to_bytes(self) -> bytes:
+        """Raw little-endian buffer, suitable for storage."""
+        return self._buffer
+
+    def as_pairs(self) -> List[Tuple[float, float]]:
+        """Vertices as (lat, lng) tuples."""
+        values = self._values()
+        return list(zip(values[0::2], values[1::2]))
+
+    def to_dicts(self) -> List[dict]:
+        """Vertices as ``{"lat", "lng"}`` dicts (the JSON wire format)."""
+        values = self._values()
+        return [{"lat": lat, "lng": lng} for lat, lng in zip(values[0::2], values[1::2])]
+
+    def __len__(self) -> int:
+        return len(self._buffer) // self._VERTEX_SIZE
+
+    @overload
+    def __getitem__(self, index: int) -> Coordinate: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> "PackedCoordinates": ...
+
+    def __getitem__(self, index: Union[int, slice]):
+        if isinstance(index, slice):
+            pairs = self.as_pairs()[index]
+            return PackedCoordinates.from_coordinates(pairs)
+        n = len(self)
+        if index < 0:
+            index += n
+        if not 0 <= index < n:
+            raise IndexError("coordinate index out of range")
+        values = array("d")
+        values.frombytes(self._buffer[index * self._VERTEX_SIZE:(index + 1) * self._VERTEX_SIZE])
+        if sys.byteorder != "little":
+            values.byteswap()
+        return Coordinate.model_construct(lat=values[0], lng=values[1])
+
+    def __iter__(self) -> Iterator[Coordinate]:
+        for lat, lng in self.as_pairs():
+            yield Coordinate.model_construct(lat=lat, lng=lng)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, PackedCoordinates):
+            return self._buffer == other._buffer
+        if isinstance(other, (list, tuple)):
+            try:
+                return self._buffer == PackedCoordinates.from_coordinates(other)._buffer
+            except (KeyError, TypeError, ValueError, AttributeError):
+                return False
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(self._buffer)
+
+    def __repr__(self) -> str:
+        return f"PackedCoordinates({self.as_pairs()!r})"
+
+    @classmethod
+    def _validate_python(cls, value: Any) -> "PackedCoordinates":
+        if isinstance(value, PackedCoordinates):
+            return value
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            return cls(bytes(value))
+        if isinstance(value, (str, dict)) or not isinstance(value, Iterable):
+            raise ValueError("coordinates must be a list of {lat, lng} points")
+        try:
+            return cls.from_coordinates(value)
+        except (KeyError, IndexError, TypeError, AttributeError) as e:
+            raise ValueError(f"invalid coordinate: {e}") from e
+
+    @classmethod
+    def __get_pydantic_core_schema__(cls, source: Any, handler: GetCoreSchemaHandler) -> core_schema.CoreSchema:
+        # JSON input is validated point by point; Python input (entities,
+        # ORM rows, dumped responses) is packed directly without building
+        # per-vertex models.
+        return core_schema.json_or_python_schema(
+            json_schema=core_schema.no_info_after_validator_function(
+                cls.from_coordinates, handler.generate_schema(List[Coordinate])
+            ),
+            python_schema=core_schema.no_info_plain_validator_function(cls._validate_python),
+            serialization=core_schema.plain_serializer_function_ser_schema(lambda v: v.to_dicts()),
+        )
+
+
 class FarmArea(BaseEntity):
     name: str
     description: Optional[str] = None
-    coordinates: List[Coordinate]
+    coordinates: PackedCoordinates
     area_size: Optional[float] = None
     crop_type: Optional[str] = None
     user_id: int
@@ -2,7 +2,7 @@
 # Licensed under the MIT License. See LICENSE file in the project root for full license information.
 
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from app.domain.entities.farm import FarmArea
 
 class FarmRepository(ABC):
@@ -23,6 +23,24 @@ class FarmRepository(ABC):
         """Get all farms with user details."""
         pass
 
+    @abstractmethod
+    async def find_in_viewport(self, min_lat: float, min_lng: float, max_lat: float, max_lng: float,
+                               limit: int = 500) -> List[FarmArea]:
+        """Get farms whose bounding box intersects the given viewport."""
+        pass
+
+    @abstractmethod
+    async def find_within_radius(self, lat: float, lng: float, radius_km: float,
+                                 limit: int = 500) -> List[FarmArea]:
+        """Get farms within a radius (km) of a point, nearest first."""
+        pass
+
+    @abstractmethod
+    async def get_centroids(self, user_id: int,
+                            farm_ids: Optional[List[int]] = None) -> List[Tuple[int, str, float, float]]:
+        """Get (id, name, centroid_lat, centroid_lng) of a user's farms (all, or the given IDs)."""
+        pass
+
     @abstractmethod
     async def update(self, farm_id: int, user_id: int, name: Optional[str] = None, 
                      description: Optional[str] = None, coordinates: Optional[list] = None,
@@ -5,6 +5,7 @@ from abc import ABC, abstractmethod
 from typing import List, Optional
 from datetime import date
 from app.infrastructure.database.models.satellite_data_model import SatelliteDataModel
+from app.infrastructure.database.models.satellite_rollup_model import SatelliteRollupModel
 
 class SatelliteRepository(ABC):
     @abstractmethod
@@ -18,3 +19,11 @@ class SatelliteRepository(ABC):
     @abstractmethod
     async def get_existing_record(self, farm_id: int, data_type: str, acquisition_date: date) -> Optional[SatelliteDataModel]:
         pass
+
+    @abstractmethod
+    async def get_rollups(self, farm_id: int, data_type: str, granularity: str, start_date: date, end_date: date) -> List[SatelliteRollupModel]:
+        pass
+
+    @abstractmethod
+    async def get_latest_record(self, farm_id: int, data_type: str, start_date: date, end_date: date) -> Optional[SatelliteDataModel]:
+        pass
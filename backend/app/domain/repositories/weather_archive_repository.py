@@ -0,0 +1,24 @@
+# Copyright (c) 2025 CuongKenn and ICTU-OpenAgri Contributors
+# Licensed under the MIT License. See LICENSE file in the project root for full license information.
+
+from abc import ABC, abstractmethod
+from datetime import date
+from typing import Any, Dict, List, Set
+
+class WeatherArchiveRepository(ABC):
+    """Local archive of hourly historical weather per grid cell."""
+
+    @abstractmethod
+    async def get_complete_days(self, cell_lat: float, cell_lng: float, start_date: date, end_date: date) -> Set[date]:
+        """Days in the range that already have a full set of hours."""
+        pass
+
+    @abstractmethod
+    async def replace_days(self, cell_lat: float, cell_lng: float, hours: List[Dict[str, Any]]) -> int:
+        """Store hourly rows, replacing whatever is stored for their days. Returns rows stored."""
+        pass
+
+    @abstractmethod
+    async def get_daily_aggregates(self, cell_lat: float, cell_lng: float, start_date: date, end_date: date) -> List[Dict[str, Any]]:
+        """Per-day aggregates of the stored hours, oldest first."""
+        pass
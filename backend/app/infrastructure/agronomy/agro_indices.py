@@ -0,0 +1,169 @@
+# Copyright (c) 2025 CuongKenn and ICTU-OpenAgri Contributors
+# Licensed under the MIT License. See LICENSE file in the project root for full license information.
+
+"""
+Agro-meteorological indices from hourly Open-Meteo data, vectorized with NumPy.
+
+- Growing degree days from daily min/max temperature, both clamped to
+  ``[base_temp, upper_temp]`` before averaging.
+- Reference evapotranspiration (ET0) with the FAO-56 hourly Penman-Monteith
+  equation (eq. 53), summed per day. Net radiation is derived from
+  shortwave and extraterrestrial radiation (eqs. 37-40); at night Rs/Rso
+  is carried over from the last daylight hour (FAO-56 recommends the
+  value 2-3 hours before sunset). Days with a missing input hour get no
+  ET0 (NaN) rather than a partial sum.
+- Leaf-wetness hours: hours with relative humidity at or above a
+  threshold, or with measurable rain.
+- Rolling rainfall totals over daily precipitation.
+
+Days are the local days of the ``time`` array (``timezone=auto``).
+"""
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, Optional, Sequence
+
+import numpy as np
+
+# Stefan-Boltzmann constant per hour, MJ K-4 m-2 h-1
+SIGMA_HOURLY = 2.043e-10
+# W m-2 (hourly mean) to MJ m-2 h-1
+W_TO_MJ_PER_HOUR = 0.0036
+# Rs/Rso assumed before the first daylight hour of the series
+NIGHT_RADIATION_RATIO = 0.8
+# Rain (mm/h) that counts as wetting the leaves
+WETTING_RAIN_MM = 0.1
+
+
+def local_date(utc_offset_seconds: int, now: Optional[datetime] = None) -> date:
+    """Today's date at a location ``utc_offset_seconds`` from UTC (Open-Meteo's ``utc_offset_seconds``)."""
+    now = now or datetime.now(timezone.utc)
+    return (now.astimezone(timezone.utc) + timedelta(seconds=utc_offset_seconds)).date()
+
+
+def _column(hourly: Dict[str, Any], name: str, length: int) -> np.ndarray:
+    """Hourly variable as a float array, missing values as NaN."""
+    values = hourly.get(name) or []
+    array = np.full(length, np.nan)
+    if values:
+        array[:min(len(values), length)] = np.array(values[:length], dtype=float)
+    return array
+
+
+def saturation_vapour_pressure(temperature: np.ndarray) -> np.ndarray:
+    """e°(T) in kPa (FAO-56 eq. 11)."""
+    return 0.6108 * np.exp(17.27 * temperature / (temperature + 237.3))
+
+
+def wind_speed_2m(wind_speed_10m_kmh: np.ndarray) -> np.ndarray:
+    """Wind speed at 2 m (m/s) from Open-Meteo's 10 m wind in km/h (FAO-56 eq. 47)."""
+    return wind_speed_10m_kmh / 3.6 * 4.87 / np.log(67.8 * 10 - 5.42)
+
+
+def et0_hourly(
+    temperature: np.ndarray,
+    relative_humidity: np.ndarray,
+    wind_speed_10m: np.ndarray,
+    shortwave_radiation: np.ndarray,
+    terrestrial_radiation: np.ndarray,
+    elevation: float
+) -> np.ndarray:
+    """
+    FAO-56 hourly reference evapotranspiration, mm per hour.
+
+    Temperature in °C, humidity in %, wind in km/h at 10 m and radiation
+    as hourly means in W m-2 (as returned by Open-Meteo).
+    """
+    es = saturation_vapour_pressure(temperature)
+    ea = es * relative_humidity / 100.0
+    delta = 4098.0 * es / (temperature + 237.3) ** 2
+    pressure = 101.3 * ((293.0 - 0.0065 * elevation) / 293.0) ** 5.26
+    gamma = 0.000665 * pressure
+    u2 = wind_speed_2m(wind_speed_10m)
+
+    rs = shortwave_radiation * W_TO_MJ_PER_HOUR
+    rso = (0.75 + 2e-5 * elevation) * terrestrial_radiation * W_TO_MJ_PER_HOUR
+    daylight = rso > 0
+    ratio = np.clip(rs / np.where(daylight, rso, 1.0), 0.3, 1.0)
+    # Night hours reuse the last daylight ratio
+    last_day = np.maximum.accumulate(np.where(daylight, np.arange(len(rso)), -1))
+    ratio = np.where(last_day >= 0, ratio[np.maximum(last_day, 0)], NIGHT_RADIATION_RATIO)
+
+    rnl = SIGMA_HOURLY * (temperature + 273.16) ** 4 * (0.34 - 0.14 * np.sqrt(ea)) * (1.35 * ratio - 0.35)
+    rn = (1 - 0.23) * rs - rnl
+    soil_heat = np.where(daylight, 0.1, 0.5) * rn
+
+    et0 = (
+        (0.408 * delta * (rn - soil_heat) + gamma * 37.0 / (temperature + 273.0) * u2 * (es - ea))
+        / (delta + gamma * (1 + 0.34 * u2))
+    )
+    return np.maximum(et0, 0.0)
+
+
+def rolling_sum(values: np.ndarray, window: int) -> np.ndarray:
+    """Trailing ``window``-element sums; NaN where the window isn't full."""
+    totals = np.full(len(values), np.nan)
+    if window <= len(values):
+        cumulative = np.concatenate(([0.0], np.cumsum(values)))
+        totals[window - 1:] = cumulative[window:] - cumulative[:-window]
+    return totals
+
+
+def compute_agro_indices(
+    weather: Dict[str, Any],
+    base_temp: float = 10.0,
+    upper_temp: Optional[float] = None,
+    wetness_rh: float = 90.0,
+    rain_windows: Sequence[int] = (3, 7, 30)
+) -> Dict[str, Any]:
+    """
+    Daily indices from an Open-Meteo response with ``AGRO_HOURLY`` variables.
+
+    Returns a dict of parallel per-day arrays: ``date`` (list of
+    'YYYY-MM-DD'), ``temperature_min``, ``temperature_max``, ``gdd``,
+    ``et0`` (NaN for days with a missing input hour),
+    ``leaf_wetness_hours``, ``precipitation`` and one ``rain_<n>d`` array
+    per window (NaN until the window is full).
+    """
+    hourly = weather.get("hourly", {})
+    times = hourly.get("time", [])
+    n = len(times)
+    if n == 0:
+        return {"date": []}
+
+    day_labels = np.array([t[:10] for t in times])
+    starts = np.concatenate(([0], np.flatnonzero(day_labels[1:] != day_labels[:-1]) + 1))
+
+    temperature = _column(hourly, "temperature_2m", n)
+    humidity = _column(hourly, "relative_humidity_2m", n)
+    precipitation = np.nan_to_num(_column(hourly, "precipitation", n))
+
+    # fmin/fmax skip missing hours
+    tmin = np.fmin.reduceat(temperature, starts)
+    tmax = np.fmax.reduceat(temperature, starts)
+    upper = np.inf if upper_temp is None else upper_temp
+    gdd = (np.clip(tmax, base_temp, upper) + np.clip(tmin, base_temp, upper)) / 2.0 - base_temp
+
+    et0 = et0_hourly(
+        temperature,
+        humidity,
+        _column(hourly, "wind_speed_10m", n),
+        _column(hourly, "shortwave_radiation", n),
+        _column(hourly, "terrestrial_radiation", n),
+        float(weather.get("elevation") or 0.0)
+    )
+    # NaN wherever an input is missing; any such hour voids the day's sum
+    et0_incomplete = np.add.reduceat(np.isnan(et0).astype(int), starts) > 0
+    wet = (humidity >= wetness_rh) | (precipitation >= WETTING_RAIN_MM)
+    daily_rain = np.add.reduceat(precipitation, starts)
+
+    indices = {
+        "date": day_labels[starts].tolist(),
+        "temperature_min": tmin,
+        "temperature_max": tmax,
+        "gdd": gdd,
+        "et0": np.where(et0_incomplete, np.nan, np.add.reduceat(np.nan_to_num(et0), starts)),
+        "leaf_wetness_hours": np.add.reduceat(wet.astype(int), starts),
+        "precipitation": daily_rain,
+    }
+    for window in rain_windows:
+        indices[f"rain_{window}d"] = rolling_sum(daily_rain, window)
+    return indices
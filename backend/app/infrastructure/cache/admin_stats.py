@@ -0,0 +1,125 @@
+# Copyright (c) 2025 CuongKenn and ICTU-OpenAgri Contributors
+# Licensed under the MIT License. See LICENSE file in the project root for full license information.
+
+"""
+Admin dashboard statistics.
+
+User counters and the crop distribution are computed together in a single
+round trip (conditional sums over ``users`` UNION ALL a GROUP BY over
+``farms``) and cached for ``ADMIN_STATS_CACHE_TTL_SECONDS``. Use cases
+that create users/farms or change a user's status apply the change to the
+cached snapshot in place; changes whose effect isn't known locally (user
+or farm deletion, crop edits) drop the snapshot instead.
+"""
+from dataclasses import dataclass, field, replace
+from typing import Dict, List, Optional
+
+from sqlalchemy import case, func, literal, null, select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.infrastructure.cache.ttl_cache import TTLCache
+from app.infrastructure.config.settings import get_settings
+from app.infrastructure.database.models.farm_model import FarmModel
+from app.infrastructure.database.models.user_model import UserModel
+
+settings = get_settings()
+
+UNKNOWN_CROP_LABEL = "Chưa xác định"
+
+_KEY = "admin_stats"
+
+
+@dataclass
+class AdminStats:
+    """Snapshot of the admin dashboard counters."""
+    total_users: int = 0
+    active_users: int = 0
+    superusers: int = 0
+    crops: Dict[Optional[str], int] = field(default_factory=dict)
+
+    @property
+    def inactive_users(self) -> int:
+        return self.total_users - self.active_users
+
+    def crop_distribution(self) -> List[dict]:
+        """Crop counts in the shape returned by ``/admin/farms/stats/crops``."""
+        return [
+            {"crop_type": crop or UNKNOWN_CROP_LABEL, "count": count}
+            for crop, count in self.crops.items()
+            if count > 0
+        ]
+
+
+admin_stats_cache: TTLCache[AdminStats] = TTLCache(
+    max_size=1,
+    ttl_seconds=settings.ADMIN_STATS_CACHE_TTL_SECONDS
+)
+
+
+async def _compute_admin_stats(session: AsyncSession) -> AdminStats:
+    user_counts = select(
+        literal("users").label("kind"),
+        null().label("crop_type"),
+        func.count(UserModel.id).label("total"),
+        func.coalesce(func.sum(case((UserModel.is_active == True, 1), else_=0)), 0).label("active"),
+        func.coalesce(func.sum(case((UserModel.is_superuser == True, 1), else_=0)), 0).label("superusers"),
+    )
+    crop_counts = select(
+        literal("crop").label("kind"),
+        FarmModel.crop_type,
+        func.count(FarmModel.id),
+        literal(0),
+        literal(0),
+    ).group_by(FarmModel.crop_type)
+
+    stats = AdminStats()
+    result = await session.execute(union_all(user_counts, crop_counts))
+    for kind, crop_type, total, active, superusers in result.all():
+        if kind == "users":
+            stats.total_users = total
+            stats.active_users = active
+            stats.superusers = superusers
+        else:
+            stats.crops[crop_type] = total
+    return stats
+
+
+async def get_admin_stats(session: AsyncSession) -> AdminStats:
+    """Return the cached dashboard stats, computing them on a miss."""
+    stats = admin_stats_cache.get(_KEY)
+    if stats is None:
+        stats = await _compute_admin_stats(session)
+        if settings.ADMIN_STATS_CACHE_TTL_SECONDS > 0:
+            admin_stats_cache.set(_KEY, stats)
+    return replace(stats, crops=dict(stats.crops))
+
+
+def invalidate_admin_stats() -> None:
+    """Drop the cached snapshot; the next read recomputes it."""
+    admin_stats_cache.invalidate(_KEY)
+
+
+def record_user_created(is_active: bool = True, is_superuser: bool = False) -> None:
+    """Count a newly created user in the cached snapshot."""
+    stats = admin_stats_cache.get(_KEY)
+    if stats is None:
+        return
+    stats.total_users += 1
+    stats.active_users += int(bool(is_active))
+    stats.superusers += int(bool(is_superuser))
+
+
+def record_user_status_changed(was_active: bool, is_active: bool) -> None:
+    """Move a user between the active and inactive counters."""
+    stats = admin_stats_cache.get(_KEY)
+    if stats is None or bool(was_active) == bool(is_active):
+        return
+    stats.active_users += 1 if is_active else -1
+
+
+def record_farm_created(crop_type: Optional[str]) -> None:
+    """Count a newly created farm in the cached crop distribution."""
+    stats = admin_stats_cache.get(_KEY)
+    if stats is None:
+        return
+    stats.crops[crop_type] = stats.crops.get(crop_type, 0) + 1
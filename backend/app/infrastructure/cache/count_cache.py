@@ -0,0 +1,40 @@
+# Copyright (c) 2025 CuongKenn and ICTU-OpenAgri Contributors
+# Licensed under the MIT License. See LICENSE file in the project root for full license information.
+
+"""
+Cached row counts for paginated admin listings.
+
+Exact ``COUNT(*)`` over a filtered table costs a full scan per page
+request. Totals are cached per (listing, search term) for a short TTL and
+dropped by the use cases that add or remove rows, so the reported total
+is at most ``ADMIN_COUNT_CACHE_TTL_SECONDS`` stale across workers.
+"""
+from typing import Awaitable, Callable, Optional
+
+from app.infrastructure.cache.ttl_cache import TTLCache
+from app.infrastructure.config.settings import get_settings
+
+settings = get_settings()
+
+USERS = "users"
+FARMS = "farms"
+
+admin_count_cache: TTLCache[int] = TTLCache(
+    max_size=1024,
+    ttl_seconds=settings.ADMIN_COUNT_CACHE_TTL_SECONDS
+)
+
+
+async def cached_count(listing: str, search: Optional[str], compute: Callable[[], Awaitable[int]]) -> int:
+    """Return the cached total for a listing, running ``compute`` on a miss."""
+    key = (listing, (search or "").strip().lower())
+    total = admin_count_cache.get(key)
+    if total is None:
+        total = await compute()
+        admin_count_cache.set(key, total)
+    return total
+
+
+def invalidate_counts(listing: str) -> None:
+    """Forget every cached total for ``listing``."""
+    admin_count_cache.invalidate_where(lambda key: key[0] == listing)
@@ -0,0 +1,229 @@
+# Copyright (c) 2025 CuongKenn and ICTU-OpenAgri Contributors
+# Licensed under the MIT License. See LICENSE file in the project root for full license information.
+
+"""
+Grid-snapped cache for Open-Meteo forecasts.
+
+Coordinates are snapped to a ``WEATHER_GRID_RESOLUTION_DEG`` grid and the
+forecast for the cell centre is shared by every request in the cell
+(Open-Meteo's model grids are 1-11 km, so nearby farms get the same data
+anyway). Entries stay fresh until the next model update boundary
+(every ``WEATHER_FORECAST_UPDATE_MINUTES``, shifted by
+``WEATHER_FORECAST_UPDATE_OFFSET_MINUTES``) and may then be served stale
+for ``WEATHER_FORECAST_STALE_SECONDS`` while one background refresh runs.
+"""
+import asyncio
+import logging
+import math
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Generic, Hashable, Iterable, List, Optional, Set, Tuple, TypeVar
+
+from app.infrastructure.cache.single_flight import SingleFlight
+from app.infrastructure.cache.ttl_cache import TTLCache
+from app.infrastructure.config.settings import get_settings
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+V = TypeVar('V')
+
+# forecast_days requested upstream; a request is served by the smallest
+# horizon that covers it so that similar horizons share an entry
+FORECAST_DAY_BUCKETS = (1, 3, 7, 11, 16)
+
+
+def snap_to_grid(latitude: float, longitude: float,
+                 resolution: Optional[float] = None) -> Tuple[float, float]:
+    """Centre of the grid cell containing (latitude, longitude)."""
+    resolution = resolution or settings.WEATHER_GRID_RESOLUTION_DEG
+    lat = (math.floor(latitude / resolution) + 0.5) * resolution
+    lng = (math.floor(longitude / resolution) + 0.5) * resolution
+    return round(min(max(lat, -90.0), 90.0), 6), round(lng, 6)
+
+
+def forecast_days_bucket(hours_ahead: int) -> int:
+    """Smallest cached horizon (in days) covering ``hours_ahead`` hours from today."""
+    days = hours_ahead // 24 + 1
+    for bucket in FORECAST_DAY_BUCKETS:
+        if days <= bucket:
+            return bucket
+    return FORECAST_DAY_BUCKETS[-1]
+
+
+def seconds_until_model_update(now: float,
+                               interval_minutes: Optional[int] = None,
+                               offset_minutes: Optional[int] = None) -> float:
+    """Seconds from ``now`` (epoch) to the next model update boundary."""
+    interval = (interval_minutes or settings.WEATHER_FORECAST_UPDATE_MINUTES) * 60
+    offset = (settings.WEATHER_FORECAST_UPDATE_OFFSET_MINUTES if offset_minutes is None else offset_minutes) * 60
+    next_boundary = (math.floor((now - offset) / interval) + 1) * interval + offset
+    return next_boundary - now
+
+
+@dataclass
+class _Entry(Generic[V]):
+    value: V
+    fresh_until: float
+
+
+class ForecastCache(Generic[V]):
+    """
+    Stale-while-revalidate cache with hit/miss counters.
+
+    Concurrent misses for the same key share one upstream call
+    (``SingleFlight``); a stale hit returns immediately and starts at most
+    one background refresh per key.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 4096,
+        stale_seconds: float = 1800,
+        ttl_func: Callable[[float], float] = seconds_until_model_update,
+        clock: Callable[[], float] = time.time
+    ):
+        self.stale_seconds = stale_seconds
+        self._ttl_func = ttl_func
+        self._clock = clock
+        self._entries: TTLCache[_Entry[V]] = TTLCache(max_size=max_size, clock=clock)
+        self._inflight: SingleFlight[V] = SingleFlight()
+        self._refreshing: Set[Hashable] = set()
+        self._tasks: Set[asyncio.Task] = set()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refresh_errors = 0
+
+    async def get_or_fetch(self, key: Hashable, fetch: Callable[[], Awaitable[V]]) -> V:
+        """Return the cached value for ``key``, calling ``fetch`` on a miss."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry.fresh_until > self._clock():
+                self.hits += 1
+            else:
+                self.stale_hits += 1
+                self._refresh_in_background(key, fetch)
+            return entry.value
+
+        self.misses += 1
+        return await self._inflight.do(key, lambda: self._load(key, fetch))
+
+    async def get_many_or_fetch(
+        self,
+        keys: Iterable[Hashable],
+        fetch_many: Callable[[List[Hashable]], Awaitable[Dict[Hashable, V]]],
+        current: Optional[Callable[[V], bool]] = None
+    ) -> Dict[Hashable, V]:
+        """
+        Batch variant of ``get_or_fetch``.
+
+        Missing keys are loaded with a single ``fetch_many(missing)`` call,
+        except those already being fetched (by ``get_or_fetch`` or another
+        batch), which share that call; stale keys are returned as-is and
+        refreshed together in the background. Cached values for which
+        ``current(value)`` is False count as missing.
+        """
+        found: Dict[Hashable, V] = {}
+        missing: List[Hashable] = []
+        stale: List[Hashable] = []
+        now = self._clock()
+        for key in dict.fromkeys(keys):
+            entry = self._entries.get(key)
+            if entry is None or (current is not None and not current(entry.value)):
+                self.misses += 1
+                missing.append(key)
+                continue
+            if entry.fresh_until > now:
+                self.hits += 1
+            else:
+                self.stale_hits += 1
+                if key not in self._refreshing:
+                    stale.append(key)
+            found[key] = entry.value
+
+        if stale:
+            self._refreshing.update(stale)
+            self._spawn(self._refresh_many(stale, fetch_many))
+        if missing:
+            new = [key for key in missing if key not in self._inflight]
+            batch = asyncio.ensure_future(fetch_many(new)) if new else None
+            calls = [
+                self._inflight.start(key, lambda key=key: self._load_from(batch, key))
+                for key in missing
+            ]
+            values = await asyncio.gather(*(asyncio.shield(call) for call in calls))
+            found.update(zip(missing, values))
+        return found
+
+    def put(self, key: Hashable, value: V) -> None:
+        """Store a freshly fetched value (cache warming), replacing any entry."""
+        self._store(key, value)
+
+    async def _refresh_many(self, keys: List[Hashable], fetch_many) -> None:
+        try:
+            for key, value in (await fetch_many(keys)).items():
+                self._store(key, value)
+        except Exception as e:
+            self.refresh_errors += 1
+            logger.warning(f"Background forecast refresh failed for {len(keys)} cells: {e}")
+        finally:
+            self._refreshing.difference_update(keys)
+
+    async def _load(self, key: Hashable, fetch: Callable[[], Awaitable[V]]) -> V:
+        value = await fetch()
+        self._store(key, value)
+        return value
+
+    async def _load_from(self, batch: "asyncio.Future[Dict[Hashable, V]]", key: Hashable) -> V:
+        fetched = await batch
+        if key not in fetched:
+            raise LookupError(f"Batch fetch returned nothing for {key}")
+        self._store(key, fetched[key])
+        return fetched[key]
+
+    def _store(self, key: Hashable, value: V) -> None:
+        ttl = max(self._ttl_func(self._clock()), 1.0)
+        self._entries.set(key, _Entry(value, self._clock() + ttl), ttl_seconds=ttl + self.stale_seconds)
+
+    def _spawn(self, coro) -> None:
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def _refresh_in_background(self, key: Hashable, fetch: Callable[[], Awaitable[V]]) -> None:
+        if key in self._refreshing:
+            return
+        self._refreshing.add(key)
+
+        async def refresh():
+            try:
+                await self._inflight.do(key, lambda: self._load(key, fetch))
+            except Exception as e:
+                self.refresh_errors += 1
+                logger.warning(f"Background forecast refresh failed for {key}: {e}")
+            finally:
+                self._refreshing.discard(key)
+
+        self._spawn(refresh())
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.stale_hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "coalesced": self._inflight.coalesced,
+            "refresh_errors": self.refresh_errors,
+            "hit_ratio": round((self.hits + self.stale_hits) / lookups, 4) if lookups else 0.0,
+        }
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+forecast_cache: ForecastCache[Dict[str, Any]] = ForecastCache(
+    max_size=settings.WEATHER_FORECAST_CACHE_MAX_SIZE,
+    stale_seconds=settings.WEATHER_FORECAST_STALE_SECONDS
+)
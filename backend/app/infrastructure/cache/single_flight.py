@@ -0,0 +1,70 @@
+# Copyright (c) 2025 CuongKenn and ICTU-OpenAgri Contributors
+# Licensed under the MIT License. See LICENSE file in the project root for full license information.
+
+"""
+Request coalescing for upstream HTTP calls.
+"""
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Generic, Hashable, Mapping, Optional, Tuple, TypeVar
+
+V = TypeVar('V')
+
+
+def request_key(url: str, params: Optional[Mapping[str, Any]] = None) -> Tuple:
+    """
+    Normalized key for a GET request: parameter order doesn't matter and
+    floats are rounded to 6 decimals (~0.1 m), so equivalent calls match.
+    """
+    items = []
+    for name, value in (params or {}).items():
+        if value is None:
+            continue
+        if isinstance(value, float):
+            value = round(value, 6)
+        items.append((name, str(value)))
+    return (url, tuple(sorted(items)))
+
+
+class SingleFlight(Generic[V]):
+    """
+    Share one in-flight call between concurrent callers with the same key.
+
+    The first caller starts ``fn()`` as a task; callers arriving while it
+    runs await the same task and get its result or exception. Nothing is
+    kept once the call finishes (combine with a cache for that). The call
+    isn't cancelled when one of its callers is, so the others still get
+    the result.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, asyncio.Task] = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[V]]) -> V:
+        return await asyncio.shield(self.start(key, fn))
+
+    def start(self, key: Hashable, fn: Callable[[], Awaitable[V]]) -> "asyncio.Task[V]":
+        """The in-flight call for ``key``, starting ``fn()`` if there is none."""
+        task = self._calls.get(key)
+        if task is None:
+            self.calls += 1
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda t: self._done(key, t))
+        else:
+            self.coalesced += 1
+        return task
+
+    def _done(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        # Mark the exception retrieved in case every caller was cancelled
+        if not task.cancelled():
+            task.exception()
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._calls
+
+    def __len__(self) -> int:
+        return len(self._calls)
@@ -0,0 +1,121 @@
+# Copyright (c) 2025 CuongKenn and ICTU-OpenAgri Contributors
+# Licensed under the MIT License. See LICENSE file in the project root for full license information.
+
+"""
+Persistent cache of GBIF species keys by scientific name.
+
+A name's backbone key only changes when GBIF republishes its backbone
+taxonomy, so resolved keys are stored in ``gbif_species_keys`` for
+``GBIF_SPECIES_KEY_TTL_DAYS`` (names without a match for
+``GBIF_SPECIES_KEY_MISS_TTL_DAYS``) and mirrored in memory, so a warm
+process answers without touching the database. Database errors are
+logged and treated as misses: the cache never fails a lookup.
+"""
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.infrastructure.cache.ttl_cache import TTLCache
+from app.infrastructure.config.settings import get_settings
+from app.infrastructure.database.database import AsyncSessionLocal
+from app.infrastructure.database.models.gbif_species_key_model import GbifSpeciesKeyModel
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# Tells "no match" (a cached None) apart from "not cached"
+_MISSING = object()
+
+
+def normalize_name(name: str) -> str:
+    """Case-folded name with single spaces, the cache key."""
+    return " ".join(name.split()).casefold()
+
+
+class SpeciesKeyCache:
+    """Name -> species key (None: no match) in memory, backed by the database."""
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession] = AsyncSessionLocal,
+        max_size: int = 4096
+    ):
+        self._session_factory = session_factory
+        self._memory: TTLCache[Optional[int]] = TTLCache(max_size=max_size)
+
+    @staticmethod
+    def _ttl(species_key: Optional[int]) -> timedelta:
+        days = settings.GBIF_SPECIES_KEY_TTL_DAYS if species_key is not None else settings.GBIF_SPECIES_KEY_MISS_TTL_DAYS
+        return timedelta(days=days)
+
+    def _remember(self, name: str, species_key: Optional[int], resolved_at: datetime) -> None:
+        remaining = (resolved_at + self._ttl(species_key) - datetime.utcnow()).total_seconds()
+        if remaining > 0:
+            self._memory.set(name, species_key, ttl_seconds=remaining)
+
+    async def get_many(self, names: Iterable[str]) -> Dict[str, Optional[int]]:
+        """
+        Cached keys for ``names``; names without an unexpired entry are
+        left out, names GBIF couldn't match map to None.
+        """
+        found: Dict[str, Optional[int]] = {}
+        # Normalized name -> the spellings asked for
+        missing: Dict[str, List[str]] = {}
+        for name in names:
+            normalized = normalize_name(name)
+            species_key = self._memory.get(normalized, _MISSING)
+            if species_key is _MISSING:
+                missing.setdefault(normalized, []).append(name)
+            else:
+                found[name] = species_key
+        if not missing:
+            return found
+
+        try:
+            async with self._session_factory() as session:
+                result = await session.execute(
+                    select(GbifSpeciesKeyModel).where(GbifSpeciesKeyModel.name.in_(list(missing)))
+                )
+                rows = result.scalars().all()
+        except Exception as e:
+            logger.warning(f"GBIF species key cache unavailable: {e}")
+            return found
+
+        now = datetime.utcnow()
+        for row in rows:
+            if row.resolved_at + self._ttl(row.species_key) <= now:
+                continue
+            self._remember(row.name, row.species_key, row.resolved_at)
+            for name in missing[row.name]:
+                found[name] = row.species_key
+        return found
+
+    async def put_many(self, keys: Dict[str, Optional[int]]) -> None:
+        """Store resolved keys (None for names without a match)."""
+        rows = {normalize_name(name): species_key for name, species_key in keys.items()}
+        if not rows:
+            return
+        now = datetime.utcnow()
+        for name, species_key in rows.items():
+            self._remember(name, species_key, now)
+
+        try:
+            async with self._session_factory() as session:
+                await session.execute(delete(GbifSpeciesKeyModel).where(GbifSpeciesKeyModel.name.in_(list(rows))))
+                await session.execute(
+                    insert(GbifSpeciesKeyModel),
+                    [{"name": name, "species_key": key, "resolved_at": now} for name, key in rows.items()]
+                )
+                await session.commit()
+        except Exception as e:
+            logger.warning(f"Failed to persist {len(rows)} GBIF species keys: {e}")
+
+    def clear(self) -> None:
+        """Drop the in-memory copy (the database keeps its entries)."""
+        self._memory.clear()
+
+
+species_key_cache = SpeciesKeyCache()
@@ -0,0 +1,40 @@
+# Copyright (c) 2025 CuongKenn and ICTU-OpenAgri Contributors
+# Licensed under the MIT License. See LICENSE file in the project root for full license information.
+
+"""
+Cache of authenticated users used by the ``get_current_user`` dependency.
+
+Entries are keyed by user ID and hold a copy of the ``User`` entity, so
+protected endpoints can authenticate without a database round trip. Use
+cases that change a user's status, password or existence must call
+``invalidate_cached_user``; the TTL bounds staleness across workers.
+"""
+from typing import Optional
+
+from app.domain.entities.user import User
+from app.infrastructure.cache.ttl_cache import TTLCache
+from app.infrastructure.config.settings import get_settings
+
+settings = get_settings()
+
+auth_user_cache: TTLCache[User] = TTLCache(
+    max_size=settings.AUTH_USER_CACHE_MAX_SIZE,
+    ttl_seconds=settings.AUTH_USER_CACHE_TTL_SECONDS
+)
+
+
+def get_cached_user(user_id: int) -> Optional[User]:
+    """Return a copy of the cached user, or None on a miss."""
+    user = auth_user_cache.get(user_id)
+    return user.model_copy() if user is not None else None
+
+
+def cache_user(user: User) -> None:
+    """Cache a copy of ``user`` for subsequent requests."""
+    if settings.AUTH_USER_CACHE_TTL_SECONDS > 0 and user.id is not None:
+        auth_user_cache.set(user.id, user.model_copy())
+
+
+def invalidate_cached_user(user_id: int) -> None:
+    """Forget the cached entry for ``user_id``."""
+    auth_user_cache.invalidate(user_id)
@@ -39,6 +39,19 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     
+    # Authenticated user cache (0 disables caching)
+    AUTH_USER_CACHE_TTL_SECONDS: int = 60
+    AUTH_USER_CACHE_MAX_SIZE: int = 10000
+    
+    # Max concurrent bcrypt operations (dedicated thread pool size)
+    PASSWORD_HASH_MAX_WORKERS: int = 4
+    
+    # How long admin listing totals are cached (seconds)
+    ADMIN_COUNT_CACHE_TTL_SECONDS: int = 30
+    
+    # How long admin dashboard statistics are cached (0 disables caching)
+    ADMIN_STATS_CACHE_TTL_SECONDS: int = 60
+    
     # Environment
     ENVIRONMENT: str = "development"
 
@@ -51,6 +64,8 @@ class Settings(BaseSettings):
     COPERNICUS_PASSWORD: str = ""
     OUTPUT_DIR: str = "./output"
     MAX_PRODUCTS: int = 20
+    # Charts longer than this many points are served from weekly/monthly/season rollups
+    SATELLITE_CHART_MAX_POINTS: int = 60
 
     # FIWARE Configuration
     ORION_URL: str = "http://localhost:1026"
@@ -58,6 +73,80 @@ class Settings(BaseSettings):
     FIWARE_SERVICE: str = "openagri"
     FIWARE_SERVICEPATH: str = "/farms"
     FIWARE_ENABLED: bool = True
+    # Connection pool shared by all Orion requests
+    FIWARE_HTTP_MAX_CONNECTIONS: int = 20
+    FIWARE_HTTP_MAX_KEEPALIVE: int = 10
+    FIWARE_HTTP_KEEPALIVE_EXPIRY: float = 30.0
+    FIWARE_HTTP2: bool = False  # requires the 'h2' package
+    # Chunking for /entityOperations batch requests
+    FIWARE_BATCH_MAX_ENTITIES: int = 100
+    FIWARE_BATCH_MAX_BYTES: int = 1_000_000
+    # Page size for entity queries (Orion-LD caps limit at 1000)
+    FIWARE_QUERY_PAGE_SIZE: int = 1000
+    # Outbox dispatcher (entities queued alongside satellite data)
+    FIWARE_OUTBOX_DISPATCH_INTERVAL_SECONDS: int = 30
+    FIWARE_OUTBOX_BATCH_SIZE: int = 500
+    FIWARE_OUTBOX_MAX_ATTEMPTS: int = 10
+    FIWARE_OUTBOX_BACKOFF_BASE_SECONDS: float = 30.0
+    FIWARE_OUTBOX_BACKOFF_MAX_SECONDS: float = 3600.0
+    # Claimed rows are skipped by other workers' dispatchers until this expires
+    FIWARE_OUTBOX_LEASE_SECONDS: int = 300
+    # Shared health state (refreshed by the scheduler) and circuit breaker
+    FIWARE_HEALTH_CHECK_INTERVAL_SECONDS: int = 15
+    FIWARE_HEALTH_CACHE_SECONDS: float = 30.0
+    FIWARE_HEALTH_TIMEOUT_SECONDS: float = 2.0
+    FIWARE_BREAKER_FAILURE_THRESHOLD: int = 5
+    FIWARE_BREAKER_RESET_SECONDS: float = 30.0
+
+    # Open-Meteo forecast cache: requests are snapped to a grid cell
+    # (0.05 deg ~ 5.5 km) and cached until the next model update
+    WEATHER_GRID_RESOLUTION_DEG: float = 0.05
+    WEATHER_FORECAST_UPDATE_MINUTES: int = 60
+    WEATHER_FORECAST_UPDATE_OFFSET_MINUTES: int = 5
+    WEATHER_FORECAST_STALE_SECONDS: int = 1800
+    WEATHER_FORECAST_CACHE_MAX_SIZE: int = 4096
+    # Locations per multi-location Open-Meteo request (batch forecasts)
+    WEATHER_BATCH_MAX_LOCATIONS: int = 50
+    WEATHER_BATCH_MAX_FARMS: int = 500
+    # /weather/forecast deadlines: the forecast itself, and the reverse
+    # geocoder running alongside it (a placeholder name is used after that)
+    WEATHER_FORECAST_DEADLINE_SECONDS: float = 10.0
+    WEATHER_GEOCODE_TIMEOUT_SECONDS: float = 1.5
+    # Offline reverse geocoding (data/vietnam_gazetteer.json); a place
+    # without a boundary covers this many times its equivalent radius
+    WEATHER_GAZETTEER_ENABLED: bool = True
+    WEATHER_GAZETTEER_COVERAGE_FACTOR: float = 1.2
+    # Local hourly weather archive per grid cell (Open-Meteo archive API):
+    # the nightly backfill keeps this many days for every farm's cell, up to
+    # the archive's publication lag, fetching at most FETCH_MAX_DAYS per call;
+    # a history request backfills at most ON_DEMAND_MAX_DAYS missing days itself
+    WEATHER_ARCHIVE_HISTORY_DAYS: int = 730
+    WEATHER_ARCHIVE_LAG_DAYS: int = 5
+    WEATHER_ARCHIVE_FETCH_MAX_DAYS: int = 366
+    WEATHER_ARCHIVE_ON_DEMAND_MAX_DAYS: int = 92
+    WEATHER_ARCHIVE_MAX_QUERY_DAYS: int = 1100
+    # Agro-meteorological indices: hourly inputs are fetched once per grid
+    # cell and day, with this much history (rolling rain totals) and forecast
+    WEATHER_AGRO_PAST_DAYS: int = 30
+    WEATHER_AGRO_FORECAST_DAYS: int = 7
+    # Forecast prefetch for every farm's grid cell ahead of the 5-7 am
+    # traffic peak: runs at MINUTE past each of HOURS (cron hour list,
+    # local time in TIMEZONE), just after the hourly model update, so the
+    # cache stays fresh through the peak. Multi-location requests of
+    # WEATHER_BATCH_MAX_LOCATIONS cells, at most CONCURRENCY in flight and
+    # REQUESTS_PER_MINUTE started per minute (0 = no limit)
+    WEATHER_PREFETCH_ENABLED: bool = True
+    WEATHER_PREFETCH_HOURS: str = "4,5,6"
+    WEATHER_PREFETCH_MINUTE: int = 10
+    WEATHER_PREFETCH_TIMEZONE: str = "Asia/Ho_Chi_Minh"
+    WEATHER_PREFETCH_HOURS_AHEAD: int = 24
+    WEATHER_PREFETCH_CONCURRENCY: int = 2
+    WEATHER_PREFETCH_REQUESTS_PER_MINUTE: int = 60
+
+    # GBIF scientific name -> species key cache (gbif_species_keys table);
+    # names GBIF can't match are remembered for a shorter time
+    GBIF_SPECIES_KEY_TTL_DAYS: int = 90
+    GBIF_SPECIES_KEY_MISS_TTL_DAYS: int = 7
 
 
 @lru_cache()
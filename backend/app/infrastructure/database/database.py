@@ -4,10 +4,14 @@
 """
 Database configuration and session management.
 """
+import logging
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import declarative_base
 from app.infrastructure.config.settings import get_settings
 
+logger = logging.getLogger(__name__)
 settings = get_settings()
 
 # Create async engine
@@ -43,7 +47,38 @@ async def get_db() -> AsyncSession:
             await session.close()
 
 
+def _add_missing_columns(conn: Connection) -> None:
+    """
+    Add columns and indexes declared on models but missing from existing tables.
+    
+    ``create_all`` only creates new tables, so databases created by an older
+    version would otherwise lack newly added (nullable) columns.
+    """
+    inspector = inspect(conn)
+    for table in Base.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing = {col["name"] for col in inspector.get_columns(table.name)}
+        for col in table.columns:
+            if col.name in existing:
+                continue
+            col_type = col.type.compile(dialect=conn.dialect)
+            conn.execute(text(f'ALTER TABLE {table.name} ADD COLUMN {col.name} {col_type}'))
+            logger.info(f"Added column {table.name}.{col.name}")
+        for index in table.indexes:
+            index.create(conn, checkfirst=True)
+
+
 async def init_db():
     """Initialize database tables."""
+    from app.infrastructure.database.spatial_index import backfill_farm_geometry, setup_spatial_index
+    from app.infrastructure.database.search_index import setup_search_index
+    from app.infrastructure.database.satellite_rollups import rebuild_satellite_rollups
+    
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(_add_missing_columns)
+        await conn.run_sync(backfill_farm_geometry)
+        await conn.run_sync(setup_spatial_index)
+        await conn.run_sync(setup_search_index)
+        await conn.run_sync(rebuild_satellite_rollups)
@@ -0,0 +1,44 @@
+# Copyright (c) 2025 CuongKenn and ICTU-OpenAgri Contributors
+# Licensed under the MIT License. See LICENSE file in the project root for full license information.
+
+"""
+Optional SQLite features (virtual tables such as the R-tree or FTS5 index),
+tracked per engine so that several databases in one process don't share a flag.
+"""
+from weakref import WeakKeyDictionary
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+class SQLiteTableFeature:
+    """
+    Whether an engine's database has ``table_name``.
+
+    ``set()`` records the outcome of creating the table; engines that never
+    ran the setup are checked against ``sqlite_master`` on first use. Either
+    way the answer is cached for the engine's lifetime.
+    """
+
+    def __init__(self, table_name: str):
+        self.table_name = table_name
+        self._engines: "WeakKeyDictionary[Engine, bool]" = WeakKeyDictionary()
+
+    def set(self, engine: Engine, enabled: bool) -> None:
+        self._engines[engine] = enabled
+
+    async def enabled(self, session: AsyncSession) -> bool:
+        engine = session.get_bind()
+        enabled = self._engines.get(engine)
+        if enabled is None:
+            enabled = await session.run_sync(lambda sync_session: self._exists(sync_session.connection()))
+            self._engines[engine] = enabled
+        return enabled
+
+    def _exists(self, conn: Connection) -> bool:
+        if conn.dialect.name != "sqlite":
+            return False
+        return conn.execute(
+            text("SELECT 1 FROM sqlite_master WHERE name = :name"), {"name": self.table_name}
+        ).first() is not None
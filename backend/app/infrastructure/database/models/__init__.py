@@ -4,3 +4,8 @@
 from .user_model import UserModel
 from .farm_model import FarmModel
 from .satellite_data_model import SatelliteDataModel
+from .satellite_rollup_model import SatelliteRollupModel
+from .fiware_outbox_model import FiwareOutboxModel
+from .fiware_sync_state_model import FiwareSyncStateModel
+from .weather_archive_model import WeatherArchiveModel
+from .gbif_species_key_model import GbifSpeciesKeyModel
@@ -5,8 +5,8 @@
 SQLAlchemy Farm model.
 """
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime, JSON
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime, JSON, Index, LargeBinary
+from sqlalchemy.orm import query_expression, relationship
 from app.infrastructure.database.database import Base
 
 class FarmModel(Base):
@@ -18,11 +18,32 @@ class FarmModel(Base):
     name = Column(String, index=True, nullable=False)
     description = Column(String, nullable=True)
     coordinates = Column(JSON, nullable=False)  # Storing coordinates as JSON
+    # Same vertices as little-endian float64 (lat, lng) pairs; used for reads
+    coordinates_packed = Column(LargeBinary, nullable=True)
+    # JSON coordinates of rows without the packed copy, loaded on demand by
+    # the repository (``coordinates`` itself is deferred there)
+    coordinates_unpacked = query_expression()
     area_size = Column(Float, nullable=True)
     crop_type = Column(String, nullable=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    
+    # Derived geometry, recomputed whenever coordinates change
+    min_lat = Column(Float, nullable=True)
+    min_lng = Column(Float, nullable=True)
+    max_lat = Column(Float, nullable=True)
+    max_lng = Column(Float, nullable=True)
+    centroid_lat = Column(Float, nullable=True)
+    centroid_lng = Column(Float, nullable=True)
+    geodesic_area_m2 = Column(Float, nullable=True)
+    mgrs_tile = Column(String, nullable=True, index=True)  # Sentinel-2 tile, e.g. "48QWJ"
+    
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     # Relationship with user
     owner = relationship("UserModel", backref="farms")
+    
+    __table_args__ = (
+        # Fallback for bbox queries when the SQLite R-tree module is unavailable
+        Index("ix_farms_bbox", "min_lat", "max_lat", "min_lng", "max_lng"),
+    )
@@ -0,0 +1,35 @@
+# Copyright (c) 2025 CuongKenn and ICTU-OpenAgri Contributors
+# Licensed under the MIT License. See LICENSE file in the project root for full license information.
+
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, DateTime, JSON, Text, Index
+from app.infrastructure.database.database import Base
+
+class FiwareOutboxModel(Base):
+    """
+    NGSI-LD entities waiting to be upserted to FIWARE Orion.
+
+    Rows are written in the same transaction as the data they describe and
+    removed once Orion has accepted them; failed rows are retried with
+    exponential backoff. A dispatcher claims the rows it sends by setting
+    ``claimed_by``/``claimed_until``, so dispatchers running in other
+    workers skip them until the lease expires.
+    """
+    __tablename__ = "fiware_outbox"
+
+    id = Column(Integer, primary_key=True, index=True)
+    entity_id = Column(String, nullable=False)
+    payload = Column(JSON, nullable=False)
+
+    attempts = Column(Integer, nullable=False, default=0)
+    next_attempt_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    last_error = Column(Text, nullable=True)
+
+    claimed_by = Column(String, nullable=True)
+    claimed_until = Column(DateTime, nullable=True)
+
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index("ix_fiware_outbox_due", "attempts", "next_attempt_at"),
+    )
@@ -0,0 +1,19 @@
+# Copyright (c) 2025 CuongKenn and ICTU-OpenAgri Contributors
+# Licensed under the MIT License. See LICENSE file in the project root for full license information.
+
+from datetime import datetime
+from sqlalchemy import Column, String, DateTime, JSON
+from app.infrastructure.database.database import Base
+
+class FiwareSyncStateModel(Base):
+    """
+    Content hashes of the last version of an entity Orion accepted.
+
+    One hash per NGSI-LD attribute, so unchanged entities are skipped and
+    changed ones are sent as attribute deltas.
+    """
+    __tablename__ = "fiware_sync_state"
+
+    entity_id = Column(String, primary_key=True)
+    attr_hashes = Column(JSON, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
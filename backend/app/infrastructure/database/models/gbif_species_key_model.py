@@ -0,0 +1,20 @@
+# Copyright (c) 2025 CuongKenn and ICTU-OpenAgri Contributors
+# Licensed under the MIT License. See LICENSE file in the project root for full license information.
+
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, DateTime
+from app.infrastructure.database.database import Base
+
+class GbifSpeciesKeyModel(Base):
+    """
+    GBIF backbone species key resolved for a scientific name.
+
+    ``name`` is normalized (case-folded, single spaces). A NULL
+    ``species_key`` records that GBIF has no species-level match, so
+    unknown names aren't looked up on every request either.
+    """
+    __tablename__ = "gbif_species_keys"
+
+    name = Column(String, primary_key=True)
+    species_key = Column(Integer, nullable=True)
+    resolved_at = Column(DateTime, default=datetime.utcnow, nullable=False)
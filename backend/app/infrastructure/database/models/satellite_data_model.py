@@ -2,7 +2,7 @@
 # Licensed under the MIT License. See LICENSE file in the project root for full license information.
 
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime, Date
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime, Date, Index
 from sqlalchemy.orm import relationship
 from app.infrastructure.database.database import Base
 
@@ -36,3 +36,8 @@ class SatelliteDataModel(Base):
 
     # Relationship
     farm = relationship("FarmModel", backref="satellite_data")
+
+    __table_args__ = (
+        # Covers per-farm history reads (single farm and bulk) in date order
+        Index("ix_satellite_data_farm_type_date", "farm_id", "data_type", "acquisition_date"),
+    )
@@ -0,0 +1,43 @@
+# Copyright (c) 2025 CuongKenn and ICTU-OpenAgri Contributors
+# Licensed under the MIT License. See LICENSE file in the project root for full license information.
+
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime, Date, UniqueConstraint
+from app.infrastructure.database.database import Base
+
+class SatelliteRollupModel(Base):
+    """
+    Per-farm aggregates of satellite observations by week, month and season.
+
+    Maintained incrementally whenever a ``satellite_data`` row is saved, so
+    long-range charts read one row per bucket instead of every observation.
+    Aggregates are over each observation's ``mean_value``.
+    """
+    __tablename__ = "satellite_rollups"
+
+    id = Column(Integer, primary_key=True, index=True)
+    farm_id = Column(Integer, ForeignKey("farms.id", ondelete="CASCADE"), nullable=False)
+    data_type = Column(String, nullable=False)
+
+    # 'week' (ISO, Monday start), 'month' or 'season'
+    granularity = Column(String, nullable=False)
+    bucket_start = Column(Date, nullable=False)
+
+    count = Column(Integer, nullable=False, default=0)
+    sum_value = Column(Float, nullable=False, default=0.0)
+    min_value = Column(Float, nullable=True)
+    max_value = Column(Float, nullable=True)
+
+    # Most recent observation in the bucket
+    last_value = Column(Float, nullable=True)
+    last_date = Column(Date, nullable=True)
+
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        UniqueConstraint("farm_id", "data_type", "granularity", "bucket_start", name="uq_satellite_rollups_bucket"),
+    )
+
+    @property
+    def mean_value(self) -> float:
+        return self.sum_value / self.count if self.count else 0.0
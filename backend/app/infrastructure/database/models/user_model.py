@@ -5,7 +5,7 @@
 SQLAlchemy User model.
 """
 from datetime import datetime
-from sqlalchemy import Boolean, Column, Integer, String, DateTime
+from sqlalchemy import Boolean, Column, Integer, String, DateTime, Index
 from app.infrastructure.database.database import Base
 
 
@@ -23,3 +23,8 @@ class UserModel(Base):
     is_superuser = Column(Boolean, default=False)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    __table_args__ = (
+        # Keyset pagination order for the admin user list
+        Index("ix_users_created_at_id", "created_at", "id"),
+    )
@@ -0,0 +1,32 @@
+# Copyright (c) 2025 CuongKenn and ICTU-OpenAgri Contributors
+# Licensed under the MIT License. See LICENSE file in the project root for full license information.
+
+from sqlalchemy import Column, Integer, Float, DateTime, Date, Index, UniqueConstraint
+from app.infrastructure.database.database import Base
+
+class WeatherArchiveModel(Base):
+    """
+    Hourly historical weather (Open-Meteo archive) per forecast grid cell.
+
+    Cells are the ``snap_to_grid`` centres shared with the forecast cache.
+    Times are local to the cell (``timezone=auto``) and ``day`` is their
+    date, so daily aggregates can be grouped in the database. Filled by
+    the nightly backfill and on demand, one complete day at a time.
+    """
+    __tablename__ = "weather_archive_hourly"
+
+    id = Column(Integer, primary_key=True, index=True)
+    cell_lat = Column(Float, nullable=False)
+    cell_lng = Column(Float, nullable=False)
+    time = Column(DateTime, nullable=False)
+    day = Column(Date, nullable=False)
+
+    temperature_2m = Column(Float, nullable=True)
+    relative_humidity_2m = Column(Float, nullable=True)
+    precipitation = Column(Float, nullable=True)
+    wind_speed_10m = Column(Float, nullable=True)
+
+    __table_args__ = (
+        UniqueConstraint("cell_lat", "cell_lng", "time", name="uq_weather_archive_hour"),
+        Index("ix_weather_archive_cell_day", "cell_lat", "cell_lng", "day"),
+    )
@@ -0,0 +1,38 @@
+# Copyright (c) 2025 CuongKenn and ICTU-OpenAgri Contributors
+# Licensed under the MIT License. See LICENSE file in the project root for full license information.
+
+"""
+Opaque cursors for keyset pagination.
+
+A cursor encodes the sort key of the last row on a page; the next page
+starts strictly after it, so deep pages cost the same as the first one
+(unlike OFFSET, which scans and discards every skipped row).
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Any, List
+
+
+def encode_cursor(*values: Any) -> str:
+    """Encode a row's sort key as a URL-safe cursor string."""
+    payload = [v.isoformat() if isinstance(v, datetime) else v for v in values]
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, length: int) -> List[Any]:
+    """
+    Decode a cursor produced by ``encode_cursor``.
+
+    Raises:
+        ValueError: If the cursor is malformed or has the wrong number of keys.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+    except (ValueError, TypeError) as e:
+        raise ValueError("Invalid pagination cursor") from e
+    if not isinstance(values, list) or len(values) != length:
+        raise ValueError("Invalid pagination cursor")
+    return values
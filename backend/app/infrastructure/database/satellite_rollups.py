@@ -0,0 +1,169 @@
+# Copyright (c) 2025 CuongKenn and ICTU-OpenAgri Contributors
+# Licensed under the MIT License. See LICENSE file in the project root for full license information.
+
+"""
+Bucketing rules for the ``satellite_rollups`` table.
+
+Observations are rolled up per farm and data type into ISO weeks,
+calendar months and Vietnamese cropping seasons:
+
+- Đông Xuân (winter-spring): December - April
+- Hè Thu (summer-autumn): May - August
+- Thu Đông (autumn-winter): September - November
+
+Each bucket is identified by its first day. Chart reads use the finest
+granularity that keeps the number of points within
+``SATELLITE_CHART_MAX_POINTS``, falling back to raw rows for short ranges.
+"""
+import datetime
+import logging
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.engine import Connection
+
+from app.infrastructure.config.settings import get_settings
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+GRANULARITIES = ("week", "month", "season")
+
+# Approximate bucket lengths in days, used to estimate chart sizes.
+# Raw rows are spaced by the satellite revisit time (~5 days).
+_APPROX_DAYS = {None: 5, "week": 7, "month": 30.44, "season": 121.7}
+
+
+def bucket_start(day: datetime.date, granularity: str) -> datetime.date:
+    """Return the first day of the ``granularity`` bucket containing ``day``."""
+    if granularity == "week":
+        return day - datetime.timedelta(days=day.weekday())
+    if granularity == "month":
+        return day.replace(day=1)
+    if granularity == "season":
+        # December opens the following year's winter-spring crop
+        if day.month == 12:
+            return datetime.date(day.year, 12, 1)
+        if day.month <= 4:
+            return datetime.date(day.year - 1, 12, 1)
+        if day.month <= 8:
+            return datetime.date(day.year, 5, 1)
+        return datetime.date(day.year, 9, 1)
+    raise ValueError(f"Unknown rollup granularity: {granularity}")
+
+
+def bucket_end(start: datetime.date, granularity: str) -> datetime.date:
+    """Return the last day of the ``granularity`` bucket starting on ``start``."""
+    if granularity == "week":
+        return start + datetime.timedelta(days=6)
+    if granularity == "month":
+        next_start = (start.replace(day=28) + datetime.timedelta(days=4)).replace(day=1)
+    elif granularity == "season":
+        if start.month == 12:
+            next_start = datetime.date(start.year + 1, 5, 1)
+        elif start.month == 5:
+            next_start = datetime.date(start.year, 9, 1)
+        else:
+            next_start = datetime.date(start.year, 12, 1)
+    else:
+        raise ValueError(f"Unknown rollup granularity: {granularity}")
+    return next_start - datetime.timedelta(days=1)
+
+
+def choose_granularity(start_date: datetime.date, end_date: datetime.date,
+                       max_points: Optional[int] = None) -> Optional[str]:
+    """
+    Pick the resolution for a chart over ``[start_date, end_date]``.
+
+    Returns None when raw observations fit within ``max_points``, otherwise
+    the finest rollup granularity that does (seasons if none do).
+    """
+    max_points = max_points or settings.SATELLITE_CHART_MAX_POINTS
+    days = (end_date - start_date).days + 1
+    for granularity in (None,) + GRANULARITIES:
+        if days / _APPROX_DAYS[granularity] <= max_points:
+            return granularity
+    return GRANULARITIES[-1]
+
+
+def apply_observation(rollup, value: float, day: datetime.date) -> None:
+    """Fold one observation into a rollup row (model instance or namespace)."""
+    rollup.count = (rollup.count or 0) + 1
+    rollup.sum_value = (rollup.sum_value or 0.0) + value
+    rollup.min_value = value if rollup.min_value is None else min(rollup.min_value, value)
+    rollup.max_value = value if rollup.max_value is None else max(rollup.max_value, value)
+    if rollup.last_date is None or day >= rollup.last_date:
+        rollup.last_date = day
+        rollup.last_value = value
+
+
+def rollup_chart_point(rollup) -> dict:
+    """Chart point for a rollup bucket (same 'date'/'value' keys as raw points)."""
+    return {
+        'date': rollup.bucket_start.strftime('%Y-%m-%d'),
+        'value': round(rollup.mean_value, 2),
+        'min': round(rollup.min_value, 2) if rollup.min_value is not None else None,
+        'max': round(rollup.max_value, 2) if rollup.max_value is not None else None,
+        'count': rollup.count,
+        'last': round(rollup.last_value, 2) if rollup.last_value is not None else None,
+    }
+
+
+class _EmptyBucket:
+    """In-memory rollup accumulator used by ``rebuild_satellite_rollups``."""
+    __slots__ = ("count", "sum_value", "min_value", "max_value", "last_value", "last_date")
+
+    def __init__(self):
+        self.count = 0
+        self.sum_value = 0.0
+        self.min_value = None
+        self.max_value = None
+        self.last_value = None
+        self.last_date = None
+
+
+def rebuild_satellite_rollups(conn: Connection) -> int:
+    """Populate an empty rollup table from existing ``satellite_data`` rows."""
+    from app.infrastructure.database.models.satellite_data_model import SatelliteDataModel
+    from app.infrastructure.database.models.satellite_rollup_model import SatelliteRollupModel
+
+    rollups = SatelliteRollupModel.__table__
+    observations = SatelliteDataModel.__table__
+
+    if conn.execute(select(func.count()).select_from(rollups)).scalar():
+        return 0
+
+    buckets: Dict[Tuple, _EmptyBucket] = {}
+    rows = conn.execute(
+        select(observations.c.farm_id, observations.c.data_type,
+               observations.c.acquisition_date, observations.c.mean_value)
+        .order_by(observations.c.acquisition_date)
+    )
+    for farm_id, data_type, day, value in rows:
+        for granularity in GRANULARITIES:
+            start = bucket_start(day, granularity)
+            bucket = buckets.setdefault(
+                (farm_id, data_type, granularity, start),
+                _EmptyBucket(),
+            )
+            apply_observation(bucket, value, day)
+
+    if buckets:
+        conn.execute(rollups.insert(), [
+            {
+                "farm_id": farm_id,
+                "data_type": data_type,
+                "granularity": granularity,
+                "bucket_start": start,
+                "count": bucket.count,
+                "sum_value": bucket.sum_value,
+                "min_value": bucket.min_value,
+                "max_value": bucket.max_value,
+                "last_value": bucket.last_value,
+                "last_date": bucket.last_date,
+            }
+            for (farm_id, data_type, granularity, start), bucket in buckets.items()
+        ])
+        logger.info(f"Built {len(buckets)} satellite rollup buckets")
+    return len(buckets)
+
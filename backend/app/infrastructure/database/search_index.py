@@ -0,0 +1,119 @@
+# Copyright (c) 2025 CuongKenn and ICTU-OpenAgri Contributors
+# Licensed under the MIT License. See LICENSE file in the project root for full license information.
+
+"""
+Full-text search index over user email, username and full name.
+
+On SQLite the ``users_fts`` FTS5 table (trigram tokenizer) is an external
+content index over ``users`` kept in sync by triggers, so substring search
+in the admin panel is an index lookup instead of three ``LIKE '%x%'``
+scans. Terms shorter than a trigram, other backends, or SQLite builds
+without FTS5 fall back to ``ILIKE``.
+"""
+import logging
+
+from sqlalchemy import column, literal_column, or_, select, table, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.infrastructure.database.engine_features import SQLiteTableFeature
+
+logger = logging.getLogger(__name__)
+
+USERS_FTS = "users_fts"
+
+# Trigram tokenizer needs at least three characters to match
+MIN_INDEXED_TERM_LENGTH = 3
+
+users_fts = table(USERS_FTS, column("rowid"))
+
+_fts = SQLiteTableFeature(USERS_FTS)
+
+_FTS_DDL = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {USERS_FTS} USING fts5(
+        email, username, full_name,
+        content='users', content_rowid='id', tokenize='trigram'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS users_fts_insert AFTER INSERT ON users BEGIN
+        INSERT INTO {USERS_FTS}(rowid, email, username, full_name)
+            VALUES (NEW.id, NEW.email, NEW.username, NEW.full_name);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS users_fts_delete AFTER DELETE ON users BEGIN
+        INSERT INTO {USERS_FTS}({USERS_FTS}, rowid, email, username, full_name)
+            VALUES ('delete', OLD.id, OLD.email, OLD.username, OLD.full_name);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS users_fts_update AFTER UPDATE OF email, username, full_name ON users BEGIN
+        INSERT INTO {USERS_FTS}({USERS_FTS}, rowid, email, username, full_name)
+            VALUES ('delete', OLD.id, OLD.email, OLD.username, OLD.full_name);
+        INSERT INTO {USERS_FTS}(rowid, email, username, full_name)
+            VALUES (NEW.id, NEW.email, NEW.username, NEW.full_name);
+    END
+    """,
+]
+
+_FTS_TRIGGERS = ("users_fts_insert", "users_fts_delete", "users_fts_update")
+
+
+async def search_index_enabled(session: AsyncSession) -> bool:
+    """Whether the session's database has the FTS5 index for user search."""
+    return await _fts.enabled(session)
+
+
+def setup_search_index(conn: Connection) -> bool:
+    """
+    Create the users FTS5 index and its sync triggers (SQLite only).
+
+    The index is only rebuilt from ``users`` when it or a trigger was just
+    created, or when it doesn't hold one entry per user.
+    """
+    global _search_index_enabled
+
+    if conn.dialect.name != "sqlite":
+        _fts = SQLiteTableFeature(USERS_FTS)
+        return False
+
+    try:
+        names = (USERS_FTS,) + _FTS_TRIGGERS
+        existing = conn.execute(
+            text(f"SELECT count(*) FROM sqlite_master WHERE name IN ({', '.join(repr(n) for n in names)})")
+        ).scalar()
+        for statement in _FTS_DDL:
+            conn.execute(text(statement))
+        indexed = conn.execute(text(f"SELECT count(*) FROM {USERS_FTS}_docsize")).scalar()
+        users = conn.execute(text("SELECT count(*) FROM users")).scalar()
+        if existing < len(names) or indexed != users:
+            logger.info(f"Rebuilding the {USERS_FTS} index ({indexed} of {users} users indexed)")
+            conn.execute(text(f"INSERT INTO {USERS_FTS}({USERS_FTS}) VALUES ('rebuild')"))
+    except Exception as e:
+        logger.warning(f"SQLite FTS5 trigram tokenizer unavailable, using ILIKE for user search: {e}")
+        _fts = SQLiteTableFeature(USERS_FTS)
+        return False
+
+    _search_index_enabled = True
+    return True
+
+
+async def user_search_condition(session: AsyncSession, term: str):
+    """WHERE clause matching users whose email, username or full name contains ``term``."""
+    from app.infrastructure.database.models.user_model import UserModel
+
+    term = term.strip()
+    if len(term) >= MIN_INDEXED_TERM_LENGTH and await search_index_enabled(session):
+        # Quote as an FTS5 string so punctuation like '@' or '.' is literal
+        phrase = '"' + term.replace('"', '""') + '"'
+        matches = select(users_fts.c.rowid).where(literal_column(USERS_FTS).op("MATCH")(phrase))
+        return UserModel.id.in_(matches)
+
+    pattern = f"%{term}%"
+    return or_(
+        UserModel.email.ilike(pattern),
+        UserModel.username.ilike(pattern),
+        UserModel.full_name.ilike(pattern),
+    )
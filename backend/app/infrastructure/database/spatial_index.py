@@ -0,0 +1,127 @@
+# Copyright (c) 2025 CuongKenn and ICTU-OpenAgri Contributors
+# Licensed under the MIT License. See LICENSE file in the project root for full license information.
+
+"""
+R-tree spatial index over farm bounding boxes.
+
+On SQLite the ``farms_rtree`` virtual table (rtree module) mirrors the
+persisted bbox columns of ``farms`` and is kept in sync by triggers, so
+viewport and radius queries only touch candidate rows. On other backends,
+or SQLite builds without rtree, queries fall back to the plain bbox columns
+and their composite index.
+"""
+import logging
+
+from sqlalchemy import column, or_, select, table, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.domain.entities.farm import PackedCoordinates
+from app.infrastructure.database.engine_features import SQLiteTableFeature
+from app.infrastructure.geo.farm_geometry import compute_farm_geometry
+
+logger = logging.getLogger(__name__)
+
+FARMS_RTREE = "farms_rtree"
+
+farms_rtree = table(
+    FARMS_RTREE,
+    column("id"),
+    column("min_lat"),
+    column("max_lat"),
+    column("min_lng"),
+    column("max_lng"),
+)
+
+_rtree = SQLiteTableFeature(FARMS_RTREE)
+
+_RTREE_DDL = [
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FARMS_RTREE} USING rtree(id, min_lat, max_lat, min_lng, max_lng)",
+    f"""
+    CREATE TRIGGER IF NOT EXISTS farms_rtree_insert AFTER INSERT ON farms
+    WHEN NEW.min_lat IS NOT NULL
+    BEGIN
+        INSERT OR REPLACE INTO {FARMS_RTREE} VALUES (NEW.id, NEW.min_lat, NEW.max_lat, NEW.min_lng, NEW.max_lng);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS farms_rtree_update AFTER UPDATE OF min_lat, max_lat, min_lng, max_lng ON farms
+    BEGIN
+        DELETE FROM {FARMS_RTREE} WHERE id = OLD.id;
+        INSERT INTO {FARMS_RTREE}
+            SELECT NEW.id, NEW.min_lat, NEW.max_lat, NEW.min_lng, NEW.max_lng
+            WHERE NEW.min_lat IS NOT NULL;
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS farms_rtree_delete AFTER DELETE ON farms
+    BEGIN
+        DELETE FROM {FARMS_RTREE} WHERE id = OLD.id;
+    END
+    """,
+    f"""
+    INSERT OR REPLACE INTO {FARMS_RTREE}
+        SELECT id, min_lat, max_lat, min_lng, max_lng FROM farms WHERE min_lat IS NOT NULL
+    """,
+]
+
+
+async def spatial_index_enabled(session: AsyncSession) -> bool:
+    """Whether the session's database has the R-tree index for farm queries."""
+    return await _rtree.enabled(session)
+
+
+def backfill_farm_geometry(conn: Connection) -> int:
+    """Compute derived geometry and packed coordinates for farms saved before those columns existed."""
+    from app.infrastructure.database.models.farm_model import FarmModel
+
+    farms = FarmModel.__table__
+    rows = conn.execute(
+        select(farms.c.id, farms.c.coordinates).where(
+            or_(farms.c.min_lat.is_(None), farms.c.coordinates_packed.is_(None))
+        )
+    ).all()
+
+    count = 0
+    for farm_id, coordinates in rows:
+        if not coordinates:
+            continue
+        geometry = compute_farm_geometry(coordinates)
+        packed = PackedCoordinates.from_coordinates(coordinates).to_bytes()
+        conn.execute(
+            farms.update().where(farms.c.id == farm_id).values(coordinates_packed=packed, **geometry)
+        )
+        count += 1
+    if count:
+        logger.info(f"Backfilled geometry for {count} farms")
+    return count
+
+
+def setup_spatial_index(conn: Connection) -> bool:
+    """Create the farms R-tree and its sync triggers (SQLite only)."""
+    global _spatial_index_enabled
+
+    if conn.dialect.name != "sqlite":
+        _rtree = SQLiteTableFeature(FARMS_RTREE)
+        return False
+
+    try:
+        for statement in _RTREE_DDL:
+            conn.execute(text(statement))
+    except Exception as e:
+        logger.warning(f"SQLite R-tree module unavailable, using bbox columns for spatial queries: {e}")
+        _rtree = SQLiteTableFeature(FARMS_RTREE)
+        return False
+
+    _spatial_index_enabled = True
+    return True
+
+
+def rtree_candidate_ids(min_lat: float, min_lng: float, max_lat: float, max_lng: float):
+    """Subquery of farm IDs whose R-tree box intersects the given bbox."""
+    return select(farms_rtree.c.id).where(
+        farms_rtree.c.max_lat >= min_lat,
+        farms_rtree.c.min_lat <= max_lat,
+        farms_rtree.c.max_lng >= min_lng,
+        farms_rtree.c.min_lng <= max_lng,
+    )
@@ -0,0 +1,84 @@
+# Copyright (c) 2025 CuongKenn and ICTU-OpenAgri Contributors
+# Licensed under the MIT License. See LICENSE file in the project root for full license information.
+
+"""
+Circuit breaker for calls to external services.
+"""
+import time
+from typing import Callable, Optional
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Closed / open / half-open circuit breaker.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and
+    ``allow_request`` returns False, so callers fail fast. Once
+    ``reset_timeout`` seconds have passed the circuit is half-open: a single
+    trial request is let through, and its outcome closes or re-opens the
+    circuit. Like ``TTLCache`` it is meant to be used from the event loop,
+    so no locking is done.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        if failure_threshold < 1:
+            raise ValueError("failure_threshold must be at least 1")
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        """Current state; reading it never changes the circuit."""
+        if self._state == OPEN and self._reset_due():
+            return HALF_OPEN
+        return self._state
+
+    @property
+    def consecutive_failures(self) -> int:
+        return self._failures
+
+    def allow_request(self) -> bool:
+        """Whether a call may be made now (claims the trial call when half-open)."""
+        if self._state == OPEN and self._reset_due():
+            self._state = HALF_OPEN
+            self._trial_in_flight = False
+        if self._state == CLOSED:
+            return True
+        if self._state == HALF_OPEN and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        if self._state == HALF_OPEN or self._failures >= self.failure_threshold:
+            self.trip()
+
+    def _reset_due(self) -> bool:
+        return self._clock() - self._opened_at >= self.reset_timeout
+
+    def trip(self) -> None:
+        """Open the circuit now (e.g. after a failed health probe)."""
+        self._state = OPEN
+        self._opened_at = self._clock()
+        self._trial_in_flight = False
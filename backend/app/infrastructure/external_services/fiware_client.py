@@ -5,10 +5,15 @@
 FIWARE Orion Context Broker client for NGSI-LD API.
 Implements Smart Data Models for Agriculture (AgriFood).
 """
+import asyncio
 import httpx
+import json
 import logging
-from typing import Dict, Any, Optional, List
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Any, AsyncIterator, Iterable, Iterator, Optional, List, Tuple
 from datetime import datetime, timezone
+from app.infrastructure.external_services.circuit_breaker import CircuitBreaker, OPEN
 from app.infrastructure.config.settings import get_settings
 
 logger = logging.getLogger(__name__)
@@ -22,6 +27,44 @@ class FiwareClientError(Exception):
         self.status_code = status_code
         super().__init__(message)
 
+
+@dataclass
+class BatchOperationResult:
+    """Outcome of a batch entity operation, per entity."""
+    success: List[str] = field(default_factory=list)
+    errors: List[Dict[str, Any]] = field(default_factory=list)  # {entity_id, status_code, message}
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+    def raise_for_errors(self) -> bool:
+        """Raise FiwareClientError for the first failed entity, else return True."""
+        if self.errors:
+            error = self.errors[0]
+            raise FiwareClientError(error["status_code"], error["message"])
+        return True
+
+    def merge(self, other: "BatchOperationResult") -> None:
+        self.success.extend(other.success)
+        self.errors.extend(other.errors)
+
+
+def _create_http_client() -> httpx.AsyncClient:
+    """Build the pooled HTTP client used for Orion requests."""
+    limits = httpx.Limits(
+        max_connections=settings.FIWARE_HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.FIWARE_HTTP_MAX_KEEPALIVE,
+        keepalive_expiry=settings.FIWARE_HTTP_KEEPALIVE_EXPIRY
+    )
+    if settings.FIWARE_HTTP2:
+        try:
+            return httpx.AsyncClient(timeout=30.0, limits=limits, http2=True)
+        except ImportError:
+            logger.warning("FIWARE_HTTP2 is enabled but the 'h2' package is not installed; using HTTP/1.1")
+    return httpx.AsyncClient(timeout=30.0, limits=limits)
+
+
 # FIWARE Smart Data Models for Agriculture
 CONTEXT = [
     "https://uri.etsi.org/ngsi-ld/v1/ngsi-ld-core-context.jsonld",
@@ -30,10 +73,30 @@ CONTEXT = [
 
 
 class FiwareClient:
-    """Client for FIWARE Orion Context Broker (NGSI-LD)."""
+    """
+    Client for FIWARE Orion Context Broker (NGSI-LD).
     
-    def __init__(self, orion_url: str = None):
+    Requests go through one pooled ``httpx.AsyncClient`` (keep-alive, and
+    HTTP/2 when ``FIWARE_HTTP2`` is set and ``h2`` is installed), so calls
+    after the first reuse an open connection. Use ``get_fiware_client()``
+    for the app-wide instance; it is closed on application shutdown.
+    
+    Orion requests pass through a circuit breaker, and ``health_check()``
+    reads a shared health state that is probed at most every
+    ``FIWARE_HEALTH_CACHE_SECONDS`` (the scheduler refreshes it sooner).
+    """
+    
+    def __init__(self, orion_url: str = None, http_client: Optional[httpx.AsyncClient] = None):
         self.orion_url = orion_url or settings.ORION_URL
+        self._http_client = http_client
+        self.breaker = CircuitBreaker(
+            failure_threshold=settings.FIWARE_BREAKER_FAILURE_THRESHOLD,
+            reset_timeout=settings.FIWARE_BREAKER_RESET_SECONDS
+        )
+        self._healthy = False
+        self._health_checked_at: Optional[float] = None
+        self._health_lock = asyncio.Lock()
+        self.last_health_check: Optional[datetime] = None
         service_path = settings.FIWARE_SERVICEPATH or "/"
         if not service_path.startswith("/"):
             service_path = f"/{service_path}"
@@ -44,107 +107,188 @@ class FiwareClient:
             "FIWARE-ServicePath": service_path
         }
     
+    @property
+    def http(self) -> httpx.AsyncClient:
+        """Pooled HTTP client, created on first use."""
+        if self._http_client is None or self._http_client.is_closed:
+            self._http_client = _create_http_client()
+        return self._http_client
+    
+    async def aclose(self) -> None:
+        """Close pooled connections."""
+        if self._http_client is not None and not self._http_client.is_closed:
+            await self._http_client.aclose()
+        self._http_client = None
+    
     async def health_check(self) -> bool:
         """Check if Orion Context Broker is available."""
-        async with httpx.AsyncClient(timeout=5.0) as client:
-            try:
-                response = await client.get(f"{self.orion_url}/version")
-                return response.status_code == 200
-            except Exception as e:
-                logger.error(f"Orion health check failed: {e}")
-                return False
+        # Shared state: a real probe only when the last one is stale (normally
+        # the scheduler refreshes it in the background) and never while the
+        # circuit is open
+        if self.breaker.state == OPEN:
+            return False
+        if self._health_checked_at is None or (
+            time.monotonic() - self._health_checked_at >= settings.FIWARE_HEALTH_CACHE_SECONDS
+        ):
+            async with self._health_lock:
+                if self._health_checked_at is None or (
+                    time.monotonic() - self._health_checked_at >= settings.FIWARE_HEALTH_CACHE_SECONDS
+                ):
+                    await self.refresh_health()
+        return self._healthy and self.breaker.state != OPEN
+    
+    async def refresh_health(self) -> bool:
+        """Probe GET /version and update the shared health state and circuit."""
+        client = self.http
+        try:
+            response = await client.get(
+                f"{self.orion_url}/version",
+                timeout=settings.FIWARE_HEALTH_TIMEOUT_SECONDS
+            )
+            healthy = response.status_code == 200
+        except Exception as e:
+            logger.error(f"Orion health check failed: {e}")
+            healthy = False
+        
+        if healthy:
+            self.breaker.record_success()
+        else:
+            self.breaker.trip()
+        self._healthy = healthy
+        self._health_checked_at = time.monotonic()
+        self.last_health_check = datetime.now(timezone.utc)
+        return healthy
+    
+    async def _request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """
+        Send a request through the circuit breaker.
+        
+        Raises FiwareClientError(503) without touching the network while the
+        circuit is open. Transport errors and 5xx responses count as failures.
+        """
+        if not self.breaker.allow_request():
+            raise FiwareClientError(503, "FIWARE Orion circuit is open")
+        try:
+            response = await self.http.request(method, url, **kwargs)
+        except Exception:
+            self.breaker.record_failure()
+            raise
+        if response.status_code >= 500:
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+        return response
     
     async def create_entity(self, entity: Dict[str, Any]) -> bool:
         """Create a new entity in Orion."""
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            try:
-                response = await client.post(
-                    f"{self.orion_url}/ngsi-ld/v1/entities",
-                    json=entity,
-                    headers=self.headers
-                )
-                if response.status_code in [201, 204]:
-                    logger.info(f"Entity created: {entity.get('id')}")
-                    return True
-                elif response.status_code == 409:
-                    logger.info(f"Entity already exists, updating: {entity.get('id')}")
-                    return await self.update_entity(entity["id"], entity)
-                else:
-                    logger.error(f"Failed to create entity: {response.status_code} - {response.text}")
-                    raise FiwareClientError(response.status_code, response.text)
-            except Exception as e:
-                if isinstance(e, FiwareClientError):
-                    raise
-                logger.error(f"Error creating entity: {e}")
-                raise FiwareClientError(500, str(e))
+        try:
+            response = await self._request(
+                "POST",
+                f"{self.orion_url}/ngsi-ld/v1/entities",
+                json=entity,
+                headers=self.headers
+            )
+            if response.status_code in [201, 204]:
+                logger.info(f"Entity created: {entity.get('id')}")
+                return True
+            elif response.status_code == 409:
+                logger.info(f"Entity already exists, updating: {entity.get('id')}")
+                return await self.update_entity(entity["id"], entity)
+            else:
+                logger.error(f"Failed to create entity: {response.status_code} - {response.text}")
+                raise FiwareClientError(response.status_code, response.text)
+        except Exception as e:
+            if isinstance(e, FiwareClientError):
+                raise
+            logger.error(f"Error creating entity: {e}")
+            raise FiwareClientError(500, str(e))
     
     async def update_entity(self, entity_id: str, attrs: Dict[str, Any]) -> bool:
         """Update entity attributes."""
         # Remove @context and id for PATCH request
         update_attrs = {k: v for k, v in attrs.items() if k not in ["@context", "id", "type"]}
         
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            try:
-                headers = {
-                    "Content-Type": "application/json",
-                    "Link": f'<{CONTEXT[0]}>; rel="http://www.w3.org/ns/json-ld#context"; type="application/ld+json"',
-                    "FIWARE-Service": self.headers["FIWARE-Service"],
-                    "FIWARE-ServicePath": self.headers["FIWARE-ServicePath"],
-                }
-                response = await client.patch(
-                    f"{self.orion_url}/ngsi-ld/v1/entities/{entity_id}/attrs",
-                    json=update_attrs,
-                    headers=headers
-                )
-                if response.status_code in [200, 204]:
-                    logger.info(f"Entity updated: {entity_id}")
-                    return True
-                else:
-                    logger.error(f"Failed to update entity: {response.status_code} - {response.text}")
-                    raise FiwareClientError(response.status_code, response.text)
-            except Exception as e:
-                if isinstance(e, FiwareClientError):
-                    raise
-                logger.error(f"Error updating entity: {e}")
-                raise FiwareClientError(500, str(e))
+        try:
+            headers = {
+                "Content-Type": "application/json",
+                "Link": f'<{CONTEXT[0]}>; rel="http://www.w3.org/ns/json-ld#context"; type="application/ld+json"',
+                "FIWARE-Service": self.headers["FIWARE-Service"],
+                "FIWARE-ServicePath": self.headers["FIWARE-ServicePath"],
+            }
+            response = await self._request(
+                "PATCH",
+                f"{self.orion_url}/ngsi-ld/v1/entities/{entity_id}/attrs",
+                json=update_attrs,
+                headers=headers
+            )
+            if response.status_code in [200, 204]:
+                logger.info(f"Entity updated: {entity_id}")
+                return True
+            else:
+                logger.error(f"Failed to update entity: {response.status_code} - {response.text}")
+                raise FiwareClientError(response.status_code, response.text)
+        except Exception as e:
+            if isinstance(e, FiwareClientError):
+                raise
+            logger.error(f"Error updating entity: {e}")
+            raise FiwareClientError(500, str(e))
     
     async def get_entity(self, entity_id: str) -> Optional[Dict[str, Any]]:
         """Get entity by ID."""
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            try:
-                response = await client.get(
-                    f"{self.orion_url}/ngsi-ld/v1/entities/{entity_id}",
-                    headers=self.headers
-                )
-                if response.status_code == 200:
-                    return response.json()
-                if response.status_code == 404:
-                    return None
-                raise FiwareClientError(response.status_code, response.text)
-            except Exception as e:
-                if isinstance(e, FiwareClientError):
-                    raise
-                logger.error(f"Error getting entity: {e}")
-                raise FiwareClientError(500, str(e))
+        try:
+            response = await self._request(
+                "GET",
+                f"{self.orion_url}/ngsi-ld/v1/entities/{entity_id}",
+                headers=self.headers
+            )
+            if response.status_code == 200:
+                return response.json()
+            if response.status_code == 404:
+                return None
+            raise FiwareClientError(response.status_code, response.text)
+        except Exception as e:
+            if isinstance(e, FiwareClientError):
+                raise
+            logger.error(f"Error getting entity: {e}")
+            raise FiwareClientError(500, str(e))
     
     async def delete_entity(self, entity_id: str) -> bool:
         """Delete entity by ID."""
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            try:
-                response = await client.delete(
-                    f"{self.orion_url}/ngsi-ld/v1/entities/{entity_id}",
-                    headers=self.headers
-                )
-                if response.status_code in [200, 204]:
-                    return True
-                if response.status_code == 404:
-                    return False
-                raise FiwareClientError(response.status_code, response.text)
-            except Exception as e:
-                if isinstance(e, FiwareClientError):
-                    raise
-                logger.error(f"Error deleting entity: {e}")
-                raise FiwareClientError(500, str(e))
+        try:
+            response = await self._request(
+                "DELETE",
+                f"{self.orion_url}/ngsi-ld/v1/entities/{entity_id}",
+                headers=self.headers
+            )
+            if response.status_code in [200, 204]:
+                return True
+            if response.status_code == 404:
+                return False
+            raise FiwareClientError(response.status_code, response.text)
+        except Exception as e:
+            if isinstance(e, FiwareClientError):
+                raise
+            logger.error(f"Error deleting entity: {e}")
+            raise FiwareClientError(500, str(e))
+    
+    async def delete_attribute(self, entity_id: str, attr: str) -> bool:
+        """Delete one attribute of an entity. Returns False if it wasn't there."""
+        try:
+            response = await self._request(
+                "DELETE",
+                f"{self.orion_url}/ngsi-ld/v1/entities/{entity_id}/attrs/{attr}",
+                headers=self.headers
+            )
+            if response.status_code in [200, 204]:
+                return True
+            if response.status_code == 404:
+                return False
+            raise FiwareClientError(response.status_code, response.text)
+        except Exception as e:
+            if isinstance(e, FiwareClientError):
+                raise
+            logger.error(f"Error deleting attribute {attr} of {entity_id}: {e}")
+            raise FiwareClientError(500, str(e))
     
     async def query_entities(
         self, 
@@ -152,27 +296,144 @@ class FiwareClient:
         q: Optional[str] = None,
         limit: int = 100
     ) -> List[Dict[str, Any]]:
-        """Query entities by type."""
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            try:
-                params = {"type": entity_type, "limit": limit}
-                if q:
-                    params["q"] = q
-                response = await client.get(
-                    f"{self.orion_url}/ngsi-ld/v1/entities",
-                    params=params,
-                    headers=self.headers
-                )
-                if response.status_code == 200:
-                    return response.json()
-                if response.status_code == 404:
-                    return []
-                raise FiwareClientError(response.status_code, response.text)
-            except Exception as e:
-                if isinstance(e, FiwareClientError):
-                    raise
-                logger.error(f"Error querying entities: {e}")
-                raise FiwareClientError(500, str(e))
+        """Query up to ``limit`` entities by type (paging through Orion as needed)."""
+        return [entity async for entity in self.iter_entities(entity_type, q=q, max_results=limit)]
+    
+    async def iter_entities(
+        self,
+        entity_type: str,
+        q: Optional[str] = None,
+        max_results: Optional[int] = None,
+        page_size: Optional[int] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yield all entities matching a query, one page at a time.
+        
+        Pages of ``FIWARE_QUERY_PAGE_SIZE`` are requested with offset/limit;
+        the first request asks for the total (``count=true``) so paging
+        stops as soon as everything was read. Only one page is held in
+        memory at a time.
+        """
+        page_size = page_size or settings.FIWARE_QUERY_PAGE_SIZE
+        offset = 0
+        total = None
+        while max_results is None or offset < max_results:
+            limit = page_size if max_results is None else min(page_size, max_results - offset)
+            page, page_total = await self._query_page(entity_type, q, limit, offset, count=total is None)
+            if total is None:
+                total = page_total
+            for entity in page:
+                yield entity
+            offset += len(page)
+            if len(page) < limit or (total is not None and offset >= total):
+                return
+    
+    async def _query_page(
+        self,
+        entity_type: str,
+        q: Optional[str],
+        limit: int,
+        offset: int,
+        count: bool
+    ) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        """Fetch one page of a query; returns (entities, total if requested)."""
+        try:
+            params = {"type": entity_type, "limit": limit, "offset": offset}
+            if q:
+                params["q"] = q
+            if count:
+                params["count"] = "true"
+            response = await self._request(
+                "GET",
+                f"{self.orion_url}/ngsi-ld/v1/entities",
+                params=params,
+                headers=self.headers
+            )
+            if response.status_code == 200:
+                total = response.headers.get("NGSILD-Results-Count")
+                return response.json(), int(total) if total is not None else None
+            if response.status_code == 404:
+                return [], 0
+            raise FiwareClientError(response.status_code, response.text)
+        except Exception as e:
+            if isinstance(e, FiwareClientError):
+                raise
+            logger.error(f"Error querying entities: {e}")
+            raise FiwareClientError(500, str(e))
+    
+    async def batch_upsert(self, entities: List[Dict[str, Any]]) -> BatchOperationResult:
+        """
+        Create or update many entities via ``/entityOperations/upsert``.
+        
+        Existing entities keep attributes not present in the payload
+        (``options=update``), matching the create-then-PATCH behaviour of
+        ``create_entity``. Entities are sent in chunks bounded by
+        ``FIWARE_BATCH_MAX_ENTITIES`` and ``FIWARE_BATCH_MAX_BYTES``.
+        """
+        return await self._batch_operation("upsert", entities, params={"options": "update"})
+    
+    async def batch_update(self, entities: List[Dict[str, Any]]) -> BatchOperationResult:
+        """Update attributes of many existing entities via ``/entityOperations/update``."""
+        return await self._batch_operation("update", entities)
+    
+    async def _batch_operation(
+        self,
+        operation: str,
+        entities: List[Dict[str, Any]],
+        params: Optional[Dict[str, str]] = None
+    ) -> BatchOperationResult:
+        result = BatchOperationResult()
+        for chunk in chunk_entities(entities, settings.FIWARE_BATCH_MAX_ENTITIES, settings.FIWARE_BATCH_MAX_BYTES):
+            result.merge(await self._send_batch(operation, chunk, params))
+        if result.errors:
+            logger.warning(
+                f"Batch {operation}: {len(result.success)} succeeded, {len(result.errors)} failed"
+            )
+        else:
+            logger.info(f"Batch {operation}: {len(result.success)} entities")
+        return result
+    
+    async def _send_batch(
+        self,
+        operation: str,
+        chunk: List[Dict[str, Any]],
+        params: Optional[Dict[str, str]]
+    ) -> BatchOperationResult:
+        ids = [e.get("id") for e in chunk]
+        try:
+            response = await self._request(
+                "POST",
+                f"{self.orion_url}/ngsi-ld/v1/entityOperations/{operation}",
+                json=chunk,
+                params=params,
+                headers=self.headers
+            )
+        except Exception as e:
+            logger.error(f"Error in batch {operation}: {e}")
+            status_code = e.status_code if isinstance(e, FiwareClientError) else 500
+            return BatchOperationResult(
+                errors=[{"entity_id": i, "status_code": status_code, "message": str(e)} for i in ids]
+            )
+        
+        if response.status_code in [200, 201, 204]:
+            return BatchOperationResult(success=ids)
+        if response.status_code == 207:
+            # Multi-Status: {"success": [ids], "errors": [{"entityId", "error": {...}}]}
+            body = response.json()
+            errors = []
+            for err in body.get("errors", []):
+                detail = err.get("error", {})
+                errors.append({
+                    "entity_id": err.get("entityId"),
+                    "status_code": detail.get("status", 400),
+                    "message": detail.get("detail") or detail.get("title") or str(detail)
+                })
+            return BatchOperationResult(success=list(body.get("success", [])), errors=errors)
+        
+        logger.error(f"Batch {operation} failed: {response.status_code} - {response.text}")
+        return BatchOperationResult(
+            errors=[{"entity_id": i, "status_code": response.status_code, "message": response.text} for i in ids]
+        )
     
     async def subscribe_to_entity(
         self,
@@ -196,24 +457,67 @@ class FiwareClient:
         if watched_attrs:
             subscription["watchedAttributes"] = watched_attrs
         
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            try:
-                response = await client.post(
-                    f"{self.orion_url}/ngsi-ld/v1/subscriptions",
-                    json=subscription,
-                    headers=self.headers
-                )
-                if response.status_code in [201, 204]:
-                    location = response.headers.get("Location", "")
-                    subscription_id = location.split("/")[-1] if location else None
-                    logger.info(f"Subscription created: {subscription_id}")
-                    return subscription_id
-                else:
-                    logger.error(f"Failed to create subscription: {response.text}")
-                    return None
-            except Exception as e:
-                logger.error(f"Error creating subscription: {e}")
+        try:
+            response = await self._request(
+                "POST",
+                f"{self.orion_url}/ngsi-ld/v1/subscriptions",
+                json=subscription,
+                headers=self.headers
+            )
+            if response.status_code in [201, 204]:
+                location = response.headers.get("Location", "")
+                subscription_id = location.split("/")[-1] if location else None
+                logger.info(f"Subscription created: {subscription_id}")
+                return subscription_id
+            else:
+                logger.error(f"Failed to create subscription: {response.text}")
                 return None
+        except Exception as e:
+            logger.error(f"Error creating subscription: {e}")
+            return None
+
+
+def chunk_entities(
+    entities: Iterable[Dict[str, Any]],
+    max_entities: int,
+    max_bytes: int
+) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Split entities into request-sized chunks.
+    
+    Each chunk holds at most ``max_entities`` entities and its JSON body
+    stays under ``max_bytes`` (an entity larger than that is sent alone).
+    """
+    chunk: List[Dict[str, Any]] = []
+    size = 2  # "[]"
+    for entity in entities:
+        entity_size = len(json.dumps(entity, separators=(",", ":")).encode()) + 1
+        if chunk and (len(chunk) >= max_entities or size + entity_size > max_bytes):
+            yield chunk
+            chunk, size = [], 2
+        chunk.append(entity)
+        size += entity_size
+    if chunk:
+        yield chunk
+
+
+_shared_client: Optional[FiwareClient] = None
+
+
+def get_fiware_client() -> FiwareClient:
+    """Return the app-lifetime FiwareClient (created on first use)."""
+    global _shared_client
+    if _shared_client is None:
+        _shared_client = FiwareClient()
+    return _shared_client
+
+
+async def close_fiware_client() -> None:
+    """Close the shared client's connection pool (called on shutdown)."""
+    global _shared_client
+    if _shared_client is not None:
+        await _shared_client.aclose()
+        _shared_client = None
 
 
 # ==================== Smart Data Model Factories ====================
@@ -496,6 +800,7 @@ def _format_datetime(dt: datetime) -> str:
 
 # ==================== Utility Functions ====================
 
+
 async def sync_farm_to_fiware(
     fiware_client: FiwareClient,
     farm_id: int,
@@ -523,7 +828,7 @@ async def sync_farm_to_fiware(
             coordinates=coordinates,
             crop_type=crop_type
         )
-        return await fiware_client.create_entity(entity)
+        return (await fiware_client.batch_upsert([entity])).raise_for_errors()
     except FiwareClientError:
         # Propagate FIWARE-specific errors to allow API layer to return proper status
         raise
@@ -562,7 +867,7 @@ async def sync_observation_to_fiware(
             observed_at=observed_at,
             unit_code=unit_code
         )
-        return await fiware_client.create_entity(entity)
+        return (await fiware_client.batch_upsert([entity])).raise_for_errors()
     except FiwareClientError:
         # Propagate FIWARE-specific errors to allow API layer to return proper status
         raise
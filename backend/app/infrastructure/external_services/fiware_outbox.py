@@ -0,0 +1,290 @@
+# Copyright (c) 2025 CuongKenn and ICTU-OpenAgri Contributors
+# Licensed under the MIT License. See LICENSE file in the project root for full license information.
+
+"""
+Transactional outbox for FIWARE synchronization.
+
+Satellite observations queue their NGSI-LD entities (the farm's AgriParcel
+and an AgriParcelRecord) in ``fiware_outbox`` inside the same transaction
+that saves the ``satellite_data`` row, so ingestion never waits on Orion
+and nothing is lost when Orion is down. ``dispatch_fiware_outbox`` runs
+periodically from the scheduler and drains due rows with batch upserts;
+failed entities are retried with exponential backoff until
+``FIWARE_OUTBOX_MAX_ATTEMPTS``, after which they stay in the table for
+inspection. Every worker runs its own scheduler, so a dispatcher first
+claims the rows it sends with a lease; rows of an entity leased by another
+dispatcher are left alone until that lease expires.
+
+AgriParcel entities are change-tracked: the outbox always holds the full
+entity, and a hash per attribute of the last version Orion accepted is kept
+in ``fiware_sync_state``. The dispatcher diffs the latest queued version
+against those hashes: unchanged farms are not sent at all and changed ones
+only carry the changed attributes (upserted with ``options=update``, i.e. a
+PATCH). Attributes the entity no longer has are removed from Orion one by
+one, since an upsert can only add or replace attributes. The hashes are
+only updated once Orion has accepted the change.
+"""
+import datetime
+import hashlib
+import json
+import logging
+import uuid
+from typing import Dict, List, Optional
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.infrastructure.config.settings import get_settings
+from app.infrastructure.database.database import AsyncSessionLocal
+from app.infrastructure.database.models.farm_model import FarmModel
+from app.infrastructure.database.models.fiware_outbox_model import FiwareOutboxModel
+from app.infrastructure.database.models.fiware_sync_state_model import FiwareSyncStateModel
+from app.infrastructure.external_services.fiware_client import (
+    FiwareClientError,
+    create_agriparcel_entity,
+    create_agriparcel_record,
+    get_fiware_client,
+)
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# satellite_data.data_type -> AgriParcelRecord property name
+RECORD_TYPES = {
+    "NDVI": "ndvi",
+    "SOIL_MOISTURE": "soilMoisture",
+}
+
+# Entity types sent as deltas against the last synced version
+CHANGE_TRACKED_TYPES = {"AgriParcel"}
+
+# Never compared; dateModified is sent along with every delta
+_IDENTITY_ATTRIBUTES = ("@context", "id", "type")
+_VOLATILE_ATTRIBUTES = {"dateCreated", "dateModified"}
+
+# Delta value of a removed attribute (the NGSI-LD null)
+DELETED = "urn:ngsi-ld:null"
+
+
+def build_observation_entities(
+    farm: FarmModel,
+    data_type: str,
+    value: float,
+    acquisition_date: datetime.date
+) -> List[dict]:
+    """AgriParcel + AgriParcelRecord entities for one satellite observation."""
+    observed_at = datetime.datetime.combine(
+        acquisition_date,
+        datetime.time(12, 0, 0),  # Default to noon
+        tzinfo=datetime.timezone.utc
+    )
+    entities = [
+        create_agriparcel_record(
+            farm_id=farm.id,
+            record_type=RECORD_TYPES.get(data_type, data_type),
+            value=value,
+            observed_at=observed_at
+        ),
+    ]
+    # AgriParcel needs a polygon; records of unmapped farms are still sent
+    if farm.coordinates and len(farm.coordinates) >= 3:
+        entities.insert(0, create_agriparcel_entity(
+            farm_id=farm.id,
+            name=farm.name,
+            coordinates=farm.coordinates,
+            crop_type=farm.crop_type
+        ))
+    return entities
+
+
+def attribute_hashes(entity: dict) -> Dict[str, str]:
+    """Content hash of each non-volatile attribute of an entity."""
+    return {
+        name: hashlib.sha1(
+            json.dumps(value, sort_keys=True, separators=(",", ":")).encode()
+        ).hexdigest()
+        for name, value in entity.items()
+        if name not in _IDENTITY_ATTRIBUTES and name not in _VOLATILE_ATTRIBUTES
+    }
+
+
+def _changed_attributes(entity: dict, synced_hashes: Optional[Dict[str, str]]) -> Optional[dict]:
+    """
+    Return the part of ``entity`` that differs from the last synced version.
+
+    None when nothing changed; the full entity when it was never synced.
+    Attributes the entity no longer has are included as ``DELETED``.
+    """
+    if synced_hashes is None:
+        return entity
+    hashes = attribute_hashes(entity)
+    changed = [name for name, digest in hashes.items() if synced_hashes.get(name) != digest]
+    removed = [name for name in synced_hashes if name not in hashes]
+    if not changed and not removed:
+        return None
+
+    delta = {name: entity[name] for name in _IDENTITY_ATTRIBUTES if name in entity}
+    delta.update({name: entity[name] for name in changed})
+    delta.update({name: DELETED for name in removed})
+    if "dateModified" in entity:
+        delta["dateModified"] = entity["dateModified"]
+    return delta
+
+
+async def enqueue_entities(session: AsyncSession, entities: List[dict]) -> None:
+    """Add entities to the outbox; they are committed with the caller's transaction."""
+    if not settings.FIWARE_ENABLED:
+        return
+    for entity in entities:
+        session.add(FiwareOutboxModel(entity_id=entity["id"], payload=entity))
+
+
+def backoff_seconds(attempts: int) -> float:
+    """Delay before retry number ``attempts`` (1-based)."""
+    delay = settings.FIWARE_OUTBOX_BACKOFF_BASE_SECONDS * (2 ** (attempts - 1))
+    return min(delay, settings.FIWARE_OUTBOX_BACKOFF_MAX_SECONDS)
+
+
+async def _claim_due_rows(session: AsyncSession, now: datetime.datetime) -> List[FiwareOutboxModel]:
+    """
+    Lease the next batch of due rows to this dispatcher and return them.
+
+    Entities with a row under another live lease are skipped as a whole,
+    so their deltas are never sent out of order by two dispatchers.
+    """
+    token = uuid.uuid4().hex
+    leased = select(FiwareOutboxModel.entity_id).where(FiwareOutboxModel.claimed_until > now)
+    due = (
+        select(FiwareOutboxModel.id)
+        .where(
+            FiwareOutboxModel.attempts < settings.FIWARE_OUTBOX_MAX_ATTEMPTS,
+            FiwareOutboxModel.next_attempt_at <= now,
+            FiwareOutboxModel.entity_id.not_in(leased)
+        )
+        .order_by(FiwareOutboxModel.id)
+        .limit(settings.FIWARE_OUTBOX_BATCH_SIZE)
+        .with_for_update(skip_locked=True)  # no-op on SQLite, whose writes are serialized
+    )
+    await session.execute(
+        update(FiwareOutboxModel)
+        .where(FiwareOutboxModel.id.in_(due))
+        .values(
+            claimed_by=token,
+            claimed_until=now + datetime.timedelta(seconds=settings.FIWARE_OUTBOX_LEASE_SECONDS)
+        )
+        .execution_options(synchronize_session=False)
+    )
+    await session.commit()
+    return (await session.execute(
+        select(FiwareOutboxModel)
+        .where(FiwareOutboxModel.claimed_by == token)
+        .order_by(FiwareOutboxModel.id)
+    )).scalars().all()
+
+
+async def dispatch_fiware_outbox(
+    session_factory: async_sessionmaker[AsyncSession] = AsyncSessionLocal
+) -> int:
+    """
+    Upsert due outbox rows to Orion in batches.
+
+    Returns the number of rows delivered. Skips the run entirely when
+    Orion's health check fails, so an outage doesn't burn retry attempts.
+    """
+    if not settings.FIWARE_ENABLED:
+        return 0
+
+    fiware = get_fiware_client()
+    if not await fiware.health_check():
+        logger.warning("FIWARE Orion is not available, outbox dispatch postponed")
+        return 0
+
+    delivered = 0
+    while True:
+        async with session_factory() as session:
+            now = datetime.datetime.utcnow()
+            rows = await _claim_due_rows(session, now)
+            if not rows:
+                break
+
+            by_entity: Dict[str, List[FiwareOutboxModel]] = {}
+            for row in rows:
+                by_entity.setdefault(row.entity_id, []).append(row)
+            states = {
+                state.entity_id: state
+                for state in (await session.execute(
+                    select(FiwareSyncStateModel).where(FiwareSyncStateModel.entity_id.in_(list(by_entity)))
+                )).scalars()
+            }
+
+            payloads = []
+            deletions: Dict[str, List[str]] = {}
+            synced_hashes: Dict[str, Dict[str, str]] = {}
+            for entity_id, group in by_entity.items():
+                latest = group[-1].payload
+                if latest.get("type") in CHANGE_TRACKED_TYPES:
+                    # Rows hold full entities, so only the latest one matters
+                    state = states.get(entity_id)
+                    synced_hashes[entity_id] = attribute_hashes(latest)
+                    payload = _changed_attributes(latest, state.attr_hashes if state else None)
+                    if payload is None:
+                        continue
+                else:
+                    # The same entity may be queued several times; merge in order
+                    payload = {}
+                    for row in group:
+                        payload.update(row.payload)
+                removed = [name for name, value in payload.items() if value == DELETED]
+                for name in removed:
+                    del payload[name]
+                if removed:
+                    deletions[entity_id] = removed
+                payloads.append(payload)
+
+            errors = {}
+            if payloads:
+                result = await fiware.batch_upsert(payloads)
+                errors = {error["entity_id"]: error for error in result.errors}
+
+            for entity_id, names in deletions.items():
+                if entity_id in errors:
+                    continue
+                try:
+                    for name in names:
+                        await fiware.delete_attribute(entity_id, name)
+                except FiwareClientError as e:
+                    errors[entity_id] = {"entity_id": entity_id, "status_code": e.status_code, "message": str(e)}
+
+            done_ids = []
+            for entity_id, group in by_entity.items():
+                error = errors.get(entity_id)
+                if error is None:
+                    done_ids.extend(row.id for row in group)
+                    hashes = synced_hashes.get(entity_id)
+                    if hashes is not None and entity_id in states:
+                        states[entity_id].attr_hashes = hashes
+                    elif hashes is not None:
+                        session.add(FiwareSyncStateModel(entity_id=entity_id, attr_hashes=hashes))
+                    continue
+                for row in group:
+                    row.attempts += 1
+                    row.next_attempt_at = now + datetime.timedelta(seconds=backoff_seconds(row.attempts))
+                    row.last_error = f"{error['status_code']}: {error['message']}"[:1000]
+                    row.claimed_by = None
+                    row.claimed_until = None
+                if group[-1].attempts >= settings.FIWARE_OUTBOX_MAX_ATTEMPTS:
+                    logger.error(f"FIWARE outbox: giving up on {entity_id}: {group[-1].last_error}")
+
+            if done_ids:
+                await session.execute(delete(FiwareOutboxModel).where(FiwareOutboxModel.id.in_(done_ids)))
+            await session.commit()
+
+        delivered += len(done_ids)
+        if errors:
+            logger.warning(f"FIWARE outbox: {len(errors)} entities failed, will retry with backoff")
+        if len(rows) < settings.FIWARE_OUTBOX_BATCH_SIZE:
+            break
+
+    if delivered:
+        logger.info(f"FIWARE outbox: delivered {delivered} entities")
+    return delivered
@@ -4,9 +4,14 @@
 """
 GBIF (Global Biodiversity Information Facility) service for pest and biodiversity data.
 GBIF API is 100% open source and free to use.
+
+Pest names are resolved to GBIF backbone species keys with the
+species/match endpoint and kept in ``species_key_cache``, so a pest risk
+forecast only makes occurrence requests once the keys are known.
 """
+import asyncio
 import logging
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterable
 from datetime import datetime, timedelta
 
 try:
@@ -14,8 +19,44 @@ try:
 except ImportError:
     import requests as httpx
 
+from app.infrastructure.cache.single_flight import SingleFlight, request_key
+from app.infrastructure.cache.species_key_cache import SpeciesKeyCache, species_key_cache
+from app.infrastructure.external_services.pest_names import PEST_VIETNAMESE_NAMES, get_vietnamese_name
+
 logger = logging.getLogger(__name__)
 
+# Concurrent identical GBIF requests share one upstream call
+_inflight: SingleFlight[Dict[str, Any]] = SingleFlight()
+
+# species/match results that don't identify a species
+_NO_SPECIES_MATCH = {"NONE", "HIGHERRANK"}
+
+
+async def _get_json(url: str, params: Optional[Dict[str, Any]], what: str, timeout: float) -> Any:
+    """
+    GET a GBIF endpoint and decode its JSON body. Concurrent identical
+    requests share one call; HTTP errors are logged and re-raised as
+    ``Exception("Failed to fetch <what>: ...")``.
+    """
+    async def fetch() -> Any:
+        async with httpx.AsyncClient() as client:
+            try:
+                response = await client.get(url, params=params, timeout=timeout)
+                response.raise_for_status()
+                return response.json()
+            except httpx.HTTPError as e:
+                logger.error(f"Error fetching {what}: {str(e)}")
+                raise Exception(f"Failed to fetch {what}: {str(e)}")
+
+    return await _inflight.do(request_key(url, params), fetch)
+
+
+def species_key_from_match(match: Dict[str, Any]) -> Optional[int]:
+    """Backbone species key of a species/match result (accepted name for synonyms)."""
+    if match.get("matchType") in _NO_SPECIES_MATCH:
+        return None
+    return match.get("speciesKey") or match.get("acceptedUsageKey") or match.get("usageKey")
+
 
 class GBIFService:
     """
@@ -28,8 +69,9 @@ class GBIFService:
     
     BASE_URL = "https://api.gbif.org/v1"
     
-    def __init__(self, timeout: int = 30):
+    def __init__(self, timeout: int = 30, species_keys: Optional[SpeciesKeyCache] = None):
         self.timeout = timeout
+        self.species_keys = species_keys or species_key_cache
     
     async def search_occurrences(
         self,
@@ -85,18 +127,7 @@ class GBIFService:
         if year:
             params["year"] = year
         
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.get(
-                    f"{self.BASE_URL}/occurrence/search",
-                    params=params,
-                    timeout=self.timeout
-                )
-                response.raise_for_status()
-                return response.json()
-            except httpx.HTTPError as e:
-                logger.error(f"Error fetching occurrences from GBIF: {str(e)}")
-                raise Exception(f"Failed to fetch GBIF data: {str(e)}")
+        return await _get_json(f"{self.BASE_URL}/occurrence/search", params, "occurrences from GBIF", self.timeout)
     
     async def search_species(
         self,
@@ -119,18 +150,53 @@ class GBIFService:
             "offset": 0
         }
         
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.get(
-                    f"{self.BASE_URL}/species/search",
-                    params=params,
-                    timeout=self.timeout
-                )
-                response.raise_for_status()
-                return response.json()
-            except httpx.HTTPError as e:
-                logger.error(f"Error searching species from GBIF: {str(e)}")
-                raise Exception(f"Failed to search species: {str(e)}")
+        return await _get_json(f"{self.BASE_URL}/species/search", params, "species from GBIF", self.timeout)
+    
+    async def match_species(self, name: str) -> Dict[str, Any]:
+        """
+        Match a scientific name against the GBIF backbone taxonomy.
+        
+        Args:
+            name: Scientific name
+        
+        Returns:
+            Best backbone match (``usageKey``, ``speciesKey``, ``matchType``, ...)
+        """
+        params = {"name": name}
+        
+        return await _get_json(f"{self.BASE_URL}/species/match", params, "species match from GBIF", self.timeout)
+    
+    async def resolve_species_keys(self, names: Iterable[str]) -> Dict[str, Optional[int]]:
+        """
+        Resolve scientific names to backbone species keys.
+        
+        Cached names are answered from ``species_keys``; the rest are
+        matched concurrently and cached. Names GBIF can't match map to
+        None; names whose match request failed are left out (and retried
+        on the next call).
+        
+        Args:
+            names: Scientific names
+        
+        Returns:
+            Species key (or None) by name
+        """
+        names = list(dict.fromkeys(names))
+        keys = await self.species_keys.get_many(names)
+        missing = [name for name in names if name not in keys]
+        if not missing:
+            return keys
+        
+        matches = await asyncio.gather(*(self.match_species(name) for name in missing), return_exceptions=True)
+        resolved = {}
+        for name, match in zip(missing, matches):
+            if isinstance(match, Exception):
+                logger.warning(f"Could not resolve GBIF species key for {name}: {match}")
+                continue
+            resolved[name] = species_key_from_match(match)
+        await self.species_keys.put_many(resolved)
+        keys.update(resolved)
+        return keys
     
     async def get_species_info(
         self,
@@ -145,17 +211,7 @@ class GBIFService:
         Returns:
             Species information
         """
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.get(
-                    f"{self.BASE_URL}/species/{species_key}",
-                    timeout=self.timeout
-                )
-                response.raise_for_status()
-                return response.json()
-            except httpx.HTTPError as e:
-                logger.error(f"Error fetching species info from GBIF: {str(e)}")
-                raise Exception(f"Failed to fetch species info: {str(e)}")
+        return await _get_json(f"{self.BASE_URL}/species/{species_key}", None, "species info from GBIF", self.timeout)
     
     async def get_pest_risk_forecast(
         self,
@@ -181,8 +237,6 @@ class GBIFService:
         Returns:
             Pest risk forecast data with historical occurrences and warnings
         """
-        import asyncio
-        
         current_year = datetime.now().year
         start_year = current_year - years_back
         
@@ -211,21 +265,17 @@ class GBIFService:
         all_occurrences = []
         pest_summary = {}
         
+        # Usually all cached: no upstream calls
+        species_keys = await self.resolve_species_keys(default_pests)
+        
         async def process_pest(pest_name: str):
             try:
-                # Search for species key
-                logger.info(f"Searching for species: {pest_name}")
-                species_search = await self.search_species(pest_name, limit=1)
-                if not species_search.get("results"):
-                    logger.warning(f"Species not found in GBIF: {pest_name}")
-                    return None
-                
-                species_key = species_search["results"][0].get("key")
+                species_key = species_keys.get(pest_name)
                 if not species_key:
                     logger.warning(f"No species key found for: {pest_name}")
                     return None
                 
-                logger.info(f"Found species key {species_key} for {pest_name}, searching occurrences...")
+                logger.info(f"Searching occurrences of {pest_name} (species key {species_key})...")
                 
                 # Fetch ALL occurrences in ONE request to avoid rate limiting
                 try:
@@ -280,8 +330,6 @@ class GBIFService:
         pest_tasks = [process_pest(pest) for pest in default_pests]
         pest_results = await asyncio.gather(*pest_tasks)
         
-        from .pest_names import get_vietnamese_name
-        
         for result in pest_results:
             if result:
                 pest_name = result["pest_name"]
@@ -328,3 +376,13 @@ class GBIFService:
             }
         }
 
+
+async def seed_species_keys() -> int:
+    """
+    Resolve the known pest names (``pest_names``) into the species key cache.
+    
+    Returns:
+        Number of names with a species key
+    """
+    keys = await GBIFService().resolve_species_keys(PEST_VIETNAMESE_NAMES)
+    return sum(key is not None for key in keys.values())
@@ -4,21 +4,85 @@
 """
 Weather service for Open-Meteo and Photon API integration.
 """
+import asyncio
 import logging
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 
 try:
     import httpx
 except ImportError:
     import requests as httpx
 
+from app.infrastructure.agronomy.agro_indices import local_date
+from app.infrastructure.cache.forecast_cache import forecast_cache, forecast_days_bucket, snap_to_grid
+from app.infrastructure.cache.single_flight import SingleFlight, request_key
+from app.infrastructure.config.settings import get_settings
+
 logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# Concurrent identical Open-Meteo/Photon requests share one upstream call
+_inflight: SingleFlight[Dict[str, Any]] = SingleFlight()
+
+# Cell's local date when agro data was fetched, stored in the response
+AGRO_FETCHED_ON = "fetched_on"
+
+
+def _agro_is_current(weather: Dict[str, Any]) -> bool:
+    """Whether cached agro data is from the cell's local today (its own UTC offset)."""
+    return weather.get(AGRO_FETCHED_ON) == local_date(weather.get("utc_offset_seconds") or 0).isoformat()
+
+
+def _per_location(keys: List[Tuple], results: Any) -> Dict[Tuple, Dict[str, Any]]:
+    """
+    Pair a multi-location Open-Meteo response (a list in request order; a
+    single location comes back as an object) with the requested keys.
+    """
+    if isinstance(results, dict) and len(keys) == 1:
+        results = [results]
+    if not isinstance(results, list) or len(results) != len(keys):
+        got = len(results) if isinstance(results, list) else type(results).__name__
+        logger.error(f"Open-Meteo answered {got} for {len(keys)} locations")
+        raise Exception(f"Unexpected response from Open-Meteo: expected {len(keys)} locations, got {got}")
+    return dict(zip(keys, results))
+
+
+async def _get_json(url: str, params: Optional[Dict[str, Any]], what: str, timeout: float) -> Any:
+    """
+    GET an Open-Meteo or Photon endpoint and decode its JSON body.
+    Concurrent identical requests share one call; HTTP errors are logged
+    and re-raised as ``Exception("Failed to fetch <what>: ...")``.
+    """
+    async def fetch() -> Any:
+        async with httpx.AsyncClient() as client:
+            try:
+                response = await client.get(url, params=params, timeout=timeout)
+                response.raise_for_status()
+                return response.json()
+            except httpx.HTTPError as e:
+                logger.error(f"Error fetching {what}: {str(e)}")
+                raise Exception(f"Failed to fetch {what}: {str(e)}")
+
+    return await _inflight.do(request_key(url, params), fetch)
 
 
 class OpenMeteoService:
-    """Service for Open-Meteo weather API."""
+    """
+    Service for Open-Meteo weather API.
+    
+    Forecasts are served from ``forecast_cache``: requests are snapped to
+    a grid cell and share the cell centre's forecast.
+    """
     
     BASE_URL = "https://api.open-meteo.com/v1"
+    ARCHIVE_URL = "https://archive-api.open-meteo.com/v1/archive"
+    FORECAST_CURRENT = "temperature_2m,relative_humidity_2m,weather_code,wind_speed_10m,precipitation,is_day"
+    FORECAST_HOURLY = "temperature_2m,relative_humidity_2m,weather_code,wind_speed_10m,precipitation,soil_moisture_0_to_1cm"
+    # Inputs of the agro-meteorological indices (FAO-56 ET0 needs radiation)
+    AGRO_HOURLY = (
+        "temperature_2m,relative_humidity_2m,wind_speed_10m,precipitation,"
+        "shortwave_radiation,terrestrial_radiation"
+    )
     
     def __init__(self, timeout: int = 10):
         self.timeout = timeout
@@ -43,25 +107,172 @@ class OpenMeteoService:
         if hours_ahead > 240:
             hours_ahead = 240
         
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.get(
-                    f"{self.BASE_URL}/forecast",
-                    params={
-                        "latitude": latitude,
-                        "longitude": longitude,
-                        "current": "temperature_2m,relative_humidity_2m,weather_code,wind_speed_10m,precipitation,is_day",
-                        "hourly": "temperature_2m,relative_humidity_2m,weather_code,wind_speed_10m,precipitation,soil_moisture_0_to_1cm",
-                        "forecast_days": (hours_ahead // 24) + 1,
-                        "timezone": "auto"
-                    },
-                    timeout=self.timeout
-                )
-                response.raise_for_status()
-                return response.json()
-            except httpx.HTTPError as e:
-                logger.error(f"Error fetching forecast from Open-Meteo: {str(e)}")
-                raise Exception(f"Failed to fetch weather data: {str(e)}")
+        cell_lat, cell_lng = snap_to_grid(latitude, longitude)
+        forecast_days = forecast_days_bucket(hours_ahead)
+        return await forecast_cache.get_or_fetch(
+            (cell_lat, cell_lng, forecast_days),
+            lambda: self._fetch_forecast(cell_lat, cell_lng, forecast_days)
+        )
+    
+    async def get_forecasts(
+        self,
+        points: List[Tuple[float, float]],
+        hours_ahead: int = 24
+    ) -> List[Dict[str, Any]]:
+        """
+        Get forecasts for many locations at once.
+        
+        Points are deduplicated by grid cell; cells not in the cache are
+        requested with multi-location Open-Meteo calls of up to
+        ``WEATHER_BATCH_MAX_LOCATIONS`` coordinates each.
+        
+        Args:
+            points: (latitude, longitude) pairs
+            hours_ahead: Number of hours to forecast (max 240)
+        
+        Returns:
+            Forecast data for each point, in the order given
+        """
+        forecast_days = forecast_days_bucket(min(hours_ahead, 240))
+        keys = [snap_to_grid(lat, lng) + (forecast_days,) for lat, lng in points]
+        found = await forecast_cache.get_many_or_fetch(keys, self._fetch_forecasts)
+        return [found[key] for key in keys]
+    
+    async def prefetch_forecasts(
+        self,
+        cells: List[Tuple[float, float]],
+        hours_ahead: int = 24
+    ) -> int:
+        """
+        Fetch forecasts for grid cells and store them in ``forecast_cache``,
+        replacing cached entries even if they are still fresh.
+        
+        Cells are requested together, so callers should pass at most
+        ``WEATHER_BATCH_MAX_LOCATIONS`` of them per call to keep it to a
+        single upstream request.
+        
+        Args:
+            cells: Grid cell centres (see ``snap_to_grid``)
+            hours_ahead: Horizon the cached forecasts must cover
+        
+        Returns:
+            Number of cells cached
+        """
+        forecast_days = forecast_days_bucket(min(hours_ahead, 240))
+        keys = [(lat, lng, forecast_days) for lat, lng in dict.fromkeys(cells)]
+        fetched = await self._fetch_forecasts(keys)
+        for key, forecast in fetched.items():
+            forecast_cache.put(key, forecast)
+        return len(fetched)
+    
+    async def _fetch_forecasts(
+        self,
+        keys: List[Tuple[float, float, int]]
+    ) -> Dict[Tuple[float, float, int], Dict[str, Any]]:
+        """Fetch (lat, lng, forecast_days) cells in upstream-sized chunks, concurrently."""
+        size = settings.WEATHER_BATCH_MAX_LOCATIONS
+        chunks = [keys[i:i + size] for i in range(0, len(keys), size)]
+        fetched = {}
+        for result in await asyncio.gather(*(self._fetch_forecast_chunk(chunk) for chunk in chunks)):
+            fetched.update(result)
+        return fetched
+    
+    async def _fetch_forecast_chunk(
+        self,
+        keys: List[Tuple[float, float, int]]
+    ) -> Dict[Tuple[float, float, int], Dict[str, Any]]:
+        if len(keys) == 1:
+            lat, lng, forecast_days = keys[0]
+            return {keys[0]: await self._fetch_forecast(lat, lng, forecast_days)}
+        
+        params = {
+            "latitude": ",".join(str(key[0]) for key in keys),
+            "longitude": ",".join(str(key[1]) for key in keys),
+            "current": self.FORECAST_CURRENT,
+            "hourly": self.FORECAST_HOURLY,
+            "forecast_days": keys[0][2],
+            "timezone": "auto"
+        }
+        
+        results = await _get_json(
+            f"{self.BASE_URL}/forecast", params, "batch forecast from Open-Meteo", self.timeout
+        )
+        return _per_location(keys, results)
+    
+    async def get_agro_hourly(
+        self,
+        points: List[Tuple[float, float]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Get the hourly inputs of the agro-meteorological indices.
+        
+        Each point's grid cell is fetched once per local day (of the cell) with
+        ``WEATHER_AGRO_PAST_DAYS`` of history and ``WEATHER_AGRO_FORECAST_DAYS``
+        of forecast, and cached in ``forecast_cache`` until the next model
+        update or the cell's next day, whichever comes first (the cell's
+        UTC offset is read from the cached response). Uncached cells are
+        requested together (multi-location calls).
+        
+        Args:
+            points: (latitude, longitude) pairs
+        
+        Returns:
+            Open-Meteo hourly data for each point, in the order given
+        """
+        cells = [snap_to_grid(lat, lng) for lat, lng in points]
+        keys = [cell + ("agro",) for cell in cells]
+        found = await forecast_cache.get_many_or_fetch(keys, self._fetch_agro_hourly, current=_agro_is_current)
+        return [found[key] for key in keys]
+    
+    async def _fetch_agro_hourly(
+        self,
+        keys: List[Tuple[float, float, str]]
+    ) -> Dict[Tuple[float, float, str], Dict[str, Any]]:
+        """Fetch agro cells in upstream-sized chunks, concurrently."""
+        size = settings.WEATHER_BATCH_MAX_LOCATIONS
+        chunks = [keys[i:i + size] for i in range(0, len(keys), size)]
+        fetched = {}
+        for result in await asyncio.gather(*(self._fetch_agro_chunk(chunk) for chunk in chunks)):
+            fetched.update(result)
+        return fetched
+    
+    async def _fetch_agro_chunk(
+        self,
+        keys: List[Tuple[float, float, str]]
+    ) -> Dict[Tuple[float, float, str], Dict[str, Any]]:
+        params = {
+            "latitude": ",".join(str(key[0]) for key in keys),
+            "longitude": ",".join(str(key[1]) for key in keys),
+            "hourly": self.AGRO_HOURLY,
+            "past_days": settings.WEATHER_AGRO_PAST_DAYS,
+            "forecast_days": settings.WEATHER_AGRO_FORECAST_DAYS,
+            "timezone": "auto"
+        }
+        
+        results = _per_location(keys, await _get_json(
+            f"{self.BASE_URL}/forecast", params, "agro weather data from Open-Meteo", self.timeout
+        ))
+        for result in results.values():
+            result[AGRO_FETCHED_ON] = local_date(result.get("utc_offset_seconds") or 0).isoformat()
+        return results
+    
+    async def _fetch_forecast(
+        self,
+        latitude: float,
+        longitude: float,
+        forecast_days: int
+    ) -> Dict[str, Any]:
+        """Request a forecast from Open-Meteo (uncached)."""
+        params = {
+            "latitude": latitude,
+            "longitude": longitude,
+            "current": self.FORECAST_CURRENT,
+            "hourly": self.FORECAST_HOURLY,
+            "forecast_days": forecast_days,
+            "timezone": "auto"
+        }
+        
+        return await _get_json(f"{self.BASE_URL}/forecast", params, "forecast from Open-Meteo", self.timeout)
     
     async def get_historical_data(
         self,
@@ -82,25 +293,16 @@ class OpenMeteoService:
         Returns:
             Historical weather data
         """
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.get(
-                    f"{self.BASE_URL}/archive",
-                    params={
-                        "latitude": latitude,
-                        "longitude": longitude,
-                        "start_date": start_date,
-                        "end_date": end_date,
-                        "hourly": "temperature_2m,relative_humidity_2m,precipitation,wind_speed_10m",
-                        "timezone": "auto"
-                    },
-                    timeout=self.timeout
-                )
-                response.raise_for_status()
-                return response.json()
-            except httpx.HTTPError as e:
-                logger.error(f"Error fetching historical data: {str(e)}")
-                raise Exception(f"Failed to fetch historical data: {str(e)}")
+        params = {
+            "latitude": latitude,
+            "longitude": longitude,
+            "start_date": start_date,
+            "end_date": end_date,
+            "hourly": "temperature_2m,relative_humidity_2m,precipitation,wind_speed_10m",
+            "timezone": "auto"
+        }
+        
+        return await _get_json(self.ARCHIVE_URL, params, "historical weather data", self.timeout)
 
 
 class PhotonGeocodingService:
@@ -136,18 +338,7 @@ class PhotonGeocodingService:
         if country_codes:
             params["osm_tag"] = ",".join(country_codes)
         
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.get(
-                    f"{self.BASE_URL}/api",
-                    params=params,
-                    timeout=self.timeout
-                )
-                response.raise_for_status()
-                return response.json()
-            except httpx.HTTPError as e:
-                logger.error(f"Error searching location: {str(e)}")
-                raise Exception(f"Failed to search location: {str(e)}")
+        return await _get_json(f"{self.BASE_URL}/api", params, "location search results", self.timeout)
     
     async def reverse_geocode(
         self,
@@ -172,15 +363,4 @@ class PhotonGeocodingService:
             "limit": min(limit, 10)
         }
         
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.get(
-                    f"{self.BASE_URL}/reverse",
-                    params=params,
-                    timeout=self.timeout
-                )
-                response.raise_for_status()
-                return response.json()
-            except httpx.HTTPError as e:
-                logger.error(f"Error reverse geocoding: {str(e)}")
-                raise Exception(f"Failed to reverse geocode: {str(e)}")
+        return await _get_json(f"{self.BASE_URL}/reverse", params, "reverse geocoding results", self.timeout)
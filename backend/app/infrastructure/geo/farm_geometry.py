@@ -0,0 +1,194 @@
+# Copyright (c) 2025 CuongKenn and ICTU-OpenAgri Contributors
+# Licensed under the MIT License. See LICENSE file in the project root for full license information.
+
+"""
+Derived geometry for farm polygons.
+
+Bounding box, centroid, geodesic area and the MGRS 100 km tile (the
+Sentinel-2 tiling grid) are computed once when a farm is saved and stored
+alongside its coordinates, so schedulers and map queries don't have to
+re-derive them from the raw vertex list.
+"""
+import math
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence
+
+from pyproj import Geod, Transformer
+
+from app.domain.entities.farm import PackedCoordinates
+
+EARTH_RADIUS_KM = 6371.0088
+
+_GEOD = Geod(ellps="WGS84")
+
+# MGRS latitude bands, 8 degrees each from 80S (X covers 72N-84N)
+_LAT_BANDS = "CDEFGHJKLMNPQRSTUVWX"
+# 100 km column letters repeat every 3 zones, row letters every 2 zones
+_COLUMN_LETTERS = ("ABCDEFGH", "JKLMNPQR", "STUVWXYZ")
+_ROW_LETTERS = "ABCDEFGHJKLMNPQRSTUV"
+
+
+def _lat_lng(coord: Any) -> tuple:
+    if isinstance(coord, dict):
+        return float(coord["lat"]), float(coord["lng"])
+    return float(coord.lat), float(coord.lng)
+
+
+def compute_farm_geometry(coordinates: Sequence[Any]) -> Dict[str, Optional[float]]:
+    """
+    Compute derived geometry for a farm polygon.
+
+    Args:
+        coordinates: Polygon vertices as ``PackedCoordinates``, dicts with
+            'lat'/'lng' keys or objects with ``lat``/``lng`` attributes.
+
+    Returns:
+        Dict with min/max lat/lng, centroid_lat/centroid_lng,
+        geodesic_area_m2 and mgrs_tile. All values are None for an empty
+        polygon.
+    """
+    if isinstance(coordinates, PackedCoordinates):
+        points = coordinates.as_pairs()
+    else:
+        points = [_lat_lng(c) for c in coordinates]
+    if not points:
+        return {
+            "min_lat": None, "min_lng": None, "max_lat": None, "max_lng": None,
+            "centroid_lat": None, "centroid_lng": None,
+            "geodesic_area_m2": None, "mgrs_tile": None,
+        }
+
+    lats = [p[0] for p in points]
+    lngs = [p[1] for p in points]
+    centroid_lat, centroid_lng = polygon_centroid(points)
+
+    return {
+        "min_lat": min(lats),
+        "min_lng": min(lngs),
+        "max_lat": max(lats),
+        "max_lng": max(lngs),
+        "centroid_lat": centroid_lat,
+        "centroid_lng": centroid_lng,
+        "geodesic_area_m2": geodesic_area_m2(points),
+        "mgrs_tile": mgrs_tile_id(centroid_lat, centroid_lng),
+    }
+
+
+def polygon_centroid(points: List[tuple]) -> tuple:
+    """
+    Area-weighted centroid of a (lat, lng) polygon.
+
+    Farms are small enough that a planar formula in degrees is accurate;
+    degenerate polygons fall back to the vertex mean.
+    """
+    if len(points) < 3:
+        return (
+            sum(p[0] for p in points) / len(points),
+            sum(p[1] for p in points) / len(points),
+        )
+
+    # Work relative to the first vertex to avoid cancellation errors
+    origin_lat, origin_lng = points[0]
+    local = [(lat - origin_lat, lng - origin_lng) for lat, lng in points]
+
+    area2 = 0.0
+    cx = 0.0
+    cy = 0.0
+    for i, (y0, x0) in enumerate(local):
+        y1, x1 = local[(i + 1) % len(local)]
+        cross = x0 * y1 - x1 * y0
+        area2 += cross
+        cx += (x0 + x1) * cross
+        cy += (y0 + y1) * cross
+
+    if abs(area2) < 1e-18:
+        return (
+            sum(p[0] for p in points) / len(points),
+            sum(p[1] for p in points) / len(points),
+        )
+    return origin_lat + cy / (3.0 * area2), origin_lng + cx / (3.0 * area2)
+
+
+def geodesic_area_m2(points: List[tuple]) -> float:
+    """Area of a (lat, lng) polygon on the WGS84 ellipsoid, in square metres."""
+    if len(points) < 3:
+        return 0.0
+    area, _ = _GEOD.polygon_area_perimeter([p[1] for p in points], [p[0] for p in points])
+    return abs(area)
+
+
+@lru_cache(maxsize=128)
+def _utm_transformer(zone: int, northern: bool) -> Transformer:
+    epsg = (32600 if northern else 32700) + zone
+    return Transformer.from_crs("EPSG:4326", f"EPSG:{epsg}", always_xy=True)
+
+
+def mgrs_tile_id(lat: float, lng: float) -> Optional[str]:
+    """
+    Return the MGRS grid zone + 100 km square (e.g. '48QWJ') for a point.
+
+    This is the identifier Sentinel-2 uses for its tiles. Returns None
+    outside the UTM latitude range (polar regions).
+    """
+    if lat < -80 or lat > 84:
+        return None
+
+    zone = int((lng + 180) // 6) + 1
+    if zone > 60:
+        zone = 60
+    # Norway / Svalbard exceptions
+    if 56 <= lat < 64 and 3 <= lng < 12:
+        zone = 32
+    if 72 <= lat < 84 and lng >= 0:
+        if lng < 9:
+            zone = 31
+        elif lng < 21:
+            zone = 33
+        elif lng < 33:
+            zone = 35
+        elif lng < 42:
+            zone = 37
+
+    band = _LAT_BANDS[min(int((lat + 80) // 8), len(_LAT_BANDS) - 1)]
+
+    easting, northing = _utm_transformer(zone, lat >= 0).transform(lng, lat)
+    column_set = _COLUMN_LETTERS[(zone - 1) % 3]
+    column = column_set[int(easting // 100000) - 1]
+    row_offset = 5 if zone % 2 == 0 else 0
+    row = _ROW_LETTERS[(int(northing // 100000) + row_offset) % len(_ROW_LETTERS)]
+
+    return f"{zone:02d}{band}{column}{row}"
+
+
+def haversine_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """Great-circle distance between two points in kilometres."""
+    phi1 = math.radians(lat1)
+    phi2 = math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lng2 - lng1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+def radius_to_bbox(lat: float, lng: float, radius_km: float) -> tuple:
+    """Return (min_lat, min_lng, max_lat, max_lng) enclosing a circle."""
+    d_lat = math.degrees(radius_km / EARTH_RADIUS_KM)
+    cos_lat = max(math.cos(math.radians(lat)), 1e-6)
+    d_lng = min(math.degrees(radius_km / (EARTH_RADIUS_KM * cos_lat)), 180.0)
+    return lat - d_lat, lng - d_lng, lat + d_lat, lng + d_lng
+
+
+def farm_bbox(farm: Any) -> Optional[List[float]]:
+    """
+    Return a farm's bbox as [minx, miny, maxx, maxy] (lng/lat order).
+
+    Uses the persisted columns when present and falls back to computing it
+    from the raw coordinates for rows that predate them.
+    """
+    if getattr(farm, "min_lat", None) is not None:
+        return [farm.min_lng, farm.min_lat, farm.max_lng, farm.max_lat]
+    coords = getattr(farm, "coordinates", None)
+    if not coords:
+        return None
+    geometry = compute_farm_geometry(coords)
+    return [geometry["min_lng"], geometry["min_lat"], geometry["max_lng"], geometry["max_lat"]]
@@ -0,0 +1,294 @@
+# Copyright (c) 2025 CuongKenn and ICTU-OpenAgri Contributors
+# Licensed under the MIT License. See LICENSE file in the project root for full license information.
+
+"""
+Offline gazetteer of Vietnamese places, used for reverse geocoding.
+
+Places (provinces, districts, communes) are loaded once from
+``data/vietnam_gazetteer.json``. Places with a boundary (the provinces)
+are matched by point-in-polygon; the others by their centroid, through a
+2-d tree per level, and cover the points within
+``WEATHER_GAZETTEER_COVERAGE_FACTOR`` times their equivalent-circle radius.
+
+A lookup first finds the most specific boundary containing the point,
+which settles the province. Below it, circles are only an approximation,
+so a district or commune is named only when it is the one place of its
+level (inside that province) whose circle covers the point; otherwise the
+next coarser level answers. Points outside every boundary (islands and
+coastal water the simplified boundaries miss, or other countries) are
+answered from circles alone, except near a land border where a circle
+can't tell which side of the border the point is on; those and points no
+place covers return None so that callers can fall back to Photon.
+"""
+import heapq
+import json
+import logging
+import math
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from app.infrastructure.config.settings import get_settings
+from app.infrastructure.geo.farm_geometry import haversine_km
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+DATA_FILE = Path(__file__).resolve().parents[3] / "data" / "vietnam_gazetteer.json"
+
+COUNTRY = "Việt Nam"
+COUNTRY_CODE = "VN"
+
+# Most specific first
+LEVELS = ("commune", "district", "province")
+
+# Nearest centroids checked per level; enough to reach every overlapping neighbour
+_CANDIDATES = 12
+
+# Nearest places one level down that must agree before a circle answers
+_AGREEING = 3
+
+Ring = Tuple[Tuple[float, float], ...]
+
+
+@dataclass(frozen=True)
+class Place:
+    id: str
+    name: str
+    level: str
+    parent: Optional[str]
+    lat: float
+    lng: float
+    radius_km: float
+    # Boundary as outer rings of (lat, lng) vertices (several for islands), when the data has one
+    polygons: Tuple[Ring, ...] = ()
+    population: int = 0
+    # Other names the place is searched by (cities, former names)
+    aliases: Tuple[str, ...] = ()
+    # Shares a land border with another country
+    land_border: bool = False
+
+
+@dataclass(frozen=True)
+class GazetteerMatch:
+    place: Place
+    province: Place
+    district: Optional[Place]
+    distance_km: float
+
+
+def point_in_polygon(lat: float, lng: float, polygon: Sequence[Tuple[float, float]]) -> bool:
+    """Even-odd ray casting test for a (lat, lng) ring."""
+    inside = False
+    j = len(polygon) - 1
+    for i in range(len(polygon)):
+        lat_i, lng_i = polygon[i]
+        lat_j, lng_j = polygon[j]
+        if (lat_i > lat) != (lat_j > lat):
+            crossing = lng_i + (lat - lat_i) * (lng_j - lng_i) / (lat_j - lat_i)
+            if lng < crossing:
+                inside = not inside
+        j = i
+    return inside
+
+
+class KDTree:
+    """
+    Static 2-d tree over (lat, lng) points for nearest-neighbour queries.
+
+    Points are projected equirectangularly around the data's mean latitude,
+    which keeps the neighbour order right at Vietnam's scale; exact
+    distances are computed by the caller.
+    """
+
+    def __init__(self, points: Sequence[Tuple[float, float]]):
+        self._cos_lat = math.cos(math.radians(sum(p[0] for p in points) / len(points))) if points else 1.0
+        projected = [(self._project(lat, lng), index) for index, (lat, lng) in enumerate(points)]
+        self._root = self._build(projected, 0)
+
+    def _project(self, lat: float, lng: float) -> Tuple[float, float]:
+        return lng * self._cos_lat, lat
+
+    def _build(self, items: List, depth: int):
+        if not items:
+            return None
+        axis = depth % 2
+        items.sort(key=lambda item: item[0][axis])
+        middle = len(items) // 2
+        point, index = items[middle]
+        return (point, index, axis,
+                self._build(items[:middle], depth + 1),
+                self._build(items[middle + 1:], depth + 1))
+
+    def nearest(self, lat: float, lng: float, k: int = 1) -> List[int]:
+        """Indices of the ``k`` nearest points, closest first."""
+        target = self._project(lat, lng)
+        heap: List[Tuple[float, int]] = []  # max-heap of (-squared distance, index)
+
+        def visit(node):
+            if node is None:
+                return
+            point, index, axis, left, right = node
+            d2 = (point[0] - target[0]) ** 2 + (point[1] - target[1]) ** 2
+            if len(heap) < k:
+                heapq.heappush(heap, (-d2, index))
+            elif d2 < -heap[0][0]:
+                heapq.heapreplace(heap, (-d2, index))
+            diff = target[axis] - point[axis]
+            near, far = (left, right) if diff < 0 else (right, left)
+            visit(near)
+            if len(heap) < k or diff * diff < -heap[0][0]:
+                visit(far)
+
+        visit(self._root)
+        return [index for _, index in sorted(heap, key=lambda item: -item[0])]
+
+
+class Gazetteer:
+    """In-memory index of administrative places."""
+
+    def __init__(self, places: Sequence[Place], coverage_factor: float = 1.2):
+        self.places = list(places)
+        self.coverage_factor = coverage_factor
+        self._by_id: Dict[str, Place] = {place.id: place for place in self.places}
+        # (place, (south, north, west, east)) of places with a boundary
+        self._bounded = [
+            (place, (
+                min(lat for ring in place.polygons for lat, _ in ring),
+                max(lat for ring in place.polygons for lat, _ in ring),
+                min(lng for ring in place.polygons for _, lng in ring),
+                max(lng for ring in place.polygons for _, lng in ring),
+            ))
+            for place in self.places if place.polygons
+        ]
+        # level -> (tree, places) over the centroids of places without one
+        self._trees: Dict[str, Tuple[KDTree, List[Place]]] = {}
+        for level in LEVELS:
+            circles = [place for place in self.places if place.level == level and not place.polygons]
+            if circles:
+                self._trees[level] = (KDTree([(place.lat, place.lng) for place in circles]), circles)
+
+    @classmethod
+    def from_file(cls, path: Path = DATA_FILE, coverage_factor: float = 1.2) -> "Gazetteer":
+        with path.open("r", encoding="utf-8") as f:
+            data = json.load(f)
+        places = []
+        for item in data.get("places", []):
+            lng, lat = item["centroid"]
+            places.append(Place(
+                id=item["id"],
+                name=item["name"],
+                level=item["level"],
+                parent=item.get("parent"),
+                lat=lat,
+                lng=lng,
+                radius_km=math.sqrt(item["areaKm2"] / math.pi),
+                polygons=tuple(
+                    tuple((p[1], p[0]) for p in ring) for ring in item.get("polygon") or ()
+                ),
+                population=item.get("population") or 0,
+                aliases=tuple(item.get("aliases") or ()),
+                land_border=bool(item.get("landBorder"))
+            ))
+        return cls(places, coverage_factor)
+
+    def lookup(self, latitude: float, longitude: float) -> Optional[GazetteerMatch]:
+        """Most specific place covering the point, or None when not covered or ambiguous."""
+        if not self.places:
+            return None
+
+        bounded = self._containing(latitude, longitude)
+        if bounded is not None:
+            place = self._unambiguous_circle(latitude, longitude, within=bounded) or bounded
+        else:
+            place = self._unambiguous_circle(latitude, longitude)
+            if place is None or place.land_border:
+                return None
+
+        province, district = self.hierarchy(place)
+        distance = haversine_km(latitude, longitude, place.lat, place.lng)
+        return GazetteerMatch(place=place, province=province, district=district, distance_km=distance)
+
+    def _containing(self, latitude: float, longitude: float) -> Optional[Place]:
+        """Most specific place whose boundary contains the point."""
+        best = None
+        for place, (south, north, west, east) in self._bounded:
+            if not (south <= latitude <= north and west <= longitude <= east):
+                continue
+            if not any(point_in_polygon(latitude, longitude, ring) for ring in place.polygons):
+                continue
+            if best is None or _rank(place) < _rank(best):
+                best = place
+        return best
+
+    def _unambiguous_circle(self, latitude: float, longitude: float,
+                            within: Optional[Place] = None) -> Optional[Place]:
+        """
+        Most specific circle place that alone covers the point at its level.
+
+        The nearest centroids one level down (or, at the finest level, the
+        nearest centroid itself) must also lie in that place; circles reach
+        across the borders of irregular shapes, nearby finer places don't.
+        With ``within``, only places inside it (and finer than it) count.
+        """
+        for rank, level in enumerate(LEVELS):
+            if within is not None and rank >= _rank(within):
+                break
+            nearby = self._nearby(level, latitude, longitude, within)
+            covering = [
+                place for place in nearby
+                if haversine_km(latitude, longitude, place.lat, place.lng) <= place.radius_km * self.coverage_factor
+            ]
+            if len(covering) != 1:
+                continue
+            place = covering[0]
+            finer = self._nearby(LEVELS[rank - 1], latitude, longitude, within)[:_AGREEING] if rank else nearby[:1]
+            if all(self._is_within(neighbour, place) for neighbour in finer):
+                return place
+        return None
+
+    def _nearby(self, level: str, latitude: float, longitude: float, within: Optional[Place]) -> List[Place]:
+        """Nearest circle places of a level (inside ``within``, if given), closest first."""
+        if level not in self._trees:
+            return []
+        tree, circles = self._trees[level]
+        nearest = (circles[index] for index in tree.nearest(latitude, longitude, k=_CANDIDATES))
+        return [place for place in nearest if within is None or self._is_within(place, within)]
+
+    def _is_within(self, place: Place, ancestor: Place) -> bool:
+        current: Optional[Place] = place
+        while current is not None:
+            if current is ancestor:
+                return True
+            current = self._by_id.get(current.parent) if current.parent else None
+        return False
+
+    def hierarchy(self, place: Place) -> Tuple[Place, Optional[Place]]:
+        """(province, district) a place belongs to, the place itself included."""
+        province = district = None
+        current: Optional[Place] = place
+        while current is not None:
+            if current.level == "province":
+                province = current
+            elif current.level == "district":
+                district = current
+            current = self._by_id.get(current.parent) if current.parent else None
+        return province or place, district
+
+
+def _rank(place: Place) -> int:
+    """Position of a place's level in ``LEVELS`` (0 = most specific)."""
+    return LEVELS.index(place.level) if place.level in LEVELS else len(LEVELS)
+
+
+@lru_cache()
+def get_gazetteer() -> Optional[Gazetteer]:
+    """Shared gazetteer, loaded on first use; None when disabled or missing."""
+    if not settings.WEATHER_GAZETTEER_ENABLED:
+        return None
+    try:
+        return Gazetteer.from_file(coverage_factor=settings.WEATHER_GAZETTEER_COVERAGE_FACTOR)
+    except (OSError, ValueError, KeyError) as e:
+        logger.warning(f"Gazetteer unavailable, reverse geocoding will use Photon only: {e}")
+        return None
@@ -0,0 +1,126 @@
+# Copyright (c) 2025 CuongKenn and ICTU-OpenAgri Contributors
+# Licensed under the MIT License. See LICENSE file in the project root for full license information.
+
+"""
+Autocomplete over the offline gazetteer.
+
+Names are matched diacritic- and case-insensitively ("dong thap" finds
+"Đồng Tháp"): a sorted key list answers prefix queries on the full name,
+on aliases and on any word inside the name, and a trigram index catches
+typos. Results are ranked by match quality, then admin level (provinces
+first), then population. Trigram (``FUZZY``) matches are only
+suggestions: a short name like "Gia Lâm" is closer to "Gia Lai" than to
+anything else in a province-level gazetteer, so callers should not treat
+them as an answer.
+"""
+import bisect
+import re
+import unicodedata
+from functools import lru_cache
+from typing import Dict, List, Optional, Set, Tuple
+
+from app.infrastructure.geo.gazetteer import LEVELS, Gazetteer, Place, get_gazetteer
+
+_NON_WORD = re.compile(r"[^0-9a-z]+")
+
+# Dropped from queries: "tinh dong thap" and "tp ho chi minh" find the place
+_ADMIN_PREFIXES = ("thanh pho ", "tp ", "tinh ", "huyen ", "thi xa ", "quan ")
+
+# Match classes, best first
+EXACT, PREFIX, WORD_PREFIX, FUZZY = range(4)
+
+# Minimum trigram (Jaccard) similarity for a fuzzy match
+MIN_SIMILARITY = 0.35
+
+
+def normalize(text: str) -> str:
+    """Lowercase, strip Vietnamese diacritics and collapse punctuation to single spaces."""
+    text = unicodedata.normalize("NFD", text.casefold()).replace("đ", "d")
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    return " ".join(_NON_WORD.sub(" ", text).split())
+
+
+def trigrams(text: str) -> Set[str]:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class PlaceSearchIndex:
+    """In-memory prefix + trigram index over gazetteer places."""
+
+    def __init__(self, gazetteer: Gazetteer):
+        self.gazetteer = gazetteer
+        self.places = gazetteer.places
+        # (key, place index, match class when the query is a prefix of key)
+        keys: List[Tuple[str, int, int]] = []
+        self._name_grams: List[List[Set[str]]] = []
+        self._trigrams: Dict[str, Set[int]] = {}
+        for index, place in enumerate(self.places):
+            names = list(dict.fromkeys(normalize(n) for n in (place.name, *place.aliases)))
+            name_grams = [trigrams(name) for name in names]
+            self._name_grams.append(name_grams)
+            for name, grams in zip(names, name_grams):
+                keys.append((name, index, PREFIX))
+                words = name.split(" ")
+                for i in range(1, len(words)):
+                    keys.append((" ".join(words[i:]), index, WORD_PREFIX))
+                for gram in grams:
+                    self._trigrams.setdefault(gram, set()).add(index)
+        keys.sort()
+        self._keys = keys
+        self._key_strings = [key for key, _, _ in keys]
+
+    def _rank(self, index: int, match: int, similarity: float = 1.0) -> Tuple:
+        place = self.places[index]
+        level = LEVELS[::-1].index(place.level) if place.level in LEVELS else len(LEVELS)
+        return (match, -similarity, level, -place.population, place.name)
+
+    def search(self, query: str, limit: int = 10) -> List[Place]:
+        """Best matching places for a (partial) query, best first."""
+        return [place for place, _ in self.search_with_match(query, limit)]
+
+    def search_with_match(self, query: str, limit: int = 10) -> List[Tuple[Place, int]]:
+        """Like ``search``, with each place's match class (``EXACT`` ... ``FUZZY``)."""
+        text = normalize(query)
+        for prefix in _ADMIN_PREFIXES:
+            if text.startswith(prefix) and len(text) > len(prefix):
+                text = text[len(prefix):]
+                break
+        if not text:
+            return []
+
+        best: Dict[int, Tuple] = {}
+        start = bisect.bisect_left(self._key_strings, text)
+        for key, index, match in self._keys[start:]:
+            if not key.startswith(text):
+                break
+            if match == PREFIX and key == text:
+                match = EXACT
+            rank = self._rank(index, match)
+            if index not in best or rank < best[index]:
+                best[index] = rank
+
+        if len(best) < limit and len(text) >= 3:
+            query_grams = trigrams(text)
+            candidates: Set[int] = set()
+            for gram in query_grams:
+                candidates.update(self._trigrams.get(gram, ()))
+            for index in candidates - best.keys():
+                similarity = max(
+                    len(query_grams & grams) / len(query_grams | grams)
+                    for grams in self._name_grams[index]
+                )
+                if similarity >= MIN_SIMILARITY:
+                    best[index] = self._rank(index, FUZZY, similarity)
+
+        ranked = sorted(best, key=best.__getitem__)
+        return [(self.places[index], best[index][0]) for index in ranked[:limit]]
+
+
+@lru_cache()
+def get_place_search_index() -> Optional[PlaceSearchIndex]:
+    """Shared index over the gazetteer; None when the gazetteer is unavailable."""
+    gazetteer = get_gazetteer()
+    if gazetteer is None:
+        return None
+    return PlaceSearchIndex(gazetteer)
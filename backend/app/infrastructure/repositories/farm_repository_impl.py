@@ -1,31 +1,80 @@
 # Copyright (c) 2025 CuongKenn and ICTU-OpenAgri Contributors
 # Licensed under the MIT License. See LICENSE file in the project root for full license information.
 
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import case, func, select
+from sqlalchemy.orm import defer, with_expression
 from app.domain.repositories.farm_repository import FarmRepository
-from app.domain.entities.farm import FarmArea, Coordinate
+from app.domain.entities.farm import FarmArea, PackedCoordinates
 from app.infrastructure.database.models.farm_model import FarmModel
 from app.infrastructure.database.models.user_model import UserModel
+from app.infrastructure.database.spatial_index import spatial_index_enabled, rtree_candidate_ids
+from app.infrastructure.geo.farm_geometry import compute_farm_geometry, haversine_km, radius_to_bbox
+
+# JSON coordinates, only for rows that lack the packed copy (rows written
+# outside this repository); NULL otherwise, so the JSON isn't transferred
+_UNPACKED_COORDINATES = case((FarmModel.coordinates_packed.is_(None), FarmModel.coordinates))
 
 class SQLAlchemyFarmRepository(FarmRepository):
     def __init__(self, db: AsyncSession):
         self.db = db
 
+    @staticmethod
+    def _apply_coordinates(db_farm: FarmModel, coordinates: PackedCoordinates) -> None:
+        """Store coordinates (packed and JSON) plus the geometry derived from them."""
+        db_farm.coordinates = coordinates.to_dicts()
+        db_farm.coordinates_packed = coordinates.to_bytes()
+        for key, value in compute_farm_geometry(coordinates).items():
+            setattr(db_farm, key, value)
+
+    @staticmethod
+    def _to_entity(farm: FarmModel) -> FarmArea:
+        """Build a FarmArea from a row, reusing the packed coordinate buffer."""
+        if farm.coordinates_packed is not None:
+            coordinates = PackedCoordinates(farm.coordinates_packed)
+        else:
+            coordinates = PackedCoordinates.from_coordinates(farm.coordinates_unpacked or [])
+        return FarmArea(
+            id=farm.id,
+            name=farm.name,
+            description=farm.description,
+            coordinates=coordinates,
+            area_size=farm.area_size,
+            crop_type=farm.crop_type,
+            user_id=farm.user_id
+        )
+
+    @staticmethod
+    def _select_farms(*entities):
+        """SELECT farms, loading the JSON coordinates only for rows without packed ones."""
+        return select(FarmModel, *entities).options(
+            defer(FarmModel.coordinates),
+            with_expression(FarmModel.coordinates_unpacked, _UNPACKED_COORDINATES)
+        )
+
+    async def _bbox_filter(self, min_lat: float, min_lng: float, max_lat: float, max_lng: float) -> list:
+        """WHERE clauses selecting farms whose bbox intersects the given one."""
+        conditions = [
+            FarmModel.max_lat >= min_lat,
+            FarmModel.min_lat <= max_lat,
+            FarmModel.max_lng >= min_lng,
+            FarmModel.min_lng <= max_lng,
+        ]
+        if await spatial_index_enabled(self.db):
+            conditions.insert(0, FarmModel.id.in_(rtree_candidate_ids(min_lat, min_lng, max_lat, max_lng)))
+        return conditions
+
     async def save(self, farm: FarmArea) -> FarmArea:
         # Convert domain entity to SQLAlchemy model
-        # Manually convert coordinates to list of dicts to avoid Pydantic version issues
-        coordinates_json = [{"lat": coord.lat, "lng": coord.lng} for coord in farm.coordinates]
-        
         db_farm = FarmModel(
             name=farm.name,
             description=farm.description,
-            coordinates=coordinates_json,
             area_size=farm.area_size,
             crop_type=farm.crop_type,
             user_id=farm.user_id
         )
+        self._apply_coordinates(db_farm, farm.coordinates)
         
         self.db.add(db_farm)
         await self.db.commit()
@@ -37,63 +86,46 @@ class SQLAlchemyFarmRepository(FarmRepository):
 
     async def get_by_user_id(self, user_id: int) -> List[FarmArea]:
         result = await self.db.execute(
-            select(FarmModel).where(FarmModel.user_id == user_id)
+            self._select_farms().where(FarmModel.user_id == user_id)
         )
         farms = result.scalars().all()
         
         return [
-            FarmArea(
-                id=farm.id,
-                name=farm.name,
-                description=farm.description,
-                coordinates=[Coordinate(**c) for c in farm.coordinates],
-                area_size=farm.area_size,
-                crop_type=farm.crop_type,
-                user_id=farm.user_id
-            )
+            self._to_entity(farm)
             for farm in farms
         ]
 
     async def get_by_id(self, farm_id: int) -> Optional[FarmArea]:
         result = await self.db.execute(
-            select(FarmModel).where(FarmModel.id == farm_id)
+            self._select_farms().where(FarmModel.id == farm_id)
         )
         farm = result.scalar_one_or_none()
         
         if farm:
-            return FarmArea(
-                id=farm.id,
-                name=farm.name,
-                description=farm.description,
-                coordinates=[Coordinate(**c) for c in farm.coordinates],
-                area_size=farm.area_size,
-                crop_type=farm.crop_type,
-                user_id=farm.user_id
-            )
+            return self._to_entity(farm)
         return None
 
-    async def get_all_with_user(self, skip: int = 0, limit: int = 100) -> List[tuple[FarmArea, dict]]:
-        from app.infrastructure.database.models.user_model import UserModel
+    async def get_all_with_user(self, skip: int = 0, limit: int = 100,
+                                after_id: Optional[int] = None) -> List[tuple[FarmArea, dict]]:
+        """
+        Get farms with owner details, ordered by ID.
         
-        result = await self.db.execute(
-            select(FarmModel, UserModel)
-            .join(UserModel, FarmModel.user_id == UserModel.id)
-            .offset(skip)
-            .limit(limit)
-        )
+        Args:
+            skip: Rows to skip (OFFSET); ignored when ``after_id`` is given
+            limit: Maximum rows to return
+            after_id: Keyset cursor; return farms with an ID greater than this
+        """
+        query = self._select_farms(UserModel).join(UserModel, FarmModel.user_id == UserModel.id)
+        if after_id is not None:
+            query = query.where(FarmModel.id > after_id)
+        else:
+            query = query.offset(skip)
+        result = await self.db.execute(query.order_by(FarmModel.id).limit(limit))
         rows = result.all()
         
         return [
             (
-                FarmArea(
-                    id=farm.id,
-                    name=farm.name,
-                    description=farm.description,
-                    coordinates=[Coordinate(**c) for c in farm.coordinates],
-                    area_size=farm.area_size,
-                    crop_type=farm.crop_type,
-                    user_id=farm.user_id
-                ),
+                self._to_entity(farm),
                 {
                     "email": user.email,
                     "username": user.username,
@@ -103,42 +135,108 @@ class SQLAlchemyFarmRepository(FarmRepository):
             for farm, user in rows
         ]
 
+    async def count_all(self) -> int:
+        """Total number of farms."""
+        result = await self.db.execute(select(func.count(FarmModel.id)))
+        return result.scalar()
+
     async def get_crop_distribution(self) -> List[dict]:
-        from sqlalchemy import func
         result = await self.db.execute(
             select(FarmModel.crop_type, func.count(FarmModel.id))
             .group_by(FarmModel.crop_type)
         )
         return [{"crop_type": row[0] or "Chưa xác định", "count": row[1]} for row in result.all()]
 
-    async def get_all_locations(self) -> List[dict]:
-        result = await self.db.execute(
-            select(
-                FarmModel.id, 
-                FarmModel.name, 
-                FarmModel.coordinates, 
-                FarmModel.crop_type,
-                UserModel.full_name,
-                UserModel.username
-            ).join(UserModel, FarmModel.user_id == UserModel.id)
-        )
+    async def get_all_locations(self, viewport: Optional[tuple] = None) -> List[dict]:
+        """
+        Get farm locations for map display.
+        
+        Args:
+            viewport: Optional (min_lat, min_lng, max_lat, max_lng) to restrict
+                results to farms intersecting the visible map area.
+        """
+        query = select(
+            FarmModel.id, 
+            FarmModel.name, 
+            FarmModel.coordinates_packed,
+            _UNPACKED_COORDINATES.label("coordinates_unpacked"),
+            FarmModel.crop_type,
+            UserModel.full_name,
+            UserModel.username
+        ).join(UserModel, FarmModel.user_id == UserModel.id)
+        if viewport is not None:
+            query = query.where(*await self._bbox_filter(*viewport))
+        result = await self.db.execute(query)
         return [
             {
                 "id": row.id,
                 "name": row.name,
-                "coordinates": row.coordinates,
+                "coordinates": (
+                    PackedCoordinates(row.coordinates_packed)
+                    if row.coordinates_packed is not None
+                    else PackedCoordinates.from_coordinates(row.coordinates_unpacked or [])
+                ),
                 "crop_type": row.crop_type,
                 "owner_name": row.full_name or row.username
             }
             for row in result.all()
         ]
 
+    async def find_in_viewport(self, min_lat: float, min_lng: float, max_lat: float, max_lng: float,
+                               limit: int = 500) -> List[FarmArea]:
+        """Get farms whose bounding box intersects the given viewport."""
+        result = await self.db.execute(
+            self._select_farms()
+            .where(*await self._bbox_filter(min_lat, min_lng, max_lat, max_lng))
+            .limit(limit)
+        )
+        return [
+            self._to_entity(farm)
+            for farm in result.scalars().all()
+        ]
+
+    async def find_within_radius(self, lat: float, lng: float, radius_km: float,
+                                 limit: int = 500) -> List[FarmArea]:
+        """
+        Get farms within ``radius_km`` of a point, nearest first.
+        
+        Distance is measured to the closest point of each farm's bounding box,
+        so farms partially inside the circle are included.
+        """
+        result = await self.db.execute(
+            self._select_farms().where(*await self._bbox_filter(*radius_to_bbox(lat, lng, radius_km)))
+        )
+        matches = []
+        for farm in result.scalars().all():
+            nearest_lat = min(max(lat, farm.min_lat), farm.max_lat)
+            nearest_lng = min(max(lng, farm.min_lng), farm.max_lng)
+            distance = haversine_km(lat, lng, nearest_lat, nearest_lng)
+            if distance <= radius_km:
+                matches.append((distance, farm))
+        matches.sort(key=lambda item: item[0])
+        
+        return [
+            self._to_entity(farm)
+            for _, farm in matches[:limit]
+        ]
+
+    async def get_centroids(self, user_id: int,
+                            farm_ids: Optional[List[int]] = None) -> List[Tuple[int, str, float, float]]:
+        query = select(FarmModel.id, FarmModel.name, FarmModel.centroid_lat, FarmModel.centroid_lng).where(
+            FarmModel.user_id == user_id,
+            FarmModel.centroid_lat.is_not(None)
+        )
+        if farm_ids is not None:
+            query = query.where(FarmModel.id.in_(farm_ids))
+        result = await self.db.execute(query.order_by(FarmModel.id))
+        return [tuple(row) for row in result.all()]
+
     async def update(self, farm_id: int, user_id: int, name: Optional[str] = None,
                      description: Optional[str] = None, coordinates: Optional[list] = None,
                      area_size: Optional[float] = None, crop_type: Optional[str] = None) -> Optional[FarmArea]:
         """Update a farm area. Only the owner can update."""
         result = await self.db.execute(
-            select(FarmModel).where(FarmModel.id == farm_id, FarmModel.user_id == user_id)
+            self._select_farms().where(FarmModel.id == farm_id, FarmModel.user_id == user_id)
         )
         farm = result.scalar_one_or_none()
         
@@ -150,8 +248,11 @@ class SQLAlchemyFarmRepository(FarmRepository):
             farm.name = name
         if description is not None:
             farm.description = description
+        if coordinates is None and farm.coordinates_packed is None:
+            # Give rows without packed coordinates their packed copy
+            coordinates = farm.coordinates_unpacked or []
         if coordinates is not None:
-            farm.coordinates = [c.model_dump() if hasattr(c, 'model_dump') else c for c in coordinates]
+            self._apply_coordinates(farm, PackedCoordinates.from_coordinates(coordinates))
         if area_size is not None:
             farm.area_size = area_size
         if crop_type is not None:
@@ -160,20 +261,12 @@ class SQLAlchemyFarmRepository(FarmRepository):
         await self.db.commit()
         await self.db.refresh(farm)
         
-        return FarmArea(
-            id=farm.id,
-            name=farm.name,
-            description=farm.description,
-            coordinates=[Coordinate(**c) for c in farm.coordinates],
-            area_size=farm.area_size,
-            crop_type=farm.crop_type,
-            user_id=farm.user_id
-        )
+        return self._to_entity(farm)
 
     async def delete(self, farm_id: int, user_id: int) -> bool:
         """Delete a farm area. Only the owner can delete."""
         result = await self.db.execute(
-            select(FarmModel).where(FarmModel.id == farm_id, FarmModel.user_id == user_id)
+            self._select_farms().where(FarmModel.id == farm_id, FarmModel.user_id == user_id)
         )
         farm = result.scalar_one_or_none()
         
@@ -1,12 +1,21 @@
 # Copyright (c) 2025 CuongKenn and ICTU-OpenAgri Contributors
 # Licensed under the MIT License. See LICENSE file in the project root for full license information.
 
-from typing import List, Optional
+import logging
+from typing import AsyncIterator, List, Optional, Tuple
 from datetime import date
-from sqlalchemy import select, and_
+from sqlalchemy import select, and_, or_
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.domain.repositories.satellite_repository import SatelliteRepository
+from app.infrastructure.config.settings import get_settings
+from app.infrastructure.database.models.farm_model import FarmModel
 from app.infrastructure.database.models.satellite_data_model import SatelliteDataModel
+from app.infrastructure.database.models.satellite_rollup_model import SatelliteRollupModel
+from app.infrastructure.database.satellite_rollups import GRANULARITIES, apply_observation, bucket_end, bucket_start
+from app.infrastructure.external_services.fiware_outbox import build_observation_entities, enqueue_entities
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
 
 class SatelliteRepositoryImpl(SatelliteRepository):
     def __init__(self, session: AsyncSession):
@@ -14,10 +23,35 @@ class SatelliteRepositoryImpl(SatelliteRepository):
 
     async def save_data(self, data: SatelliteDataModel) -> SatelliteDataModel:
         self.session.add(data)
+        await self._update_rollups(data)
+        await self._enqueue_fiware_sync(data)
         await self.session.commit()
         await self.session.refresh(data)
         return data
 
+    async def _enqueue_fiware_sync(self, data: SatelliteDataModel) -> None:
+        """
+        Queue the observation for FIWARE in the same transaction (see fiware_outbox).
+
+        Runs in a savepoint so that a failure here is logged and dropped
+        instead of rolling back the observation itself.
+        """
+        if not settings.FIWARE_ENABLED:
+            return
+        # Errors in the observation itself must still reach the caller
+        await self.session.flush()
+        try:
+            async with self.session.begin_nested():
+                farm = await self.session.get(FarmModel, data.farm_id)
+                if farm is None:
+                    return
+                await enqueue_entities(
+                    self.session,
+                    build_observation_entities(farm, data.data_type, data.mean_value, data.acquisition_date)
+                )
+        except Exception as e:
+            logger.error(f"Could not queue farm {data.farm_id} for FIWARE: {e}")
+
     async def get_data_by_farm(self, farm_id: int, data_type: str, start_date: date, end_date: date) -> List[SatelliteDataModel]:
         query = select(SatelliteDataModel).where(
             and_(
@@ -41,3 +75,126 @@ class SatelliteRepositoryImpl(SatelliteRepository):
         )
         result = await self.session.execute(query)
         return result.scalars().first()
+
+    async def _update_rollups(self, data: SatelliteDataModel) -> None:
+        """Fold a new observation into its week/month/season buckets (same transaction)."""
+        starts = {g: bucket_start(data.acquisition_date, g) for g in GRANULARITIES}
+        result = await self.session.execute(
+            select(SatelliteRollupModel).where(
+                SatelliteRollupModel.farm_id == data.farm_id,
+                SatelliteRollupModel.data_type == data.data_type,
+                or_(*(
+                    and_(SatelliteRollupModel.granularity == g, SatelliteRollupModel.bucket_start == start)
+                    for g, start in starts.items()
+                ))
+            )
+        )
+        existing = {r.granularity: r for r in result.scalars().all()}
+        
+        for granularity, start in starts.items():
+            rollup = existing.get(granularity)
+            if rollup is None:
+                rollup = SatelliteRollupModel(
+                    farm_id=data.farm_id,
+                    data_type=data.data_type,
+                    granularity=granularity,
+                    bucket_start=start,
+                    count=0,
+                    sum_value=0.0
+                )
+                self.session.add(rollup)
+            apply_observation(rollup, data.mean_value, data.acquisition_date)
+
+    async def get_rollups(self, farm_id: int, data_type: str, granularity: str,
+                          start_date: date, end_date: date) -> List[SatelliteRollupModel]:
+        """
+        Buckets overlapping ``[start_date, end_date]``, oldest first.
+
+        Buckets that stick out of the range are clipped to it: they are
+        recomputed from the raw observations inside the range (and dropped if
+        there are none), so edge points never include data outside it. Every
+        bucket keeps its calendar ``bucket_start`` as its chart date.
+        """
+        query = select(SatelliteRollupModel).where(
+            and_(
+                SatelliteRollupModel.farm_id == farm_id,
+                SatelliteRollupModel.data_type == data_type,
+                SatelliteRollupModel.granularity == granularity,
+                SatelliteRollupModel.bucket_start >= bucket_start(start_date, granularity),
+                SatelliteRollupModel.bucket_start <= end_date
+            )
+        ).order_by(SatelliteRollupModel.bucket_start.asc())
+        
+        result = await self.session.execute(query)
+        rollups = list(result.scalars().all())
+        for i in {0, len(rollups) - 1} if rollups else ():
+            rollup = rollups[i]
+            if rollup.bucket_start < start_date or bucket_end(rollup.bucket_start, granularity) > end_date:
+                rollups[i] = await self._clipped_rollup(rollup, start_date, end_date)
+        return [r for r in rollups if r is not None]
+
+    async def _clipped_rollup(self, rollup: SatelliteRollupModel, start_date: date,
+                              end_date: date) -> Optional[SatelliteRollupModel]:
+        """A detached copy of ``rollup`` over only its observations within the range."""
+        first = max(rollup.bucket_start, start_date)
+        last = min(bucket_end(rollup.bucket_start, rollup.granularity), end_date)
+        clipped = SatelliteRollupModel(
+            farm_id=rollup.farm_id,
+            data_type=rollup.data_type,
+            granularity=rollup.granularity,
+            bucket_start=rollup.bucket_start,
+            count=0,
+            sum_value=0.0
+        )
+        for record in await self.get_data_by_farm(rollup.farm_id, rollup.data_type, first, last):
+            apply_observation(clipped, record.mean_value, record.acquisition_date)
+        return clipped if clipped.count else None
+
+    async def get_latest_record(self, farm_id: int, data_type: str, start_date: date, end_date: date) -> Optional[SatelliteDataModel]:
+        query = select(SatelliteDataModel).where(
+            and_(
+                SatelliteDataModel.farm_id == farm_id,
+                SatelliteDataModel.data_type == data_type,
+                SatelliteDataModel.acquisition_date >= start_date,
+                SatelliteDataModel.acquisition_date <= end_date
+            )
+        ).order_by(SatelliteDataModel.acquisition_date.desc()).limit(1)
+        
+        result = await self.session.execute(query)
+        return result.scalars().first()
+
+    async def stream_history(self, user_id: int, farm_ids: Optional[List[int]], data_types: List[str],
+                             start_date: date, end_date: date) -> AsyncIterator[Tuple[int, str, date, float]]:
+        """
+        Stream (farm_id, data_type, acquisition_date, mean_value) rows for
+        several farms in one query, ordered by farm, data type and date.
+        
+        Only farms owned by ``user_id`` are included; ``farm_ids=None``
+        means all of them.
+        """
+        query = (
+            select(
+                SatelliteDataModel.farm_id,
+                SatelliteDataModel.data_type,
+                SatelliteDataModel.acquisition_date,
+                SatelliteDataModel.mean_value
+            )
+            .join(FarmModel, FarmModel.id == SatelliteDataModel.farm_id)
+            .where(
+                FarmModel.user_id == user_id,
+                SatelliteDataModel.data_type.in_(data_types),
+                SatelliteDataModel.acquisition_date >= start_date,
+                SatelliteDataModel.acquisition_date <= end_date
+            )
+            .order_by(
+                SatelliteDataModel.farm_id,
+                SatelliteDataModel.data_type,
+                SatelliteDataModel.acquisition_date
+            )
+        )
+        if farm_ids is not None:
+            query = query.where(SatelliteDataModel.farm_id.in_(farm_ids))
+        
+        result = await self.session.stream(query)
+        async for row in result:
+            yield tuple(row)
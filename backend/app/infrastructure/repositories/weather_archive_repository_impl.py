@@ -0,0 +1,77 @@
+# Copyright (c) 2025 CuongKenn and ICTU-OpenAgri Contributors
+# Licensed under the MIT License. See LICENSE file in the project root for full license information.
+
+from typing import Any, Dict, List, Set
+from datetime import date
+from sqlalchemy import and_, case, delete, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.domain.repositories.weather_archive_repository import WeatherArchiveRepository
+from app.infrastructure.database.models.weather_archive_model import WeatherArchiveModel
+
+# A day counts as archived with this many hours (23 allows for DST days)
+MIN_HOURS_PER_DAY = 23
+
+# Relative humidity treated as wet foliage when counting humid hours
+HUMID_HOURS_THRESHOLD = 90.0
+
+class SQLAlchemyWeatherArchiveRepository(WeatherArchiveRepository):
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    def _cell_range(self, cell_lat: float, cell_lng: float, start_date: date, end_date: date):
+        return and_(
+            WeatherArchiveModel.cell_lat == cell_lat,
+            WeatherArchiveModel.cell_lng == cell_lng,
+            WeatherArchiveModel.day >= start_date,
+            WeatherArchiveModel.day <= end_date
+        )
+
+    async def get_complete_days(self, cell_lat: float, cell_lng: float, start_date: date, end_date: date) -> Set[date]:
+        query = (
+            select(WeatherArchiveModel.day)
+            .where(self._cell_range(cell_lat, cell_lng, start_date, end_date))
+            .group_by(WeatherArchiveModel.day)
+            .having(func.count() >= MIN_HOURS_PER_DAY)
+        )
+        result = await self.session.execute(query)
+        return set(result.scalars().all())
+
+    async def replace_days(self, cell_lat: float, cell_lng: float, hours: List[Dict[str, Any]]) -> int:
+        if not hours:
+            return 0
+        days = sorted({hour["day"] for hour in hours})
+        # Partially stored days are replaced as a whole
+        await self.session.execute(
+            delete(WeatherArchiveModel).where(
+                WeatherArchiveModel.cell_lat == cell_lat,
+                WeatherArchiveModel.cell_lng == cell_lng,
+                WeatherArchiveModel.day.in_(days)
+            )
+        )
+        await self.session.execute(
+            insert(WeatherArchiveModel),
+            [{**hour, "cell_lat": cell_lat, "cell_lng": cell_lng} for hour in hours]
+        )
+        await self.session.commit()
+        return len(hours)
+
+    async def get_daily_aggregates(self, cell_lat: float, cell_lng: float, start_date: date, end_date: date) -> List[Dict[str, Any]]:
+        m = WeatherArchiveModel
+        query = (
+            select(
+                m.day,
+                func.count().label("hours"),
+                func.min(m.temperature_2m).label("temperature_min"),
+                func.max(m.temperature_2m).label("temperature_max"),
+                func.avg(m.temperature_2m).label("temperature_mean"),
+                func.sum(m.precipitation).label("precipitation_sum"),
+                func.avg(m.relative_humidity_2m).label("relative_humidity_mean"),
+                func.max(m.wind_speed_10m).label("wind_speed_max"),
+                func.sum(case((m.relative_humidity_2m >= HUMID_HOURS_THRESHOLD, 1), else_=0)).label("humid_hours"),
+            )
+            .where(self._cell_range(cell_lat, cell_lng, start_date, end_date))
+            .group_by(m.day)
+            .order_by(m.day.asc())
+        )
+        result = await self.session.execute(query)
+        return [dict(row._mapping) for row in result]
@@ -0,0 +1,69 @@
+# Copyright (c) 2025 CuongKenn and ICTU-OpenAgri Contributors
+# Licensed under the MIT License. See LICENSE file in the project root for full license information.
+
+"""
+Async password hashing service.
+
+bcrypt is deliberately slow (~250 ms per call at cost 12), so calling it
+directly from an async handler blocks the event loop. This service runs
+hashing and verification on a dedicated thread pool; the pool size caps how
+many bcrypt operations run at once, and further calls queue up without
+blocking other requests.
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Optional
+
+from app.infrastructure.config.settings import get_settings
+from app.infrastructure.security.jwt import pwd_context
+
+settings = get_settings()
+
+
+class PasswordHasher:
+    """Runs passlib hashing/verification on a bounded thread pool."""
+
+    def __init__(self, max_workers: int = 4):
+        self.max_workers = max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix="password-hasher"
+            )
+        return self._executor
+
+    async def _run(self, func, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, partial(func, *args))
+
+    async def hash(self, password: str) -> str:
+        """Hash a plain password."""
+        return await self._run(pwd_context.hash, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """Verify a plain password against its hash."""
+        return await self._run(pwd_context.verify, plain_password, hashed_password)
+
+    def shutdown(self) -> None:
+        """Stop the worker threads. A new pool is created on next use."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+password_hasher = PasswordHasher(max_workers=settings.PASSWORD_HASH_MAX_WORKERS)
+
+
+async def hash_password_async(password: str) -> str:
+    """Hash a password without blocking the event loop."""
+    return await password_hasher.hash(password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password without blocking the event loop."""
+    return await password_hasher.verify(plain_password, hashed_password)
@@ -4,6 +4,7 @@
 """
 Main FastAPI application entry point.
 """
+import asyncio
 import logging
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
@@ -16,7 +17,9 @@ from app.infrastructure.database.database import init_db, AsyncSessionLocal
 from app.infrastructure.database import models
 
 from app.infrastructure.database.models.user_model import UserModel
-from app.infrastructure.security.jwt import get_password_hash
+from app.infrastructure.security.password_hasher import hash_password_async, password_hasher
+from app.infrastructure.external_services.fiware_client import close_fiware_client
+from app.infrastructure.geo.place_search import get_place_search_index
 from sqlalchemy.future import select
 from app.scheduler import start_scheduler
 
@@ -39,6 +42,9 @@ async def startup_event():
     
     # Start Scheduler
     start_scheduler()
+
+    # Load the gazetteer and its search index before the first weather request
+    await asyncio.to_thread(get_place_search_index)
     
     # Create admin user if not exists
     async with AsyncSessionLocal() as session:
@@ -57,7 +63,7 @@ async def startup_event():
                     email=settings.ADMIN_EMAIL,
                     username="admin",
                     full_name="System Administrator",
-                    hashed_password=get_password_hash(settings.ADMIN_PASSWORD),
+                    hashed_password=await hash_password_async(settings.ADMIN_PASSWORD),
                     is_active=True,
                     is_superuser=True
                 )
@@ -69,6 +75,12 @@ async def startup_event():
         except Exception as e:
             logger.error(f"Error creating admin user: {e}")
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Release background resources on shutdown."""
+    password_hasher.shutdown()
+    await close_fiware_client()
+
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
@@ -76,6 +88,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Total-Count"],
 )
 
 # Include API router
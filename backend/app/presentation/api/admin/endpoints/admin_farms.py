@@ -4,10 +4,13 @@
 """
 Admin farm management endpoints.
 """
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from app.application.dto.farm_dto import AdminFarmAreaResponseDTO, CoordinateDTO, CropDistributionDTO, FarmLocationDTO
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Response, status, Query
+from app.application.dto.farm_dto import AdminFarmAreaResponseDTO, CropDistributionDTO, FarmLocationDTO
 from app.infrastructure.repositories.farm_repository_impl import SQLAlchemyFarmRepository
+from app.infrastructure.cache.count_cache import FARMS, cached_count
+from app.infrastructure.cache.admin_stats import get_admin_stats
+from app.infrastructure.database.pagination import decode_cursor, encode_cursor
 from app.presentation.deps import get_farm_repository, get_current_superuser
 from app.domain.entities.user import User
 
@@ -15,26 +18,44 @@ router = APIRouter()
 
 @router.get("/farms", response_model=List[AdminFarmAreaResponseDTO])
 async def list_all_farms(
+    response: Response,
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(10, ge=1, le=100, description="Items per page"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page (overrides page)"),
     repository: SQLAlchemyFarmRepository = Depends(get_farm_repository),
     current_user: User = Depends(get_current_superuser)
 ):
     """
     List all farms with user details.
     
+    The response carries ``X-Next-Cursor`` (when more farms follow) and
+    ``X-Total-Count`` headers; pass the cursor back as ``cursor`` to page
+    without OFFSET.
+    
     Requires admin privileges.
     """
+    after_id = None
+    if cursor:
+        try:
+            after_id = int(decode_cursor(cursor, 1)[0])
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid pagination cursor")
+    
     try:
         skip = (page - 1) * page_size
-        results = await repository.get_all_with_user(skip=skip, limit=page_size)
+        results = await repository.get_all_with_user(skip=skip, limit=page_size + 1, after_id=after_id)
+        
+        if len(results) > page_size:
+            results = results[:page_size]
+            response.headers["X-Next-Cursor"] = encode_cursor(results[-1][0].id)
+        response.headers["X-Total-Count"] = str(await cached_count(FARMS, None, repository.count_all))
         
         return [
             AdminFarmAreaResponseDTO(
                 id=farm.id,
                 name=farm.name,
                 description=farm.description,
-                coordinates=[CoordinateDTO(lat=c.lat, lng=c.lng) for c in farm.coordinates],
+                coordinates=farm.coordinates,
                 area_size=farm.area_size,
                 crop_type=farm.crop_type,
                 user_id=farm.user_id,
@@ -59,7 +80,8 @@ async def get_crop_distribution(
     Get crop distribution statistics.
     """
     try:
-        return await repository.get_crop_distribution()
+        stats = await get_admin_stats(repository.db)
+        return stats.crop_distribution()
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -68,22 +90,39 @@ async def get_crop_distribution(
 
 @router.get("/farms/locations", response_model=List[FarmLocationDTO])
 async def get_farm_locations(
+    min_lat: Optional[float] = Query(None, ge=-90, le=90, description="Viewport south edge"),
+    min_lng: Optional[float] = Query(None, ge=-180, le=180, description="Viewport west edge"),
+    max_lat: Optional[float] = Query(None, ge=-90, le=90, description="Viewport north edge"),
+    max_lng: Optional[float] = Query(None, ge=-180, le=180, description="Viewport east edge"),
     repository: SQLAlchemyFarmRepository = Depends(get_farm_repository),
     current_user: User = Depends(get_current_superuser)
 ):
     """
-    Get all farm locations for map visualization.
+    Get farm locations for map visualization.
+    
+    When all four viewport bounds are given, only farms intersecting the
+    visible map area are returned (served from the spatial index).
     """
+    bounds = (min_lat, min_lng, max_lat, max_lng)
+    if any(b is not None for b in bounds) and any(b is None for b in bounds):
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="min_lat, min_lng, max_lat and max_lng must be provided together"
+        )
+    viewport = bounds if min_lat is not None else None
+    if viewport is not None and (min_lat > max_lat or min_lng > max_lng):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="min_lat must not exceed max_lat, nor min_lng max_lng"
+        )
+    
     try:
-        # Note: This method needs to be implemented in the repository
-        # For now, we'll assume it exists or use a workaround if needed
-        # But based on my previous edit, I added get_all_locations to the repo
-        results = await repository.get_all_locations()
+        results = await repository.get_all_locations(viewport=viewport)
         return [
             FarmLocationDTO(
                 id=row["id"],
                 name=row["name"],
-                coordinates=[CoordinateDTO(**c) for c in row["coordinates"]],
+                coordinates=row["coordinates"],
                 crop_type=row["crop_type"],
                 owner_name=row["owner_name"]
             )
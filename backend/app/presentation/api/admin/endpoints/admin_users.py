@@ -32,17 +32,23 @@ async def list_users(
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(10, ge=1, le=100, description="Items per page"),
     search: Optional[str] = Query(None, description="Search by email, username, or full name"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page (overrides page)"),
     repository: SQLAlchemyUserRepository = Depends(get_user_repository),
     current_user: User = Depends(get_current_user)
 ):
     """
     List all users with pagination and optional search.
     
+    Pass the returned ``next_cursor`` back as ``cursor`` to fetch the next
+    page without OFFSET. ``total`` may lag behind by a few seconds.
+    
     Requires authentication.
     """
     use_case = ListUsersUseCase(repository)
     try:
-        return await use_case.execute(page=page, page_size=page_size, search=search)
+        return await use_case.execute(page=page, page_size=page_size, search=search, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
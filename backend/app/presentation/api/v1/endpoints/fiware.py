@@ -4,14 +4,17 @@
 """
 FIWARE API endpoints for managing NGSI-LD entities.
 """
-from typing import List, Optional
+import json
+import logging
+from typing import AsyncIterator, List, Optional
 from fastapi import APIRouter, HTTPException, status, Query
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 from datetime import datetime, timezone
 
 from app.infrastructure.config.settings import get_settings
 from app.infrastructure.external_services.fiware_client import (
-    FiwareClient,
+    get_fiware_client,
     FiwareClientError,
     create_agriparcel_entity,
     create_agriparcel_record,
@@ -22,6 +25,7 @@ from app.infrastructure.external_services.fiware_client import (
 
 router = APIRouter()
 settings = get_settings()
+logger = logging.getLogger(__name__)
 
 
 # ==================== Pydantic Models ====================
@@ -36,6 +40,9 @@ class FiwareHealthResponse(BaseModel):
     orion_url: str
     orion_available: bool
     fiware_enabled: bool
+    circuit_state: str = Field(..., description="closed, open or half_open")
+    consecutive_failures: int
+    last_checked_at: Optional[datetime] = None
 
 
 class FiwareEntityResponse(BaseModel):
@@ -44,6 +51,18 @@ class FiwareEntityResponse(BaseModel):
     message: str
 
 
+class FiwareBatchError(BaseModel):
+    entity_id: Optional[str] = None
+    status_code: int
+    message: str
+
+
+class FiwareBatchResponse(BaseModel):
+    success: bool
+    upserted: List[str]
+    errors: List[FiwareBatchError]
+
+
 class FiwareQueryResponse(BaseModel):
     success: bool
     entities: List[dict]
@@ -64,6 +83,14 @@ class SyncObservationRequest(BaseModel):
     observed_at: Optional[datetime] = None
 
 
+class SyncFarmBatchRequest(BaseModel):
+    farms: List[SyncFarmRequest] = Field(..., min_length=1)
+
+
+class SyncObservationBatchRequest(BaseModel):
+    observations: List[SyncObservationRequest] = Field(..., min_length=1)
+
+
 class WeatherObservationRequest(BaseModel):
     location_id: str
     lat: float
@@ -75,21 +102,93 @@ class WeatherObservationRequest(BaseModel):
     observed_at: Optional[datetime] = None
 
 
+def _as_utc(observed_at: Optional[datetime]) -> datetime:
+    observed_at = observed_at or datetime.now(timezone.utc)
+    if observed_at.tzinfo is None:
+        return observed_at.replace(tzinfo=timezone.utc)
+    return observed_at.astimezone(timezone.utc)
+
+
+async def _batch_upsert(entities: List[dict]) -> FiwareBatchResponse:
+    if not settings.FIWARE_ENABLED:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="FIWARE integration is disabled"
+        )
+    
+    fiware = get_fiware_client()
+    
+    if not await fiware.health_check():
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="FIWARE Orion is not available"
+        )
+    
+    result = await fiware.batch_upsert(entities)
+    return FiwareBatchResponse(
+        success=result.ok,
+        upserted=result.success,
+        errors=[FiwareBatchError(**error) for error in result.errors]
+    )
+
+
+async def _ndjson_response(entities: AsyncIterator[dict]) -> StreamingResponse:
+    """
+    Stream entities as NDJSON (one entity per line).
+    
+    The first page is fetched before responding so FIWARE errors still map
+    to a proper status code; later errors end the stream early.
+    """
+    try:
+        first = await entities.__anext__()
+    except StopAsyncIteration:
+        first = None
+    except FiwareClientError as e:
+        raise HTTPException(status_code=e.status_code, detail=f"FIWARE error: {e}") from e
+    
+    async def body():
+        if first is None:
+            return
+        yield json.dumps(first, ensure_ascii=False) + "\n"
+        try:
+            async for entity in entities:
+                yield json.dumps(entity, ensure_ascii=False) + "\n"
+        except FiwareClientError as e:
+            logger.error(f"FIWARE stream aborted: {e}")
+    
+    return StreamingResponse(body(), media_type="application/x-ndjson")
+
+
+def _require_fiware_enabled() -> None:
+    if not settings.FIWARE_ENABLED:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="FIWARE integration is disabled"
+        )
+
+
 # ==================== Endpoints ====================
 
 @router.get("/health", response_model=FiwareHealthResponse)
 async def check_fiware_health():
     """
     Check FIWARE Orion Context Broker health status.
+    
+    Served from the shared health state, which the scheduler refreshes in
+    the background; ``circuit_state`` is the state of the circuit breaker
+    guarding Orion requests.
     """
-    fiware = FiwareClient()
+    fiware = get_fiware_client()
     is_available = await fiware.health_check()
     
     return FiwareHealthResponse(
         status="healthy" if is_available else "unavailable",
         orion_url=settings.ORION_URL,
         orion_available=is_available,
-        fiware_enabled=settings.FIWARE_ENABLED
+        fiware_enabled=settings.FIWARE_ENABLED,
+        circuit_state=fiware.breaker.state,
+        consecutive_failures=fiware.breaker.consecutive_failures,
+        last_checked_at=fiware.last_health_check
     )
 
 
@@ -109,7 +208,7 @@ async def create_farm_entity(request: SyncFarmRequest):
             detail="coordinates must include at least 3 points to form a polygon"
         )
     
-    fiware = FiwareClient()
+    fiware = get_fiware_client()
     
     if not await fiware.health_check():
         raise HTTPException(
@@ -155,7 +254,7 @@ async def create_observation_entity(request: SyncObservationRequest):
             detail="FIWARE integration is disabled"
         )
     
-    fiware = FiwareClient()
+    fiware = get_fiware_client()
     
     if not await fiware.health_check():
         raise HTTPException(
@@ -163,11 +262,7 @@ async def create_observation_entity(request: SyncObservationRequest):
             detail="FIWARE Orion is not available"
         )
     
-    observed_at = request.observed_at or datetime.now(timezone.utc)
-    if observed_at.tzinfo is None:
-        observed_at = observed_at.replace(tzinfo=timezone.utc)
-    else:
-        observed_at = observed_at.astimezone(timezone.utc)
+    observed_at = _as_utc(request.observed_at)
     try:
         success = await sync_observation_to_fiware(
             fiware_client=fiware,
@@ -194,6 +289,53 @@ async def create_observation_entity(request: SyncObservationRequest):
         )
 
 
+@router.post("/entities/farms/batch", response_model=FiwareBatchResponse)
+async def create_farm_entities_batch(request: SyncFarmBatchRequest):
+    """
+    Create or update many farm entities (AgriParcel) in FIWARE.
+    
+    Entities are sent through NGSI-LD batch upsert in chunks; failures are
+    reported per entity instead of failing the whole request.
+    """
+    for farm in request.farms:
+        if len(farm.coordinates) < 3:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=f"Farm {farm.farm_id}: coordinates must include at least 3 points to form a polygon"
+            )
+    
+    entities = [
+        create_agriparcel_entity(
+            farm_id=farm.farm_id,
+            name=farm.farm_name,
+            coordinates=[{"lat": c.lat, "lng": c.lng} for c in farm.coordinates],
+            crop_type=farm.crop_type
+        )
+        for farm in request.farms
+    ]
+    return await _batch_upsert(entities)
+
+
+@router.post("/entities/observations/batch", response_model=FiwareBatchResponse)
+async def create_observation_entities_batch(request: SyncObservationBatchRequest):
+    """
+    Create many observation records (AgriParcelRecord) in FIWARE.
+    
+    Entities are sent through NGSI-LD batch upsert in chunks; failures are
+    reported per entity instead of failing the whole request.
+    """
+    entities = [
+        create_agriparcel_record(
+            farm_id=observation.farm_id,
+            record_type=observation.observation_type,
+            value=observation.value,
+            observed_at=_as_utc(observation.observed_at)
+        )
+        for observation in request.observations
+    ]
+    return await _batch_upsert(entities)
+
+
 @router.post("/entities/weather", response_model=FiwareEntityResponse)
 async def create_weather_entity(request: WeatherObservationRequest):
     """
@@ -205,7 +347,7 @@ async def create_weather_entity(request: WeatherObservationRequest):
             detail="FIWARE integration is disabled"
         )
     
-    fiware = FiwareClient()
+    fiware = get_fiware_client()
     
     if not await fiware.health_check():
         raise HTTPException(
@@ -225,7 +367,7 @@ async def create_weather_entity(request: WeatherObservationRequest):
     )
     
     try:
-        success = await fiware.create_entity(entity)
+        success = (await fiware.batch_upsert([entity])).raise_for_errors()
     except FiwareClientError as e:
         raise HTTPException(status_code=e.status_code, detail=f"FIWARE error: {e}") from e
     
@@ -242,6 +384,29 @@ async def create_weather_entity(request: WeatherObservationRequest):
         )
 
 
+@router.get("/entities/stream")
+async def stream_entities(
+    entity_type: str = Query(..., description="Entity type to query (AgriParcel, AgriParcelRecord, WeatherObserved)"),
+    q: Optional[str] = Query(None, description="NGSI-LD query filter")
+):
+    """
+    Stream every matching entity from FIWARE as NDJSON.
+    
+    Unlike ``GET /entities`` there is no result limit; Orion is paged
+    through in the background and entities are sent as they arrive.
+    """
+    _require_fiware_enabled()
+    fiware = get_fiware_client()
+    
+    if not await fiware.health_check():
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="FIWARE Orion is not available"
+        )
+    
+    return await _ndjson_response(fiware.iter_entities(entity_type, q=q))
+
+
 @router.get("/entities/{entity_id}")
 async def get_entity(entity_id: str):
     """
@@ -253,7 +418,7 @@ async def get_entity(entity_id: str):
             detail="FIWARE integration is disabled"
         )
     
-    fiware = FiwareClient()
+    fiware = get_fiware_client()
     
     if not await fiware.health_check():
         raise HTTPException(
@@ -286,7 +451,7 @@ async def delete_entity(entity_id: str):
             detail="FIWARE integration is disabled"
         )
     
-    fiware = FiwareClient()
+    fiware = get_fiware_client()
     
     if not await fiware.health_check():
         raise HTTPException(
@@ -332,7 +497,7 @@ async def query_entities(
             detail="FIWARE integration is disabled"
         )
     
-    fiware = FiwareClient()
+    fiware = get_fiware_client()
     
     if not await fiware.health_check():
         raise HTTPException(
@@ -364,7 +529,7 @@ async def get_farm_entities(farm_id: int):
             detail="FIWARE integration is disabled"
         )
     
-    fiware = FiwareClient()
+    fiware = get_fiware_client()
     
     if not await fiware.health_check():
         raise HTTPException(
@@ -377,12 +542,13 @@ async def get_farm_entities(farm_id: int):
     try:
         farm_entity = await fiware.get_entity(farm_entity_id)
         
-        # Query related observation records
-        observations = await fiware.query_entities(
-            "AgriParcelRecord",
-            q=f'hasAgriParcel=={farm_entity_id}',
-            limit=100
-        )
+        # Query all related observation records
+        observations = [
+            entity async for entity in fiware.iter_entities(
+                "AgriParcelRecord",
+                q=f'hasAgriParcel=={farm_entity_id}'
+            )
+        ]
     except FiwareClientError as e:
         raise HTTPException(status_code=e.status_code, detail=f"FIWARE error: {e}") from e
     
@@ -393,3 +559,33 @@ async def get_farm_entities(farm_id: int):
         "observations": observations,
         "observation_count": len(observations)
     }
+
+
+@router.get("/farms/{farm_id}/entities/stream")
+async def stream_farm_entities(farm_id: int):
+    """
+    Stream a farm's FIWARE entities as NDJSON.
+    
+    The first line is the AgriParcel entity (when it exists), followed by
+    every associated AgriParcelRecord observation, so complete history can
+    be exported without holding it in memory.
+    """
+    _require_fiware_enabled()
+    fiware = get_fiware_client()
+    
+    if not await fiware.health_check():
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="FIWARE Orion is not available"
+        )
+    
+    farm_entity_id = f"urn:ngsi-ld:AgriParcel:OpenAgri:{farm_id}"
+    
+    async def entities():
+        farm_entity = await fiware.get_entity(farm_entity_id)
+        if farm_entity:
+            yield farm_entity
+        async for entity in fiware.iter_entities("AgriParcelRecord", q=f'hasAgriParcel=={farm_entity_id}'):
+            yield entity
+    
+    return await _ndjson_response(entities())
@@ -0,0 +1,36 @@
+# Copyright (c) 2025 CuongKenn and ICTU-OpenAgri Contributors
+# Licensed under the MIT License. See LICENSE file in the project root for full license information.
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from app.application.dto.satellite_history_dto import BulkHistoryRequest, BulkHistoryResponse
+from app.application.use_cases.satellite_history_use_cases import StreamBulkHistoryUseCase
+from app.domain.entities.user import User
+from app.presentation.deps import get_current_user, get_session_factory
+
+router = APIRouter()
+
+
+@router.post(
+    "/history/bulk",
+    response_class=StreamingResponse,
+    responses={200: {"model": BulkHistoryResponse, "description": "Columnar series per farm and data type"}}
+)
+async def get_bulk_history(
+    request: BulkHistoryRequest,
+    current_user: User = Depends(get_current_user),
+    session_factory: async_sessionmaker[AsyncSession] = Depends(get_session_factory)
+):
+    """
+    Get stored NDVI / soil moisture history for several farms in one call.
+
+    Omit ``farm_ids`` for all of the caller's farms. Each series is
+    columnar (``dates`` and ``values`` arrays); farms without observations
+    in the range are left out. Only the caller's own farms are returned.
+    Values that aren't numbers are null; if the database fails mid-stream
+    the document ends with an ``error`` member. Requires authentication.
+    """
+    use_case = StreamBulkHistoryUseCase(session_factory)
+    body = await use_case.execute(current_user.id, request)
+    return StreamingResponse(body, media_type="application/json")
@@ -4,16 +4,30 @@
 """
 Weather API endpoints.
 """
-from typing import Optional
+import asyncio
+from datetime import date
+from typing import List, Literal, Optional, Union
 from fastapi import APIRouter, HTTPException, Query, Path, status, Depends
+from fastapi.responses import JSONResponse
 import logging
 
 from app.application.use_cases.weather_use_cases import (
+    GetAgroIndicesUseCase,
+    GetBatchWeatherForecastUseCase,
+    GetDailyWeatherHistoryUseCase,
     GetWeatherForecastUseCase,
     SearchLocationUseCase,
     ReverseGeocodeUseCase
 )
 from app.application.dto.weather_dto import (
+    AgroIndicesBatchRequestDTO,
+    AgroIndicesBatchResponseDTO,
+    AgroIndicesOptionsDTO,
+    AgroIndicesResponseDTO,
+    BatchForecastRequestDTO,
+    BatchForecastResponseDTO,
+    ColumnarForecastResponseDTO,
+    DailyWeatherHistoryResponseDTO,
     ForecastResponseDTO,
     LocationSearchResponseDTO,
     ReverseGeocodeDTO
@@ -22,8 +36,16 @@ from app.infrastructure.external_services.weather_service import (
     OpenMeteoService,
     PhotonGeocodingService
 )
+from app.infrastructure.cache.forecast_cache import forecast_cache
 from app.domain.entities.user import User
-from app.presentation.deps import get_current_user
+from app.infrastructure.repositories.farm_repository_impl import SQLAlchemyFarmRepository
+from app.infrastructure.repositories.weather_archive_repository_impl import SQLAlchemyWeatherArchiveRepository
+from app.presentation.deps import (
+    get_current_user,
+    get_current_superuser,
+    get_farm_repository,
+    get_weather_archive_repository
+)
 
 logger = logging.getLogger(__name__)
 
@@ -32,7 +54,7 @@ router = APIRouter()
 
 @router.get(
     "/forecast",
-    response_model=ForecastResponseDTO,
+    response_model=Union[ForecastResponseDTO, ColumnarForecastResponseDTO],
     summary="Get weather forecast",
     description="Get weather forecast for a specific location"
 )
@@ -41,8 +63,11 @@ async def get_weather_forecast(
     longitude: float = Query(..., ge=-180, le=180, description="Location longitude"),
     location_name: Optional[str] = Query(None, description="Optional location name"),
     hours_ahead: int = Query(24, ge=1, le=240, description="Number of hours to forecast"),
+    response_format: Literal["rows", "columnar"] = Query(
+        "rows", alias="format", description="Hourly data as one object per hour (rows) or parallel arrays (columnar)"
+    ),
     current_user: User = Depends(get_current_user)
-) -> ForecastResponseDTO:
+):
     """
     Get weather forecast for given coordinates.
     
@@ -50,13 +75,28 @@ async def get_weather_forecast(
     - **longitude**: Location longitude (-180 to 180)
     - **location_name**: Optional custom location name
     - **hours_ahead**: Hours to forecast (1-240, default: 24)
+    - **format**: `rows` (default) or `columnar`
     
     Returns current weather and hourly forecast data from Open-Meteo.
+    The location name is looked up concurrently; if the geocoder is slow
+    or fails, "Unknown" is returned instead of delaying the forecast.
+    
+    With `format=columnar` the hourly data is returned as parallel arrays
+    (`time`, `temperature_2m`, ...) exactly as Open-Meteo sent them, which
+    is cheaper to build and about a quarter of the size on the wire.
     """
     try:
         open_meteo_service = OpenMeteoService()
         photon_service = PhotonGeocodingService()
         use_case = GetWeatherForecastUseCase(open_meteo_service, photon_service)
+        if response_format == "columnar":
+            # Returned as a Response so FastAPI skips response_model validation
+            return JSONResponse(await use_case.execute_columnar(
+                latitude=latitude,
+                longitude=longitude,
+                location_name=location_name,
+                hours_ahead=hours_ahead
+            ))
         return await use_case.execute(
             latitude=latitude,
             longitude=longitude,
@@ -69,6 +109,12 @@ async def get_weather_forecast(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
         )
+    except asyncio.TimeoutError:
+        logger.error("Weather forecast exceeded its deadline")
+        raise HTTPException(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail="Weather provider did not respond in time"
+        )
     except Exception as e:
         logger.error(f"Error fetching forecast: {str(e)}")
         raise HTTPException(
@@ -77,6 +123,190 @@ async def get_weather_forecast(
         )
 
 
+@router.post(
+    "/forecast/batch",
+    response_model=BatchForecastResponseDTO,
+    summary="Get weather forecasts for many locations",
+    description="Get forecasts for several farms and/or coordinates in one call"
+)
+async def get_weather_forecast_batch(
+    request: BatchForecastRequestDTO,
+    current_user: User = Depends(get_current_user),
+    farm_repository: SQLAlchemyFarmRepository = Depends(get_farm_repository)
+) -> BatchForecastResponseDTO:
+    """
+    Get weather forecasts for many farms/locations.
+    
+    - **farm_ids**: Your farm IDs (located by centroid)
+    - **locations**: Extra coordinates, with an optional name
+    - **hours_ahead**: Hours to forecast (1-240, default: 24)
+    
+    Omit both lists to get forecasts for all of your farms. Locations in
+    the same grid cell share one forecast and uncached cells are fetched
+    with multi-location Open-Meteo requests.
+    """
+    try:
+        use_case = GetBatchWeatherForecastUseCase(OpenMeteoService(), farm_repository)
+        return await use_case.execute(current_user.id, request)
+    except ValueError as e:
+        logger.warning(f"Batch forecast validation error: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        logger.error(f"Error fetching batch forecast: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to fetch weather forecasts"
+        )
+
+
+@router.get(
+    "/forecast/cache-stats",
+    summary="Forecast cache statistics",
+    description="Hit/miss counters of the grid-snapped forecast cache (admin only)"
+)
+async def get_forecast_cache_stats(
+    current_user: User = Depends(get_current_superuser)
+) -> dict:
+    """
+    Get forecast cache metrics: entries, fresh and stale hits, misses,
+    failed background refreshes and the overall hit ratio.
+    """
+    return forecast_cache.stats()
+
+
+@router.get(
+    "/agro-indices",
+    response_model=AgroIndicesResponseDTO,
+    summary="Get agro-meteorological indices",
+    description="Daily GDD, FAO-56 ET0, leaf-wetness hours and rolling rainfall for a location"
+)
+async def get_agro_indices(
+    latitude: float = Query(..., ge=-90, le=90, description="Location latitude"),
+    longitude: float = Query(..., ge=-180, le=180, description="Location longitude"),
+    base_temp: float = Query(10.0, ge=-10, le=40, description="GDD base temperature (°C)"),
+    upper_temp: Optional[float] = Query(None, ge=0, le=50, description="GDD upper cutoff (°C)"),
+    wetness_rh: float = Query(90.0, ge=50, le=100, description="Relative humidity (%) counted as leaf wetness"),
+    rain_windows: List[int] = Query([3, 7, 30], description="Rolling rainfall windows (days)"),
+    past_days: int = Query(7, ge=0, description="Days of history to return"),
+    forecast_days: int = Query(7, ge=1, description="Days from today on to return"),
+    current_user: User = Depends(get_current_user)
+) -> AgroIndicesResponseDTO:
+    """
+    Get daily agro-meteorological indices for given coordinates.
+    
+    - **base_temp** / **upper_temp**: Growing degree day thresholds
+    - **wetness_rh**: Humidity at which an hour counts as leaf-wet (rain always does)
+    - **rain_windows**: Rolling rainfall totals to return, e.g. `rain_windows=3&rain_windows=7`
+    - **past_days** / **forecast_days**: Days before today / from today on
+    
+    Indices are computed from Open-Meteo hourly data for the location's
+    grid cell, which is fetched once per cell and day and cached.
+    """
+    try:
+        options = AgroIndicesOptionsDTO(
+            base_temp=base_temp,
+            upper_temp=upper_temp,
+            wetness_rh=wetness_rh,
+            rain_windows=rain_windows,
+            past_days=past_days,
+            forecast_days=forecast_days
+        )
+        use_case = GetAgroIndicesUseCase(OpenMeteoService())
+        return await use_case.execute(latitude, longitude, options)
+    except ValueError as e:
+        logger.warning(f"Agro indices validation error: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        logger.error(f"Error computing agro indices: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to compute agro indices"
+        )
+
+
+@router.post(
+    "/agro-indices/batch",
+    response_model=AgroIndicesBatchResponseDTO,
+    summary="Get agro-meteorological indices for farms",
+    description="Daily GDD, FAO-56 ET0, leaf-wetness hours and rolling rainfall for several farms"
+)
+async def get_agro_indices_batch(
+    request: AgroIndicesBatchRequestDTO,
+    current_user: User = Depends(get_current_user),
+    farm_repository: SQLAlchemyFarmRepository = Depends(get_farm_repository)
+) -> AgroIndicesBatchResponseDTO:
+    """
+    Get agro indices for your farms (located by centroid).
+    
+    Omit **farm_ids** for all of your farms. Takes the same options as
+    `GET /agro-indices`; farms in the same grid cell share one computation.
+    """
+    try:
+        use_case = GetAgroIndicesUseCase(OpenMeteoService(), farm_repository)
+        return await use_case.execute_batch(current_user.id, request)
+    except ValueError as e:
+        logger.warning(f"Agro indices batch validation error: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        logger.error(f"Error computing agro indices batch: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to compute agro indices"
+        )
+
+
+@router.get(
+    "/history/daily",
+    response_model=DailyWeatherHistoryResponseDTO,
+    summary="Get daily weather history",
+    description="Get daily aggregates of historical weather from the local archive"
+)
+async def get_daily_weather_history(
+    latitude: float = Query(..., ge=-90, le=90, description="Location latitude"),
+    longitude: float = Query(..., ge=-180, le=180, description="Location longitude"),
+    start_date: date = Query(..., description="First day (YYYY-MM-DD)"),
+    end_date: date = Query(..., description="Last day (YYYY-MM-DD)"),
+    current_user: User = Depends(get_current_user),
+    archive_repository: SQLAlchemyWeatherArchiveRepository = Depends(get_weather_archive_repository)
+) -> DailyWeatherHistoryResponseDTO:
+    """
+    Get daily weather history for a location.
+    
+    - **latitude**, **longitude**: Location (snapped to the forecast grid cell)
+    - **start_date**, **end_date**: Inclusive range, local days of the cell
+    
+    Returns min/max/mean temperature, precipitation sum, mean humidity,
+    max wind speed and hours with humidity >= 90% per day, aggregated in
+    the database from the hourly archive. Farm cells are kept up to date
+    nightly; other cells are backfilled on first request. Recent days not
+    yet published by the Open-Meteo archive are omitted.
+    """
+    try:
+        use_case = GetDailyWeatherHistoryUseCase(OpenMeteoService(), archive_repository)
+        return await use_case.execute(latitude, longitude, start_date, end_date)
+    except ValueError as e:
+        logger.warning(f"Weather history validation error: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        logger.error(f"Error fetching weather history: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to fetch weather history"
+        )
+
+
 @router.get(
     "/search",
     response_model=LocationSearchResponseDTO,
@@ -94,7 +324,9 @@ async def search_locations(
     - **query**: Search query (city name, address, etc.)
     - **limit**: Maximum results to return (1-50, default: 10)
     
-    Returns list of matching locations with coordinates from Photon API.
+    Returns list of matching locations with coordinates. Vietnamese
+    provinces and cities are matched locally (diacritics optional, e.g.
+    "dong thap"); other queries go to the Photon API.
     """
     try:
         photon_service = PhotonGeocodingService()
@@ -131,7 +363,9 @@ async def get_location_details(
     - **latitude**: Location latitude (-90 to 90)
     - **longitude**: Location longitude (-180 to 180)
     
-    Returns location name, address, country, and other details from Photon API.
+    Returns location name, address, country, and other details. Points in
+    Vietnam are resolved from the bundled gazetteer (province/district);
+    elsewhere the Photon API is used.
     """
     try:
         photon_service = PhotonGeocodingService()
@@ -12,6 +12,7 @@ from app.presentation.api.v1.endpoints import (
     commodity_prices,
     pest,
     soil_data,
+    satellite_history,
 )
 from app.presentation.api import farm_api
 
@@ -24,6 +25,7 @@ api_router.include_router(soil_moisture.router, prefix="/soil-moisture", tags=["
 api_router.include_router(commodity_prices.router, prefix="/commodity-prices", tags=["commodity-prices"])
 api_router.include_router(pest.router, prefix="/pest", tags=["pest"])
 api_router.include_router(soil_data.router, prefix="/soil", tags=["soil-data"])
+api_router.include_router(satellite_history.router, prefix="/satellite", tags=["satellite"])
 
 from app.presentation.api.v1.endpoints import disease_detection
 api_router.include_router(disease_detection.router, prefix="/disease-detection", tags=["disease-detection"])
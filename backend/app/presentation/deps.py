@@ -6,18 +6,24 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt, JWTError
 from pydantic import ValidationError
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from app.infrastructure.config.settings import get_settings
-from app.infrastructure.database.database import get_db
+from app.infrastructure.database.database import AsyncSessionLocal, get_db
 from app.infrastructure.repositories.user_repository_impl import SQLAlchemyUserRepository
 from app.infrastructure.repositories.farm_repository_impl import SQLAlchemyFarmRepository
+from app.infrastructure.repositories.weather_archive_repository_impl import SQLAlchemyWeatherArchiveRepository
+from app.infrastructure.cache.user_cache import get_cached_user, cache_user
 from app.domain.entities.user import User
 
 settings = get_settings()
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/users/login")
 
+def get_session_factory() -> async_sessionmaker[AsyncSession]:
+    """Dependency for work that outlives the request-scoped session (e.g. streaming)."""
+    return AsyncSessionLocal
+
 def get_user_repository(db: AsyncSession = Depends(get_db)) -> SQLAlchemyUserRepository:
     """Dependency to get user repository."""
     return SQLAlchemyUserRepository(db)
@@ -26,12 +32,19 @@ def get_farm_repository(db: AsyncSession = Depends(get_db)) -> SQLAlchemyFarmRep
     """Dependency to get farm repository."""
     return SQLAlchemyFarmRepository(db)
 
+def get_weather_archive_repository(db: AsyncSession = Depends(get_db)) -> SQLAlchemyWeatherArchiveRepository:
+    """Dependency to get weather archive repository."""
+    return SQLAlchemyWeatherArchiveRepository(db)
+
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
     repository: SQLAlchemyUserRepository = Depends(get_user_repository)
 ) -> User:
     """
     Dependency to get the current authenticated user from JWT token.
+    
+    Users are served from an in-process TTL cache when possible, so most
+    requests authenticate without touching the database.
     """
     try:
         payload = jwt.decode(
@@ -51,9 +64,21 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
         
-    user = await repository.get_by_id(int(user_id))
-    if not user:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+    try:
+        user_id_int = int(user_id)
+    except (TypeError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    
+    user = get_cached_user(user_id_int)
+    if user is None:
+        user = await repository.get_by_id(user_id_int)
+        if not user:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+        cache_user(user)
     
     if not user.is_active:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Inactive user")
@@ -16,12 +16,15 @@ from app.infrastructure.external_services.sentinel_client import search_sentinel
 from app.infrastructure.image_processing.soil_moisture_processing import find_s1_band_path, compute_soil_moisture_proxy
 from app.infrastructure.repositories.satellite_repository_impl import SatelliteRepositoryImpl
 from app.domain.entities.farm import Coordinate
+from app.infrastructure.geo.farm_geometry import farm_bbox
 from app.infrastructure.config.settings import get_settings
-from app.infrastructure.external_services.fiware_client import (
-    FiwareClient,
-    sync_farm_to_fiware,
-    sync_observation_to_fiware
-)
+from app.infrastructure.external_services.fiware_client import get_fiware_client
+from app.infrastructure.external_services.fiware_outbox import dispatch_fiware_outbox
+from app.infrastructure.external_services.weather_service import OpenMeteoService
+from app.infrastructure.external_services.gbif_service import seed_species_keys
+from app.infrastructure.repositories.weather_archive_repository_impl import SQLAlchemyWeatherArchiveRepository
+from app.infrastructure.cache.forecast_cache import snap_to_grid
+from app.application.use_cases.weather_use_cases import BackfillWeatherArchiveUseCase, PrefetchWeatherForecastsUseCase
 
 scheduler = AsyncIOScheduler()
 settings = get_settings()
@@ -31,77 +34,14 @@ MAX_RETRIES = 3
 RETRY_DELAY_SECONDS = 60  # Wait 1 minute between retries
 
 
-async def sync_to_fiware_if_enabled(
-    farm,
-    data_type: str,
-    value: float,
-    acquisition_date: datetime.date
-):
-    """
-    Sync observation data to FIWARE if enabled in settings.
-    
-    Args:
-        farm: Farm model instance
-        data_type: Type of data ('ndvi' or 'soilMoisture')
-        value: Measured value
-        acquisition_date: Date of observation
-    """
-    if not settings.FIWARE_ENABLED:
-        return
-    
-    try:
-        fiware = FiwareClient()
-        
-        # Check FIWARE health first
-        if not await fiware.health_check():
-            logger.warning("FIWARE Orion is not available, skipping sync")
-            return
-        
-        # Sync farm entity
-        coords = farm.coordinates if hasattr(farm, 'coordinates') else []
-        await sync_farm_to_fiware(
-            fiware_client=fiware,
-            farm_id=farm.id,
-            farm_name=farm.name,
-            coordinates=coords,
-            crop_type=getattr(farm, 'crop_type', None)
-        )
-        
-        # Sync observation
-        observation_datetime = datetime.datetime.combine(
-            acquisition_date,
-            datetime.time(12, 0, 0)  # Default to noon
-        )
-        await sync_observation_to_fiware(
-            fiware_client=fiware,
-            farm_id=farm.id,
-            observation_type=data_type,
-            value=value,
-            observed_at=observation_datetime
-        )
-        
-        logger.info(f"Synced {data_type} to FIWARE for farm {farm.id}")
-    except Exception as e:
-        logger.warning(f"Failed to sync to FIWARE for farm {farm.id}: {e}")
-
-
-async def sync_farm_with_retry(use_case: CalculateNDVIUseCase, farm_id: int, bbox: list, db, farm=None):
+async def sync_farm_with_retry(use_case: CalculateNDVIUseCase, farm_id: int, bbox: list, db):
     """
     Sync NDVI data for a single farm with retry mechanism.
     """
     for attempt in range(1, MAX_RETRIES + 1):
         try:
-            result = await use_case.sync_latest_data_for_farm(farm_id, bbox, db)
-            
-            # Sync to FIWARE if we have the farm and valid result
-            if farm and result and hasattr(result, 'mean_value'):
-                await sync_to_fiware_if_enabled(
-                    farm=farm,
-                    data_type='ndvi',
-                    value=result.mean_value,
-                    acquisition_date=result.acquisition_date
-                )
-            
+            # Saved observations are queued for FIWARE by the repository (outbox)
+            await use_case.sync_latest_data_for_farm(farm_id, bbox, db)
             return True
         except Exception as e:
             logger.warning(f"Attempt {attempt}/{MAX_RETRIES} failed for farm {farm_id}: {e}")
@@ -112,7 +52,7 @@ async def sync_farm_with_retry(use_case: CalculateNDVIUseCase, farm_id: int, bbo
                 return False
 
 
-async def sync_soil_moisture_for_farm(farm_id: int, bbox: list, db, farm=None):
+async def sync_soil_moisture_for_farm(farm_id: int, bbox: list, db):
     """
     Sync Soil Moisture data for a single farm using Sentinel-1.
     """
@@ -170,18 +110,10 @@ async def sync_soil_moisture_for_farm(farm_id: int, bbox: list, db, farm=None):
                 max_value=1.0,
                 cloud_cover=0.0  # Sentinel-1 is all-weather
             )
+            # Also queues the observation for FIWARE in the same transaction
             await repo.save_data(new_record)
             logger.info(f"Saved Soil Moisture data for farm {farm_id} on {acquisition_date}")
             
-            # Sync to FIWARE
-            if farm:
-                await sync_to_fiware_if_enabled(
-                    farm=farm,
-                    data_type='soilMoisture',
-                    value=mean_val,
-                    acquisition_date=acquisition_date
-                )
-            
             # Cleanup
             import shutil
             try:
@@ -223,18 +155,12 @@ async def update_all_farms_ndvi():
             use_case = CalculateNDVIUseCase()
             
             for farm in farms:
-                # Convert farm coordinates to bbox [minx, miny, maxx, maxy]
-                # Assuming coordinates is a list of dicts or objects
-                coords = farm.coordinates
-                if not coords:
+                # Precomputed bbox [minx, miny, maxx, maxy]
+                bbox = farm_bbox(farm)
+                if not bbox:
                     continue
                 
-                # Simple bbox calculation
-                lats = [c['lat'] for c in coords]
-                lngs = [c['lng'] for c in coords]
-                bbox = [min(lngs), min(lats), max(lngs), max(lats)]
-                
-                success = await sync_farm_with_retry(use_case, farm.id, bbox, db, farm=farm)
+                success = await sync_farm_with_retry(use_case, farm.id, bbox, db)
                 if success:
                     success_count += 1
                 else:
@@ -261,16 +187,12 @@ async def update_all_farms_soil_moisture():
             farms = result.scalars().all()
             
             for farm in farms:
-                coords = farm.coordinates
-                if not coords:
+                # Precomputed bbox [minx, miny, maxx, maxy]
+                bbox = farm_bbox(farm)
+                if not bbox:
                     continue
                 
-                # Simple bbox calculation
-                lats = [c['lat'] for c in coords]
-                lngs = [c['lng'] for c in coords]
-                bbox = [min(lngs), min(lats), max(lngs), max(lats)]
-                
-                success = await sync_soil_moisture_for_farm(farm.id, bbox, db, farm=farm)
+                success = await sync_soil_moisture_for_farm(farm.id, bbox, db)
                 if success:
                     success_count += 1
                 else:
@@ -282,6 +204,92 @@ async def update_all_farms_soil_moisture():
     logger.info(f"Scheduled Soil Moisture update job finished. Success: {success_count}, Failed: {fail_count}")
 
 
+async def backfill_weather_archive():
+    """
+    Scheduled job to fill missing days of the local weather archive for
+    every grid cell that contains a farm.
+    """
+    logger.info("Starting weather archive backfill job...")
+    today = datetime.date.today()
+    start_date = today - datetime.timedelta(days=settings.WEATHER_ARCHIVE_HISTORY_DAYS)
+    end_date = today - datetime.timedelta(days=settings.WEATHER_ARCHIVE_LAG_DAYS)
+    cells = []
+    stored = 0
+    fail_count = 0
+    
+    async with AsyncSessionLocal() as db:
+        try:
+            result = await db.execute(
+                select(FarmModel.centroid_lat, FarmModel.centroid_lng)
+                .where(FarmModel.centroid_lat.isnot(None))
+            )
+            # Farms in the same cell share its archive
+            cells = sorted({snap_to_grid(lat, lng) for lat, lng in result})
+            
+            use_case = BackfillWeatherArchiveUseCase(OpenMeteoService(), SQLAlchemyWeatherArchiveRepository(db))
+            for cell_lat, cell_lng in cells:
+                try:
+                    stored += await use_case.execute(cell_lat, cell_lng, start_date, end_date)
+                except Exception as e:
+                    fail_count += 1
+                    await db.rollback()
+                    logger.warning(f"Weather archive backfill failed for cell ({cell_lat}, {cell_lng}): {e}")
+                
+        except Exception as e:
+            logger.error(f"Error in weather archive backfill job: {e}")
+    
+    logger.info(f"Weather archive backfill finished. Cells: {len(cells)}, hours stored: {stored}, failed: {fail_count}")
+
+
+async def prefetch_weather_forecasts():
+    """
+    Scheduled job to warm the forecast cache for every farm's grid cell
+    before the morning traffic peak.
+    """
+    logger.info("Starting weather forecast prefetch job...")
+    
+    async with AsyncSessionLocal() as db:
+        try:
+            result = await db.execute(
+                select(FarmModel.centroid_lat, FarmModel.centroid_lng)
+                .where(FarmModel.centroid_lat.isnot(None))
+            )
+            points = [(lat, lng) for lat, lng in result]
+        except Exception as e:
+            logger.error(f"Error in weather forecast prefetch job: {e}")
+            return
+    
+    # Upstream calls run after the session is released
+    use_case = PrefetchWeatherForecastsUseCase(OpenMeteoService())
+    cached, fail_count = await use_case.execute(
+        points,
+        hours_ahead=settings.WEATHER_PREFETCH_HOURS_AHEAD,
+        concurrency=settings.WEATHER_PREFETCH_CONCURRENCY,
+        requests_per_minute=settings.WEATHER_PREFETCH_REQUESTS_PER_MINUTE
+    )
+    
+    logger.info(f"Weather forecast prefetch finished. Farms: {len(points)}, cells cached: {cached}, failed: {fail_count}")
+
+
+async def seed_gbif_species_keys():
+    """
+    Scheduled job to keep the GBIF species keys of the known pests cached,
+    so pest risk forecasts only make occurrence requests.
+    """
+    try:
+        resolved = await seed_species_keys()
+        logger.info(f"GBIF species keys cached for {resolved} pests")
+    except Exception as e:
+        logger.error(f"Error in GBIF species key seeding job: {e}")
+
+
+async def refresh_fiware_health():
+    """
+    Scheduled job to probe Orion and update the shared FIWARE health state.
+    """
+    await get_fiware_client().refresh_health()
+
+
 def start_scheduler():
     """
     Start the background scheduler.
@@ -310,5 +318,67 @@ def start_scheduler():
         id='soil_moisture_daily_sync'
     )
     
+    # Weather archive: Run every day at 03:00, fetching only missing days
+    scheduler.add_job(
+        backfill_weather_archive,
+        'cron',
+        hour=3,
+        minute=0,
+        misfire_grace_time=3600,
+        coalesce=True,
+        max_instances=1,
+        id='weather_archive_backfill'
+    )
+    
+    # GBIF species keys: seed on startup, then re-check daily (only expired
+    # or missing names are matched again)
+    scheduler.add_job(
+        seed_gbif_species_keys,
+        'interval',
+        days=1,
+        next_run_time=datetime.datetime.now(),
+        coalesce=True,
+        max_instances=1,
+        id='gbif_species_key_seed'
+    )
+    
+    if settings.WEATHER_PREFETCH_ENABLED:
+        # Weather forecasts: warm every farm's grid cell before and during
+        # the 5-7 am peak, right after each hourly model update
+        scheduler.add_job(
+            prefetch_weather_forecasts,
+            'cron',
+            hour=settings.WEATHER_PREFETCH_HOURS,
+            minute=settings.WEATHER_PREFETCH_MINUTE,
+            timezone=settings.WEATHER_PREFETCH_TIMEZONE,
+            misfire_grace_time=600,
+            coalesce=True,
+            max_instances=1,
+            id='weather_forecast_prefetch'
+        )
+    
+    if settings.FIWARE_ENABLED:
+        # FIWARE health: keep the shared health state/circuit breaker fresh
+        # so request paths never wait on GET /version
+        scheduler.add_job(
+            refresh_fiware_health,
+            'interval',
+            seconds=settings.FIWARE_HEALTH_CHECK_INTERVAL_SECONDS,
+            next_run_time=datetime.datetime.now(),
+            coalesce=True,
+            max_instances=1,
+            id='fiware_health_refresh'
+        )
+        
+        # FIWARE outbox: deliver queued NGSI-LD entities to Orion
+        scheduler.add_job(
+            dispatch_fiware_outbox,
+            'interval',
+            seconds=settings.FIWARE_OUTBOX_DISPATCH_INTERVAL_SECONDS,
+            coalesce=True,
+            max_instances=1,
+            id='fiware_outbox_dispatch'
+        )
+    
     scheduler.start()
-    logger.info("Scheduler started. Jobs: NDVI at 00:00, Soil Moisture at 02:00")
+    logger.info("Scheduler started. Jobs: NDVI at 00:00, Soil Moisture at 02:00, Weather archive at 03:00")
@@ -0,0 +1,115 @@
+# Copyright (c) 2025 CuongKenn and ICTU-OpenAgri Contributors
+# Licensed under the MIT License. See LICENSE file in the project root for full license information.
+
+"""
+Benchmark: row vs columnar /weather/forecast responses.
+
+Serves a synthetic Open-Meteo forecast through GetWeatherForecastUseCase
+from a minimal FastAPI app wired like the real endpoint: the row format
+goes through response_model validation and serialization, the columnar
+format is returned as a JSONResponse. Requests are made in-process over
+ASGI, so the numbers are framework + use case time without network.
+
+Usage (from backend/):
+    python -m benchmarks.bench_forecast_format --requests 500
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from typing import Any, Dict
+
+import httpx
+from fastapi import FastAPI, Query
+from fastapi.responses import JSONResponse
+
+from app.application.dto.weather_dto import ForecastResponseDTO
+from app.application.use_cases.weather_use_cases import GetWeatherForecastUseCase
+
+
+def _synthetic_forecast(hours: int) -> Dict[str, Any]:
+    rng = random.Random(0)
+    return {
+        "current": {
+            "time": "2025-06-01T10:00", "temperature_2m": 31.2, "relative_humidity_2m": 74,
+            "weather_code": 3, "wind_speed_10m": 8.4, "precipitation": 0.0, "is_day": 1,
+        },
+        "hourly": {
+            "time": [f"2025-06-{1 + h // 24:02d}T{h % 24:02d}:00" for h in range(hours)],
+            "temperature_2m": [round(rng.uniform(22, 36), 1) for _ in range(hours)],
+            "relative_humidity_2m": [rng.randint(50, 100) for _ in range(hours)],
+            "weather_code": [rng.choice((0, 1, 2, 3, 61, 80, 95)) for _ in range(hours)],
+            "wind_speed_10m": [round(rng.uniform(0, 25), 1) for _ in range(hours)],
+            "precipitation": [round(rng.uniform(0, 5), 1) for _ in range(hours)],
+            "soil_moisture_0_to_1cm": [round(rng.uniform(0.1, 0.5), 3) for _ in range(hours)],
+        },
+    }
+
+
+class _StaticOpenMeteo:
+    def __init__(self, forecast: Dict[str, Any]):
+        self.forecast = forecast
+
+    async def get_forecast(self, latitude: float, longitude: float, hours_ahead: int = 24) -> Dict[str, Any]:
+        return self.forecast
+
+
+def _build_app() -> FastAPI:
+    app = FastAPI()
+    use_case = GetWeatherForecastUseCase(_StaticOpenMeteo(_synthetic_forecast(240)), photon_service=None)
+
+    @app.get("/rows", response_model=ForecastResponseDTO)
+    async def rows(hours_ahead: int = Query(24)):
+        return await use_case.execute(21.59, 105.84, location_name="Benchmark", hours_ahead=hours_ahead)
+
+    @app.get("/columnar")
+    async def columnar(hours_ahead: int = Query(24)):
+        return JSONResponse(await use_case.execute_columnar(
+            21.59, 105.84, location_name="Benchmark", hours_ahead=hours_ahead
+        ))
+
+    return app
+
+
+async def _measure(client: httpx.AsyncClient, path: str, hours: int, requests: int) -> dict:
+    durations = []
+    size = 0
+    for _ in range(requests):
+        started = time.perf_counter()
+        response = await client.get(path, params={"hours_ahead": hours})
+        durations.append(time.perf_counter() - started)
+        size = len(response.content)
+    durations.sort()
+    return {
+        "p50_ms": statistics.median(durations) * 1000,
+        "p95_ms": durations[int(len(durations) * 0.95) - 1] * 1000,
+        "bytes": size,
+    }
+
+
+async def main(requests: int) -> None:
+    transport = httpx.ASGITransport(app=_build_app())
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        print(f"{requests} sequential requests per case")
+        for hours in (24, 240):
+            results = {}
+            for label in ("rows", "columnar"):
+                await _measure(client, f"/{label}", hours, 20)  # warm up
+                results[label] = await _measure(client, f"/{label}", hours, requests)
+                result = results[label]
+                print(
+                    f"hours={hours:<4} {label:<9} p50={result['p50_ms']:.2f}ms "
+                    f"p95={result['p95_ms']:.2f}ms size={result['bytes']}B"
+                )
+            print(
+                f"hours={hours:<4} columnar is {results['rows']['p50_ms'] / results['columnar']['p50_ms']:.1f}x "
+                f"faster, {results['columnar']['bytes'] / results['rows']['bytes']:.0%} of the row payload"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=500)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests))
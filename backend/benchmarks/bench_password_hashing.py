@@ -0,0 +1,86 @@
+# Copyright (c) 2025 CuongKenn and ICTU-OpenAgri Contributors
+# Licensed under the MIT License. See LICENSE file in the project root for full license information.
+
+"""
+Benchmark: event-loop lag during a burst of concurrent logins.
+
+Compares verifying bcrypt hashes inline (the old behaviour of
+LoginUserUseCase) against the thread-pool backed PasswordHasher. While the
+logins run, a probe task sleeps in short intervals and records how late it
+wakes up; that delay is the time every other request would be stalled.
+
+Usage (from backend/):
+    python -m benchmarks.bench_password_hashing --logins 100 --rounds 12
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Awaitable, Callable, List
+
+from passlib.context import CryptContext
+
+from app.infrastructure.security.jwt import verify_password
+from app.infrastructure.security.password_hasher import PasswordHasher
+
+PROBE_INTERVAL = 0.01
+
+
+async def _probe_loop_lag(stop: asyncio.Event, lags: List[float]) -> None:
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(PROBE_INTERVAL)
+        lags.append(time.perf_counter() - start - PROBE_INTERVAL)
+
+
+async def _run_burst(logins: int, verify: Callable[[], Awaitable[bool]]) -> dict:
+    stop = asyncio.Event()
+    lags: List[float] = []
+    probe = asyncio.create_task(_probe_loop_lag(stop, lags))
+    await asyncio.sleep(0)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(verify() for _ in range(logins)))
+    elapsed = time.perf_counter() - started
+
+    stop.set()
+    await probe
+    lags = lags or [0.0]
+    return {
+        "total_s": elapsed,
+        "max_lag_ms": max(lags) * 1000,
+        "p50_lag_ms": statistics.median(lags) * 1000,
+        "probe_ticks": len(lags),
+    }
+
+
+async def main(logins: int, rounds: int, workers: int) -> None:
+    # The cost is stored in the hash, so the app's context verifies at `rounds`
+    hashed = CryptContext(schemes=["bcrypt"], bcrypt__rounds=rounds).hash("benchmark-password")
+
+    async def inline_verify() -> bool:
+        return verify_password("benchmark-password", hashed)
+
+    hasher = PasswordHasher(max_workers=workers)
+
+    async def pooled_verify() -> bool:
+        return await hasher.verify("benchmark-password", hashed)
+
+    print(f"{logins} concurrent logins, bcrypt cost {rounds}, pool size {workers}")
+    for label, verify in (("inline (before)", inline_verify), ("thread pool (after)", pooled_verify)):
+        result = await _run_burst(logins, verify)
+        print(
+            f"{label:<20} total={result['total_s']:.2f}s "
+            f"max_lag={result['max_lag_ms']:.1f}ms p50_lag={result['p50_lag_ms']:.1f}ms "
+            f"probe_ticks={result['probe_ticks']}"
+        )
+    hasher.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=100)
+    parser.add_argument("--rounds", type=int, default=12)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+    asyncio.run(main(args.logins, args.rounds, args.workers))
@@ -0,0 +1,36 @@
+"""
+Shared fixtures: an in-memory SQLite database with every model's table, and
+a stand-in for upstream HTTP APIs.
+"""
+import httpx
+import pytest
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+
+from app.infrastructure.database.database import Base
+from app.infrastructure.database import models  # noqa: F401
+
+
+@pytest_asyncio.fixture
+async def engine():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield engine
+    await engine.dispose()
+
+
+@pytest_asyncio.fixture
+async def session_factory(engine):
+    return async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+
+@pytest.fixture
+def mock_httpx(monkeypatch):
+    """Call with a handler to answer every ``httpx.AsyncClient`` request through it."""
+    real_client = httpx.AsyncClient
+
+    def route(handler):
+        monkeypatch.setattr(httpx, "AsyncClient", lambda **kw: real_client(transport=httpx.MockTransport(handler)))
+
+    return route
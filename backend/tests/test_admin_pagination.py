@@ -0,0 +1,104 @@
+"""
+Tests for keyset pagination and indexed search in the admin user list.
+"""
+from datetime import datetime
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import event, text
+
+from app.application.use_cases.admin_user_use_cases import ListUsersUseCase
+from app.infrastructure.cache.count_cache import admin_count_cache
+from app.infrastructure.database.models.user_model import UserModel
+from app.infrastructure.database.pagination import encode_cursor
+from app.infrastructure.database.search_index import setup_search_index, search_index_enabled
+from app.infrastructure.repositories.user_repository_impl import SQLAlchemyUserRepository
+
+
+@pytest_asyncio.fixture
+async def session(engine, session_factory):
+    async with engine.begin() as conn:
+        await conn.run_sync(setup_search_index)
+    async with session_factory() as db:
+        # Several users share a timestamp so the id tie-breaker is exercised
+        created_at = datetime(2025, 1, 1)
+        db.add_all([
+            UserModel(
+                email=f"user{i}@example.com",
+                username=f"user{i}",
+                full_name="Nguyễn Văn An" if i == 3 else f"Farmer {i}",
+                hashed_password="x",
+                created_at=created_at if i < 4 else datetime(2025, 1, i),
+            )
+            for i in range(1, 8)
+        ])
+        await db.commit()
+        admin_count_cache.clear()
+        yield db
+    admin_count_cache.clear()
+
+
+@pytest.mark.asyncio
+async def test_cursor_pages_cover_every_user_once(session):
+    """Following next_cursor walks all users newest first without repeats."""
+    use_case = ListUsersUseCase(SQLAlchemyUserRepository(session))
+
+    seen = []
+    cursor = None
+    while True:
+        page = await use_case.execute(page_size=3, cursor=cursor)
+        assert page.total == 7
+        seen.extend(user.username for user in page.users)
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+
+    assert seen == ["user7", "user6", "user5", "user4", "user3", "user2", "user1"]
+
+    with pytest.raises(ValueError):
+        await use_case.execute(cursor="not-a-cursor")
+    # Well-formed JSON with the wrong types is just as invalid
+    with pytest.raises(ValueError):
+        await use_case.execute(cursor=encode_cursor("2025-01-01", []))
+
+
+@pytest.mark.asyncio
+async def test_search_uses_full_text_index(session):
+    """Substring search matches email, username and full name."""
+    assert await search_index_enabled(session)
+    use_case = ListUsersUseCase(SQLAlchemyUserRepository(session))
+
+    by_name = await use_case.execute(search="văn an")
+    assert [user.username for user in by_name.users] == ["user3"]
+
+    by_email = await use_case.execute(search="user5@exa")
+    assert [user.username for user in by_email.users] == ["user5"]
+
+    # Shorter than a trigram: falls back to ILIKE
+    short = await use_case.execute(search="r7")
+    assert [user.username for user in short.users] == ["user7"]
+
+
+@pytest.mark.asyncio
+async def test_index_is_only_rebuilt_when_out_of_sync(engine, session):
+    statements = []
+    event.listen(engine.sync_engine, "before_cursor_execute",
+                 lambda conn, cursor, statement, *args: statements.append(statement))
+    use_case = ListUsersUseCase(SQLAlchemyUserRepository(session))
+
+    # Restart with the index in sync: no rebuild
+    async with engine.begin() as conn:
+        await conn.run_sync(setup_search_index)
+    assert not [s for s in statements if "rebuild" in s]
+
+    # Entries lost (e.g. users written while the triggers were missing)
+    async with engine.begin() as conn:
+        await conn.execute(text("INSERT INTO users_fts(users_fts) VALUES ('delete-all')"))
+    admin_count_cache.clear()
+    assert (await use_case.execute(search="user5@exa")).users == []
+
+    async with engine.begin() as conn:
+        await conn.run_sync(setup_search_index)
+    assert [s for s in statements if "rebuild" in s]
+    admin_count_cache.clear()
+    assert [user.username for user in (await use_case.execute(search="user5@exa")).users] == ["user5"]
@@ -0,0 +1,58 @@
+"""
+Tests for cached admin dashboard statistics.
+"""
+import pytest
+import pytest_asyncio
+
+from app.infrastructure.cache.admin_stats import (
+    admin_stats_cache,
+    get_admin_stats,
+    invalidate_admin_stats,
+    record_farm_created,
+    record_user_status_changed,
+)
+from app.infrastructure.database.models.farm_model import FarmModel
+from app.infrastructure.database.models.user_model import UserModel
+
+
+@pytest_asyncio.fixture
+async def session(session_factory):
+    async with session_factory() as db:
+        db.add_all([
+            UserModel(id=1, email="a@example.com", username="a", hashed_password="x", is_superuser=True),
+            UserModel(id=2, email="b@example.com", username="b", hashed_password="x"),
+            UserModel(id=3, email="c@example.com", username="c", hashed_password="x", is_active=False),
+            FarmModel(name="f1", coordinates=[], crop_type="Lúa", user_id=2),
+            FarmModel(name="f2", coordinates=[], crop_type="Lúa", user_id=2),
+            FarmModel(name="f3", coordinates=[], user_id=3),
+        ])
+        await db.commit()
+        admin_stats_cache.clear()
+        yield db
+    admin_stats_cache.clear()
+
+
+@pytest.mark.asyncio
+async def test_admin_stats_single_query_and_incremental_updates(session):
+    """Counters come from one query and later changes are applied to the cached snapshot."""
+    stats = await get_admin_stats(session)
+    assert (stats.total_users, stats.active_users, stats.inactive_users, stats.superusers) == (3, 2, 1, 1)
+    assert sorted(stats.crop_distribution(), key=lambda c: c["crop_type"]) == [
+        {"crop_type": "Chưa xác định", "count": 1},
+        {"crop_type": "Lúa", "count": 2},
+    ]
+
+    # Cached: a new row isn't seen until it is recorded or the cache is dropped
+    session.add(FarmModel(name="f4", coordinates=[], crop_type="Ngô", user_id=1))
+    await session.commit()
+    record_farm_created("Ngô")
+    record_user_status_changed(was_active=False, is_active=True)
+
+    stats = await get_admin_stats(session)
+    assert stats.active_users == 3
+    assert {c["crop_type"]: c["count"] for c in stats.crop_distribution()}["Ngô"] == 1
+
+    invalidate_admin_stats()
+    stats = await get_admin_stats(session)
+    assert stats.active_users == 2
+    assert {c["crop_type"]: c["count"] for c in stats.crop_distribution()}["Ngô"] == 1
@@ -0,0 +1,115 @@
+"""
+Tests for the agro-meteorological indices.
+"""
+import datetime
+
+import numpy as np
+import pytest
+
+from app.application.dto.weather_dto import AgroIndicesOptionsDTO
+from app.application.use_cases import weather_use_cases
+from app.application.use_cases.weather_use_cases import GetAgroIndicesUseCase
+from app.infrastructure.agronomy.agro_indices import compute_agro_indices, et0_hourly, local_date
+
+# 10 m wind (km/h) equivalent to u2 = 1 m/s
+U10_PER_U2 = 3.6 / (4.87 / np.log(67.8 * 10 - 5.42))
+
+
+def test_et0_matches_fao56_example_19():
+    """FAO-56 example 19 (N'Diaye, Senegal): 0.63 mm at 14-15 h, ~0 mm at 02-03 h."""
+    et0 = et0_hourly(
+        temperature=np.array([38.0, 28.0]),
+        relative_humidity=np.array([52.0, 90.0]),
+        wind_speed_10m=np.array([3.3, 1.9]) * U10_PER_U2,
+        shortwave_radiation=np.array([2.450, 0.0]) / 0.0036,
+        terrestrial_radiation=np.array([3.543, 0.0]) / 0.0036,
+        elevation=8.0
+    )
+    assert et0[0] == pytest.approx(0.63, abs=0.01)
+    assert et0[1] == pytest.approx(0.0, abs=0.01)
+
+
+# Far from UTC, so the cell's local day often differs from the server's
+UTC_OFFSET = 14 * 3600
+
+
+def test_local_date_follows_utc_offset():
+    now = datetime.datetime(2025, 6, 1, 20, 0, tzinfo=datetime.timezone.utc)
+    assert local_date(7 * 3600, now) == datetime.date(2025, 6, 2)
+    assert local_date(0, now) == datetime.date(2025, 6, 1)
+    assert local_date(-5 * 3600, now.replace(hour=2)) == datetime.date(2025, 5, 31)
+
+
+def _weather(days, start=datetime.date(2025, 6, 1)):
+    hourly = {"time": [], "temperature_2m": [], "relative_humidity_2m": [], "precipitation": []}
+    for d in range(days):
+        day = start + datetime.timedelta(days=d)
+        for hour in range(24):
+            hourly["time"].append(f"{day.isoformat()}T{hour:02d}:00")
+            hourly["temperature_2m"].append(20.0 + hour / 23 * 14)  # 20..34 °C
+            hourly["relative_humidity_2m"].append(95.0 if hour < 5 else 60.0)
+            hourly["precipitation"].append(1.0 if hour == 12 else 0.0)
+    return {"elevation": 10.0, "utc_offset_seconds": UTC_OFFSET, "hourly": hourly}
+
+
+def test_daily_indices():
+    indices = compute_agro_indices(_weather(3), base_temp=10.0, upper_temp=30.0, rain_windows=(2,))
+
+    assert indices["date"] == ["2025-06-01", "2025-06-02", "2025-06-03"]
+    # (min(34, 30) + 20) / 2 - 10
+    assert indices["gdd"].tolist() == pytest.approx([15.0, 15.0, 15.0])
+    # 5 humid hours + 1 rainy hour
+    assert indices["leaf_wetness_hours"].tolist() == [6, 6, 6]
+    assert np.isnan(indices["rain_2d"][0])
+    assert indices["rain_2d"][1:].tolist() == [2.0, 2.0]
+
+
+def test_et0_is_missing_for_days_with_missing_hours():
+    weather = _weather(2)
+    hourly = weather["hourly"]
+    hourly["wind_speed_10m"] = [5.0] * 48
+    hourly["terrestrial_radiation"] = [max(0.0, 800 - abs(hour % 24 - 12) * 130) for hour in range(48)]
+    hourly["shortwave_radiation"] = [0.6 * value for value in hourly["terrestrial_radiation"]]
+    # No radiation for 13:00 on the 2nd day
+    hourly["shortwave_radiation"][24 + 13] = None
+
+    et0 = compute_agro_indices(weather)["et0"]
+    assert et0[0] > 0
+    assert np.isnan(et0[1])
+
+    hourly["shortwave_radiation"][24 + 13] = 0.0
+    hourly["temperature_2m"][3] = None
+    et0 = compute_agro_indices(weather)["et0"]
+    assert np.isnan(et0[0]) and et0[1] > 0
+
+
+class FakeOpenMeteo:
+    def __init__(self):
+        self.points = []
+
+    async def get_agro_hourly(self, points):
+        self.points.append(points)
+        start = local_date(UTC_OFFSET) - datetime.timedelta(days=2)
+        return [_weather(5, start=start) for _ in points]
+
+
+class FakeFarmRepository:
+    async def get_centroids(self, user_id, farm_ids=None):
+        return [(1, "a", 21.5901, 105.8401), (2, "b", 21.5902, 105.8402), (3, "c", 10.03, 105.78)]
+
+
+@pytest.mark.asyncio
+async def test_batch_shares_cells_and_validates(monkeypatch):
+    monkeypatch.setattr(weather_use_cases.settings, "WEATHER_AGRO_PAST_DAYS", 2)
+    use_case = GetAgroIndicesUseCase(FakeOpenMeteo(), FakeFarmRepository())
+
+    request = weather_use_cases.AgroIndicesBatchRequestDTO(past_days=1, forecast_days=2, rain_windows=[1])
+    result = await use_case.execute_batch(1, request)
+    assert [item.farm_id for item in result.results] == [1, 2, 3]
+    assert result.results[0].days == result.results[1].days
+    first = result.results[0].days
+    assert [day.is_forecast for day in first] == [False, True, True]
+    assert first[-1].gdd_cumulative == pytest.approx(3 * first[0].gdd)
+
+    with pytest.raises(ValueError):
+        await use_case.execute(21.59, 105.84, AgroIndicesOptionsDTO(past_days=5))
@@ -0,0 +1,161 @@
+"""
+Tests for derived farm geometry and spatial queries.
+"""
+import httpx
+import pytest
+import pytest_asyncio
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.domain.entities.farm import FarmArea, Coordinate, PackedCoordinates
+from app.domain.entities.user import User
+from app.infrastructure.database.database import Base
+from app.infrastructure.database.models.farm_model import FarmModel
+from app.infrastructure.database.models.user_model import UserModel
+from app.infrastructure.database.spatial_index import setup_spatial_index, spatial_index_enabled
+from app.infrastructure.geo.farm_geometry import compute_farm_geometry, mgrs_tile_id
+from app.infrastructure.repositories.farm_repository_impl import SQLAlchemyFarmRepository
+from app.main import app
+from app.presentation.deps import get_current_superuser, get_farm_repository
+
+
+def square(lat: float, lng: float, size: float = 0.001):
+    return [
+        Coordinate(lat=lat, lng=lng),
+        Coordinate(lat=lat, lng=lng + size),
+        Coordinate(lat=lat + size, lng=lng + size),
+        Coordinate(lat=lat + size, lng=lng),
+    ]
+
+
+@pytest_asyncio.fixture
+async def session(engine, session_factory):
+    async with engine.begin() as conn:
+        await conn.run_sync(setup_spatial_index)
+    async with session_factory() as db:
+        db.add(UserModel(id=1, email="a@example.com", username="a", hashed_password="x"))
+        await db.commit()
+        yield db
+
+
+def test_compute_farm_geometry():
+    """Bbox, centroid, area and MGRS tile are derived from the polygon."""
+    geometry = compute_farm_geometry(square(21.0, 105.0))
+
+    assert geometry["min_lat"] == 21.0
+    assert geometry["max_lng"] == pytest.approx(105.001)
+    assert geometry["centroid_lat"] == pytest.approx(21.0005)
+    assert geometry["centroid_lng"] == pytest.approx(105.0005)
+    # ~104 m x ~111 m
+    assert 11000 < geometry["geodesic_area_m2"] < 12000
+    assert geometry["mgrs_tile"] == "48QWJ"
+
+
+def test_mgrs_tile_matches_sentinel2_grid():
+    """Known Sentinel-2 tiles."""
+    assert mgrs_tile_id(21.0285, 105.8542) == "48QWJ"  # Hanoi
+    assert mgrs_tile_id(40.7, -74.0) == "18TWL"  # New York
+
+
+@pytest.mark.asyncio
+async def test_viewport_and_radius_queries(session):
+    """Only farms intersecting the viewport / circle are returned."""
+    repository = SQLAlchemyFarmRepository(session)
+    hanoi = await repository.save(FarmArea(name="Hanoi", coordinates=square(21.02, 105.85), user_id=1))
+    await repository.save(FarmArea(name="Saigon", coordinates=square(10.77, 106.70), user_id=1))
+
+    assert await spatial_index_enabled(session)
+
+    in_view = await repository.find_in_viewport(20.5, 105.5, 21.5, 106.0)
+    assert [f.id for f in in_view] == [hanoi.id]
+
+    nearby = await repository.find_within_radius(21.03, 105.86, radius_km=5)
+    assert [f.id for f in nearby] == [hanoi.id]
+
+    assert await repository.find_within_radius(16.0, 108.0, radius_km=5) == []
+
+    moved = await repository.update(hanoi.id, 1, coordinates=square(10.78, 106.71))
+    assert moved is not None
+    assert await repository.find_in_viewport(20.5, 105.5, 21.5, 106.0) == []
+
+
+@pytest.mark.asyncio
+async def test_coordinates_round_trip_through_packed_buffer(session):
+    """Coordinates are read back from the packed column and serialize as dicts."""
+    repository = SQLAlchemyFarmRepository(session)
+    polygon = square(21.02, 105.85)
+    saved = await repository.save(FarmArea(name="Hanoi", coordinates=polygon, user_id=1))
+
+    farm = await repository.get_by_id(saved.id)
+    assert isinstance(farm.coordinates, PackedCoordinates)
+    assert len(farm.coordinates) == 4
+    assert farm.coordinates[2] == polygon[2]
+    assert farm.model_dump()["coordinates"] == [c.model_dump() for c in polygon]
+
+    [location] = await repository.get_all_locations()
+    assert location["coordinates"] == farm.coordinates
+
+
+@pytest.mark.asyncio
+async def test_rows_without_packed_coordinates_fall_back_to_json(session):
+    """Rows written without the packed copy are read from the JSON column and repacked on update."""
+    polygon = square(21.02, 105.85)
+    session.add(FarmModel(id=7, name="legacy", user_id=1, coordinates=[c.model_dump() for c in polygon]))
+    await session.commit()
+    session.expunge_all()
+    repository = SQLAlchemyFarmRepository(session)
+
+    farm = await repository.get_by_id(7)
+    assert list(farm.coordinates) == polygon
+    [location] = await repository.get_all_locations()
+    assert list(location["coordinates"]) == polygon
+
+    updated = await repository.update(7, user_id=1, name="renamed")
+    assert list(updated.coordinates) == polygon
+    row = await session.get(FarmModel, 7)
+    assert row.coordinates_packed == PackedCoordinates.from_coordinates(polygon).to_bytes()
+
+
+@pytest.mark.asyncio
+async def test_index_flag_belongs_to_each_engine(session):
+    """Another database in the same process doesn't inherit the R-tree flag."""
+    assert await spatial_index_enabled(session)
+
+    other = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with other.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with async_sessionmaker(other, class_=AsyncSession, expire_on_commit=False)() as db:
+        db.add(UserModel(id=1, email="a@example.com", username="a", hashed_password="x"))
+        await db.commit()
+        assert not await spatial_index_enabled(db)
+        # Queries fall back to the bbox columns
+        repository = SQLAlchemyFarmRepository(db)
+        hanoi = await repository.save(FarmArea(name="Hanoi", coordinates=square(21.02, 105.85), user_id=1))
+        assert [f.id for f in await repository.find_in_viewport(20.5, 105.5, 21.5, 106.0)] == [hanoi.id]
+    await other.dispose()
+
+    # A database that already has the table is detected without running the setup
+    existing = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with existing.begin() as conn:
+        await conn.execute(text("CREATE VIRTUAL TABLE farms_rtree USING rtree(id, min_lat, max_lat, min_lng, max_lng)"))
+    async with async_sessionmaker(existing, class_=AsyncSession)() as db:
+        assert await spatial_index_enabled(db)
+    await existing.dispose()
+
+
+@pytest.mark.asyncio
+async def test_inverted_viewport_is_rejected(session):
+    app.dependency_overrides[get_current_superuser] = lambda: User(
+        id=1, email="a@example.com", username="a", hashed_password="x", is_superuser=True
+    )
+    app.dependency_overrides[get_farm_repository] = lambda: SQLAlchemyFarmRepository(session)
+    try:
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            url = "/api/v1/admin/farms/locations"
+            ok = await client.get(url, params={"min_lat": 20.5, "min_lng": 105.5, "max_lat": 21.5, "max_lng": 106.0})
+            assert ok.status_code == 200
+            for bounds in ((21.5, 105.5, 20.5, 106.0), (20.5, 106.0, 21.5, 105.5)):
+                params = dict(zip(("min_lat", "min_lng", "max_lat", "max_lng"), bounds))
+                assert (await client.get(url, params=params)).status_code == 400
+    finally:
+        app.dependency_overrides.clear()
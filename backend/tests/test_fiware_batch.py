@@ -0,0 +1,126 @@
+"""
+Tests for batching, paging and the circuit breaker in the FIWARE client.
+"""
+import json
+
+import httpx
+import pytest
+
+from app.infrastructure.external_services.fiware_client import FiwareClient, chunk_entities
+
+
+def _entity(i: int) -> dict:
+    return {"id": f"urn:ngsi-ld:AgriParcel:OpenAgri:{i}", "type": "AgriParcel"}
+
+
+def test_chunk_entities_respects_count_and_size():
+    entities = [_entity(i) for i in range(5)]
+    assert [len(c) for c in chunk_entities(entities, max_entities=2, max_bytes=10_000)] == [2, 2, 1]
+
+    one = len(json.dumps(_entity(0), separators=(",", ":")))
+    assert [len(c) for c in chunk_entities(entities, max_entities=100, max_bytes=2 * one + 4)] == [2, 2, 1]
+
+
+@pytest.mark.asyncio
+async def test_batch_upsert_reports_partial_failures(monkeypatch):
+    from app.infrastructure.external_services import fiware_client
+
+    monkeypatch.setattr(fiware_client.settings, "FIWARE_BATCH_MAX_ENTITIES", 2)
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        requests.append((request.url.path, request.url.params.get("options"), body))
+        if any(e["id"].endswith(":3") for e in body):
+            return httpx.Response(207, json={
+                "success": [e["id"] for e in body if not e["id"].endswith(":3")],
+                "errors": [{"entityId": _entity(3)["id"], "error": {"status": 400, "title": "Bad Request"}}],
+            })
+        return httpx.Response(201 if len(requests) == 1 else 204)
+
+    client = FiwareClient("http://orion", http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+    result = await client.batch_upsert([_entity(i) for i in range(5)])
+    await client.aclose()
+
+    assert [(path, options, len(body)) for path, options, body in requests] == [
+        ("/ngsi-ld/v1/entityOperations/upsert", "update", 2),
+        ("/ngsi-ld/v1/entityOperations/upsert", "update", 2),
+        ("/ngsi-ld/v1/entityOperations/upsert", "update", 1),
+    ]
+    assert not result.ok
+    assert len(result.success) == 4
+    assert result.errors == [{"entity_id": _entity(3)["id"], "status_code": 400, "message": "Bad Request"}]
+
+
+def test_circuit_breaker_transitions():
+    from app.infrastructure.external_services.circuit_breaker import CircuitBreaker, CLOSED, HALF_OPEN, OPEN
+
+    now = [0.0]
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10, clock=lambda: now[0])
+    breaker.record_failure()
+    assert breaker.state == CLOSED and breaker.allow_request()
+    breaker.record_failure()
+    assert breaker.state == OPEN and not breaker.allow_request()
+
+    now[0] = 10
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow_request()
+    assert not breaker.allow_request()  # one trial call at a time
+    # Reading the state doesn't change it or free the trial slot
+    assert breaker.state == HALF_OPEN and not breaker.allow_request()
+    breaker.record_failure()
+    assert breaker.state == OPEN
+
+    now[0] = 20
+    assert breaker.state == breaker.state == HALF_OPEN
+    assert breaker._state == OPEN
+    assert breaker.allow_request()
+    breaker.record_success()
+    assert breaker.state == CLOSED and breaker.consecutive_failures == 0
+
+
+@pytest.mark.asyncio
+async def test_health_is_cached_and_open_circuit_fails_fast():
+    from app.infrastructure.external_services.fiware_client import FiwareClientError
+
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        return httpx.Response(503)
+
+    client = FiwareClient("http://orion", http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+    assert not await client.health_check()
+    assert not await client.health_check()
+    assert calls == ["/version"]
+
+    # A failed probe opens the circuit: requests fail without hitting Orion
+    with pytest.raises(FiwareClientError) as exc:
+        await client.get_entity("urn:x")
+    assert exc.value.status_code == 503
+    result = await client.batch_upsert([_entity(1)])
+    assert result.errors[0]["status_code"] == 503
+    assert calls == ["/version"]
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_iter_entities_pages_until_total():
+    offsets = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        offset = int(request.url.params["offset"])
+        limit = int(request.url.params["limit"])
+        offsets.append(offset)
+        page = [_entity(i) for i in range(offset, min(offset + limit, 5))]
+        headers = {"NGSILD-Results-Count": "5"} if request.url.params.get("count") == "true" else {}
+        return httpx.Response(200, json=page, headers=headers)
+
+    client = FiwareClient("http://orion", http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+    entities = [e async for e in client.iter_entities("AgriParcel", page_size=2)]
+    assert [e["id"] for e in entities] == [_entity(i)["id"] for i in range(5)]
+    assert offsets == [0, 2, 4]
+
+    offsets.clear()
+    assert len(await client.query_entities("AgriParcel", limit=3)) == 3
+    await client.aclose()
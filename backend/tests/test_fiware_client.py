@@ -0,0 +1,74 @@
+"""
+Tests for the pooled HTTP client behind the app-wide FiwareClient.
+"""
+import httpx
+import pytest
+
+from app.infrastructure.external_services import fiware_client
+from app.infrastructure.external_services.fiware_client import close_fiware_client, get_fiware_client
+
+
+@pytest.fixture
+def pools(monkeypatch):
+    """Every pooled client built, answering 200 to any request."""
+    built = []
+
+    def create():
+        client = httpx.AsyncClient(transport=httpx.MockTransport(lambda request: httpx.Response(200, json={})))
+        built.append(client)
+        return client
+
+    monkeypatch.setattr(fiware_client, "_create_http_client", create)
+    monkeypatch.setattr(fiware_client, "_shared_client", None)
+    return built
+
+
+@pytest.mark.asyncio
+async def test_shared_client_reuses_one_pool(pools):
+    fiware = get_fiware_client()
+    assert get_fiware_client() is fiware
+
+    await fiware.get_entity("urn:ngsi-ld:AgriParcel:OpenAgri:1")
+    await fiware.refresh_health()
+    await get_fiware_client().get_entity("urn:ngsi-ld:AgriParcel:OpenAgri:2")
+    assert len(pools) == 1 and fiware.http is pools[0]
+    await close_fiware_client()
+
+
+@pytest.mark.asyncio
+async def test_close_releases_the_pool_and_next_client_is_fresh(pools):
+    fiware = get_fiware_client()
+    await fiware.get_entity("urn:ngsi-ld:AgriParcel:OpenAgri:1")
+
+    await close_fiware_client()
+    assert pools[0].is_closed
+    assert fiware_client._shared_client is None
+    await close_fiware_client()  # nothing left to close
+
+    fresh = get_fiware_client()
+    assert fresh is not fiware
+    await fresh.get_entity("urn:ngsi-ld:AgriParcel:OpenAgri:1")
+    assert len(pools) == 2 and fresh.http is pools[1] and not pools[1].is_closed
+    await close_fiware_client()
+    assert pools[1].is_closed
+
+
+@pytest.mark.asyncio
+async def test_pool_is_rebuilt_after_aclose(pools):
+    fiware = get_fiware_client()
+    first = fiware.http
+    await fiware.aclose()
+    assert first.is_closed and fiware.http is not first and len(pools) == 2
+    await close_fiware_client()
+
+
+@pytest.mark.asyncio
+async def test_pool_limits_come_from_settings(monkeypatch):
+    monkeypatch.setattr(fiware_client.settings, "FIWARE_HTTP2", False)
+    monkeypatch.setattr(fiware_client.settings, "FIWARE_HTTP_MAX_CONNECTIONS", 7)
+    monkeypatch.setattr(fiware_client.settings, "FIWARE_HTTP_MAX_KEEPALIVE", 3)
+
+    client = fiware_client._create_http_client()
+    pool = client._transport._pool
+    assert (pool._max_connections, pool._max_keepalive_connections) == (7, 3)
+    await client.aclose()
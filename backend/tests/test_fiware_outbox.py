@@ -0,0 +1,208 @@
+"""
+Tests for the FIWARE transactional outbox.
+"""
+import datetime
+import json
+from typing import List
+
+import httpx
+import pytest
+import pytest_asyncio
+from sqlalchemy import select
+
+from app.infrastructure.database.models.farm_model import FarmModel
+from app.infrastructure.database.models.fiware_outbox_model import FiwareOutboxModel
+from app.infrastructure.database.models.fiware_sync_state_model import FiwareSyncStateModel
+from app.infrastructure.database.models.satellite_data_model import SatelliteDataModel
+from app.infrastructure.database.models.user_model import UserModel
+from app.infrastructure.external_services import fiware_outbox
+from app.infrastructure.external_services.fiware_client import FiwareClient
+from app.infrastructure.repositories.satellite_repository_impl import SatelliteRepositoryImpl
+
+PARCEL = "urn:ngsi-ld:AgriParcel:OpenAgri:1"
+
+
+class FakeOrion:
+    """Records upserted batches and deleted attributes; answers 503 while ``failing``."""
+
+    def __init__(self):
+        self.batches: List[List[dict]] = []
+        self.deleted: List[str] = []
+        self.failing = False
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/version":
+            return httpx.Response(200, json={})
+        if request.method == "DELETE":
+            self.deleted.append(request.url.path)
+        else:
+            self.batches.append(json.loads(request.content))
+        return httpx.Response(503, text="busy") if self.failing else httpx.Response(204)
+
+    def parcels(self) -> List[dict]:
+        return [entity for batch in self.batches for entity in batch if entity["id"] == PARCEL]
+
+
+@pytest_asyncio.fixture
+async def session_factory(session_factory):
+    """The shared database, seeded with a user and a farm."""
+    async with session_factory() as db:
+        db.add(UserModel(id=1, email="a@example.com", username="a", hashed_password="x"))
+        db.add(FarmModel(id=1, name="f", user_id=1, coordinates=[
+            {"lat": 21.0, "lng": 105.0}, {"lat": 21.0, "lng": 105.01}, {"lat": 21.01, "lng": 105.01},
+        ]))
+        await db.commit()
+    return session_factory
+
+
+@pytest_asyncio.fixture
+async def orion(monkeypatch):
+    fake = FakeOrion()
+    client = FiwareClient("http://orion", http_client=httpx.AsyncClient(transport=httpx.MockTransport(fake.handler)))
+    monkeypatch.setattr(fiware_outbox, "get_fiware_client", lambda: client)
+    yield fake
+    await client.aclose()
+
+
+async def _observe(session_factory, day: int, **farm_changes) -> None:
+    async with session_factory() as db:
+        farm = await db.get(FarmModel, 1)
+        for name, value in farm_changes.items():
+            setattr(farm, name, value)
+        await SatelliteRepositoryImpl(db).save_data(SatelliteDataModel(
+            farm_id=1, data_type="NDVI", mean_value=0.5, acquisition_date=datetime.date(2025, 6, day)
+        ))
+
+
+async def _make_due(session_factory) -> None:
+    async with session_factory() as db:
+        for row in (await db.execute(select(FiwareOutboxModel))).scalars():
+            row.next_attempt_at = datetime.datetime.utcnow() - datetime.timedelta(seconds=1)
+        await db.commit()
+
+
+@pytest.mark.asyncio
+async def test_outbox_written_with_observation_and_retried_on_failure(session_factory, orion):
+    for day in (1, 2):
+        await _observe(session_factory, day)
+    async with session_factory() as db:
+        queued = (await db.execute(select(FiwareOutboxModel.entity_id))).scalars().all()
+    assert len(queued) == 4
+    assert queued.count(PARCEL) == 2
+
+    orion.failing = True
+    assert await fiware_outbox.dispatch_fiware_outbox(session_factory) == 0
+    # Both AgriParcel rows go out as one entity
+    assert len(orion.batches[0]) == 3
+    async with session_factory() as db:
+        rows = (await db.execute(select(FiwareOutboxModel))).scalars().all()
+    assert {row.attempts for row in rows} == {1}
+    assert all(row.next_attempt_at > datetime.datetime.utcnow() for row in rows)
+
+    # Not due yet: nothing is sent
+    orion.failing = False
+    assert await fiware_outbox.dispatch_fiware_outbox(session_factory) == 0
+    assert len(orion.batches) == 1
+
+    await _make_due(session_factory)
+    assert await fiware_outbox.dispatch_fiware_outbox(session_factory) == 4
+    async with session_factory() as db:
+        assert (await db.execute(select(FiwareOutboxModel))).scalars().all() == []
+
+
+@pytest.mark.asyncio
+async def test_unchanged_farm_is_not_resent(session_factory, orion):
+    await _observe(session_factory, 1)
+    assert await fiware_outbox.dispatch_fiware_outbox(session_factory) == 2
+    assert "location" in orion.parcels()[0]
+
+    await _observe(session_factory, 2)
+    assert await fiware_outbox.dispatch_fiware_outbox(session_factory) == 2
+    assert len(orion.parcels()) == 1
+    async with session_factory() as db:
+        assert (await db.execute(select(FiwareOutboxModel))).scalars().all() == []
+
+
+@pytest.mark.asyncio
+async def test_changed_farm_is_sent_as_delta(session_factory, orion):
+    await _observe(session_factory, 1)
+    await fiware_outbox.dispatch_fiware_outbox(session_factory)
+
+    await _observe(session_factory, 2, crop_type="Lúa")
+    await fiware_outbox.dispatch_fiware_outbox(session_factory)
+    full, delta = orion.parcels()
+    assert "location" in full
+    assert set(delta) == {"@context", "id", "type", "category", "dateModified"}
+    assert delta["category"]["value"] == "Lúa"
+
+
+@pytest.mark.asyncio
+async def test_removed_attribute_is_deleted_in_orion(session_factory, orion):
+    await _observe(session_factory, 1, crop_type="Lúa")
+    await fiware_outbox.dispatch_fiware_outbox(session_factory)
+    assert orion.parcels()[0]["category"]["value"] == "Lúa"
+
+    await _observe(session_factory, 2, crop_type=None)
+    assert await fiware_outbox.dispatch_fiware_outbox(session_factory) == 2
+    assert "category" not in orion.parcels()[1]
+    assert orion.deleted == [f"/ngsi-ld/v1/entities/{PARCEL}/attrs/category"]
+    async with session_factory() as db:
+        assert "category" not in (await db.get(FiwareSyncStateModel, PARCEL)).attr_hashes
+
+
+@pytest.mark.asyncio
+async def test_sync_state_only_records_what_orion_accepted(session_factory, orion):
+    await _observe(session_factory, 1)
+    orion.failing = True
+    await fiware_outbox.dispatch_fiware_outbox(session_factory)
+    async with session_factory() as db:
+        assert await db.get(FiwareSyncStateModel, PARCEL) is None
+
+    # A change queued meanwhile is still sent along with everything Orion missed
+    await _observe(session_factory, 2, crop_type="Lúa")
+    orion.failing = False
+    await _make_due(session_factory)
+    assert await fiware_outbox.dispatch_fiware_outbox(session_factory) == 4
+    sent = orion.parcels()[-1]
+    assert "location" in sent and sent["category"]["value"] == "Lúa"
+    async with session_factory() as db:
+        assert await db.get(FiwareSyncStateModel, PARCEL) is not None
+
+
+@pytest.mark.asyncio
+async def test_enqueue_failure_does_not_roll_back_the_observation(session_factory, monkeypatch):
+    def broken(*args, **kwargs):
+        raise ValueError("bad geometry")
+
+    monkeypatch.setattr(
+        "app.infrastructure.repositories.satellite_repository_impl.build_observation_entities", broken
+    )
+    await _observe(session_factory, 1)
+    async with session_factory() as db:
+        assert len((await db.execute(select(SatelliteDataModel))).scalars().all()) == 1
+        assert (await db.execute(select(FiwareOutboxModel))).scalars().all() == []
+
+
+@pytest.mark.asyncio
+async def test_rows_leased_by_another_dispatcher_are_skipped(session_factory, orion):
+    await _observe(session_factory, 1)
+    async with session_factory() as db:
+        # Another worker's dispatcher holds the AgriParcel row
+        row = (await db.execute(
+            select(FiwareOutboxModel).where(FiwareOutboxModel.entity_id == PARCEL)
+        )).scalar_one()
+        row.claimed_by = "other-worker"
+        row.claimed_until = datetime.datetime.utcnow() + datetime.timedelta(minutes=5)
+        await db.commit()
+
+    assert await fiware_outbox.dispatch_fiware_outbox(session_factory) == 1
+    assert orion.parcels() == []
+    async with session_factory() as db:
+        row = (await db.execute(select(FiwareOutboxModel))).scalar_one()
+        assert row.claimed_by == "other-worker" and row.attempts == 0
+
+        # The other dispatcher died; its lease runs out
+        row.claimed_until = datetime.datetime.utcnow() - datetime.timedelta(seconds=1)
+        await db.commit()
+    assert await fiware_outbox.dispatch_fiware_outbox(session_factory) == 1
+    assert len(orion.parcels()) == 1
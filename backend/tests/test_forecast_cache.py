@@ -0,0 +1,164 @@
+"""
+Tests for the grid-snapped forecast cache.
+"""
+import asyncio
+
+import httpx
+import pytest
+
+from app.infrastructure.cache import forecast_cache as forecast_cache_module
+from app.infrastructure.cache.forecast_cache import (
+    ForecastCache,
+    forecast_days_bucket,
+    seconds_until_model_update,
+    snap_to_grid,
+)
+from app.infrastructure.external_services import weather_service
+
+
+def test_grid_snapping_and_horizon_buckets():
+    # Two farms ~300 m apart share a cell; the cell centre is requested upstream
+    assert snap_to_grid(21.5912, 105.8412, 0.05) == snap_to_grid(21.5935, 105.8440, 0.05) == (21.575, 105.825)
+    assert snap_to_grid(21.6012, 105.8412, 0.05) != snap_to_grid(21.5935, 105.8440, 0.05)
+
+    assert forecast_days_bucket(24) == 3
+    assert forecast_days_bucket(23) == 1
+    assert forecast_days_bucket(240) == 11
+
+
+def test_ttl_is_aligned_to_model_updates():
+    # Hourly updates published 5 minutes past the hour
+    assert seconds_until_model_update(3600 * 10 + 60, 60, 5) == 240
+    assert seconds_until_model_update(3600 * 10 + 600, 60, 5) == 3600 - 300
+
+
+@pytest.mark.asyncio
+async def test_stale_while_revalidate_and_metrics():
+    now = [0.0]
+    calls = []
+
+    async def fetch():
+        calls.append(now[0])
+        await asyncio.sleep(0)
+        return {"n": len(calls)}
+
+    cache = ForecastCache(max_size=10, stale_seconds=100, ttl_func=lambda t: 60, clock=lambda: now[0])
+
+    # Concurrent misses share one upstream call
+    first = await asyncio.gather(*(cache.get_or_fetch("k", fetch) for _ in range(5)))
+    assert first == [{"n": 1}] * 5 and len(calls) == 1
+
+    now[0] = 30
+    assert await cache.get_or_fetch("k", fetch) == {"n": 1}
+
+    # Stale: old value returned immediately, refreshed once in the background
+    now[0] = 90
+    assert await cache.get_or_fetch("k", fetch) == {"n": 1}
+    assert await cache.get_or_fetch("k", fetch) == {"n": 1}
+    await asyncio.sleep(0.01)
+    assert len(calls) == 2
+    assert await cache.get_or_fetch("k", fetch) == {"n": 2}
+
+    # Past the stale window it's a miss again
+    now[0] = 90 + 60 + 100
+    assert await cache.get_or_fetch("k", fetch) == {"n": 3}
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["stale_hits"], stats["misses"]) == (2, 2, 6)
+
+
+@pytest.mark.asyncio
+async def test_batch_forecast_dedupes_cells_and_chunks(monkeypatch, mock_httpx):
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        lats = request.url.params["latitude"].split(",")
+        requests.append(len(lats))
+        body = [{"latitude": float(lat), "current": {}, "hourly": {}} for lat in lats]
+        return httpx.Response(200, json=body if len(body) > 1 else body[0])
+
+    mock_httpx(handler)
+    monkeypatch.setattr(weather_service.settings, "WEATHER_BATCH_MAX_LOCATIONS", 2)
+    monkeypatch.setattr(weather_service, "forecast_cache", ForecastCache(ttl_func=lambda t: 60))
+    monkeypatch.setattr(forecast_cache_module.settings, "WEATHER_GRID_RESOLUTION_DEG", 0.05)
+
+    # 5 farms in 3 grid cells
+    points = [(21.591, 105.841), (21.593, 105.844), (21.651, 105.841), (21.701, 105.841), (21.702, 105.842)]
+    service = weather_service.OpenMeteoService()
+    forecasts = await service.get_forecasts(points, hours_ahead=24)
+
+    assert sorted(requests) == [1, 2]
+    assert [f["latitude"] for f in forecasts] == [21.575, 21.575, 21.675, 21.725, 21.725]
+
+    # Now cached: no upstream calls
+    await service.get_forecasts(points[:3], hours_ahead=24)
+    assert sorted(requests) == [1, 2]
+
+
+@pytest.mark.asyncio
+async def test_batch_misses_share_calls_already_in_flight():
+    single, batches = [], []
+
+    async def fetch():
+        single.append(1)
+        await asyncio.sleep(0.01)
+        return {"from": "single"}
+
+    async def fetch_many(keys):
+        batches.append(list(keys))
+        await asyncio.sleep(0.01)
+        return {key: {"from": "batch"} for key in keys}
+
+    cache = ForecastCache(ttl_func=lambda t: 60)
+    one = asyncio.ensure_future(cache.get_or_fetch("a", fetch))
+    await asyncio.sleep(0)
+    found, again = await asyncio.gather(
+        cache.get_many_or_fetch(["a", "b", "c"], fetch_many),
+        cache.get_many_or_fetch(["b", "c"], fetch_many),
+    )
+    assert found == {"a": {"from": "single"}, "b": {"from": "batch"}, "c": {"from": "batch"}}
+    assert again == {"b": {"from": "batch"}, "c": {"from": "batch"}}
+    assert await one == {"from": "single"}
+    assert single == [1] and batches == [["b", "c"]]
+
+
+@pytest.mark.asyncio
+async def test_short_multi_location_response_is_an_upstream_error(monkeypatch, mock_httpx):
+    def handler(request: httpx.Request) -> httpx.Response:
+        # One cell missing from the answer
+        lats = request.url.params["latitude"].split(",")[:-1]
+        return httpx.Response(200, json=[{"latitude": float(lat), "hourly": {}} for lat in lats])
+
+    mock_httpx(handler)
+    monkeypatch.setattr(weather_service, "forecast_cache", ForecastCache(ttl_func=lambda t: 60))
+
+    service = weather_service.OpenMeteoService()
+    points = [(21.0, 105.0), (22.0, 106.0), (23.0, 107.0)]
+    with pytest.raises(Exception, match="expected 3 locations, got 2"):
+        await service.get_forecasts(points)
+    with pytest.raises(Exception, match="expected 3 locations, got 2"):
+        await service.get_agro_hourly(points)
+    assert weather_service.forecast_cache.stats()["entries"] == 0
+
+
+@pytest.mark.asyncio
+async def test_agro_data_is_refetched_on_the_cells_next_day(monkeypatch, mock_httpx):
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request.url.params["latitude"])
+        return httpx.Response(200, json={"utc_offset_seconds": 14 * 3600, "hourly": {"time": []}})
+
+    mock_httpx(handler)
+    monkeypatch.setattr(weather_service, "forecast_cache", ForecastCache(ttl_func=lambda t: 3600))
+
+    service = weather_service.OpenMeteoService()
+    [weather] = await service.get_agro_hourly([(1.0, -170.0)])
+    await service.get_agro_hourly([(1.0, -170.0)])
+    assert len(requests) == 1
+
+    # The cell's local day has moved on: the cached entry no longer counts
+    weather[weather_service.AGRO_FETCHED_ON] = "2000-01-01"
+    await service.get_agro_hourly([(1.0, -170.0)])
+    assert len(requests) == 2
+    assert weather_service.forecast_cache.stats()["entries"] == 1
@@ -0,0 +1,157 @@
+"""
+Tests for the offline Vietnam gazetteer and place search.
+"""
+import random
+
+import pytest
+
+from app.application.use_cases.weather_use_cases import SearchLocationUseCase
+from app.infrastructure.geo.farm_geometry import haversine_km
+from app.infrastructure.geo.gazetteer import Gazetteer, KDTree, Place, point_in_polygon
+from app.infrastructure.geo.place_search import FUZZY, PlaceSearchIndex
+
+
+def test_kdtree_matches_brute_force():
+    rng = random.Random(7)
+    points = [(rng.uniform(8, 23), rng.uniform(102, 110)) for _ in range(300)]
+    tree = KDTree(points)
+    for _ in range(50):
+        lat, lng = rng.uniform(8, 23), rng.uniform(102, 110)
+        expected = min(range(len(points)), key=lambda i: haversine_km(lat, lng, *points[i]))
+        assert tree.nearest(lat, lng, k=3)[0] == expected
+
+
+def test_point_in_polygon():
+    square = [(0, 0), (0, 1), (1, 1), (1, 0)]
+    assert point_in_polygon(0.5, 0.5, square)
+    assert not point_in_polygon(1.5, 0.5, square)
+
+
+def test_lookup_bundled_data():
+    gazetteer = Gazetteer.from_file()
+
+    match = gazetteer.lookup(21.03, 105.85)
+    assert match.province.name == "Hà Nội"
+
+    # Island districts resolve with their province
+    match = gazetteer.lookup(10.22, 103.96)
+    assert (match.district.name, match.province.name) == ("Phú Quốc", "Kiên Giang")
+
+    # Outside Vietnam: no local answer (Bangkok, Vientiane)
+    assert gazetteer.lookup(13.75, 100.50) is None
+    assert gazetteer.lookup(17.97, 102.60) is None
+
+
+def test_province_boundaries_answer_points_circles_could_not():
+    """Points where province circles overlapped now resolve from the boundaries."""
+    gazetteer = Gazetteer.from_file()
+
+    for lat, lng, province in [
+        (10.945, 106.824, "Đồng Nai"),  # Biên Hòa
+        (10.906, 106.769, "Bình Dương"),  # Dĩ An
+        (10.386, 105.435, "An Giang"),  # Long Xuyên
+        (20.646, 106.051, "Hưng Yên"),
+        (10.535, 106.413, "Long An"),  # Tân An
+        (21.322, 105.402, "Phú Thọ"),  # Việt Trì
+        (16.054, 108.202, "Đà Nẵng"),
+        (18.679, 105.681, "Nghệ An"),  # Vinh
+        (22.486, 103.970, "Lào Cai"),
+        (16.463, 107.590, "Thừa Thiên Huế"),
+    ]:
+        assert gazetteer.lookup(lat, lng).province.name == province, (lat, lng)
+
+    assert gazetteer.lookup(21.525, 107.966).district.name == "Móng Cái"
+    assert gazetteer.lookup(21.29, 106.19).district.name == "Bắc Giang"
+
+    # A few km across the land border stays with Photon
+    assert gazetteer.lookup(22.550, 103.950) is None  # Hekou, China
+    assert gazetteer.lookup(21.547, 107.972) is None  # Dongxing, China
+    assert gazetteer.lookup(21.080, 102.520) is None  # Muang Khua, Laos
+    assert gazetteer.lookup(11.550, 104.920) is None  # Phnom Penh
+
+
+def test_circles_answer_below_a_boundary_only_when_unambiguous():
+    square = ((10.0, 105.0), (10.0, 105.4), (10.4, 105.4), (10.4, 105.0))
+    places = [
+        Place("p:a", "A", "province", None, 10.2, 105.2, 25.0, polygons=(square,)),
+        # Two overlapping districts in the west, one alone in the east
+        Place("d:w1", "W1", "district", "p:a", 10.2, 105.05, 6.0),
+        Place("d:w2", "W2", "district", "p:a", 10.2, 105.12, 6.0),
+        Place("d:e", "E", "district", "p:a", 10.2, 105.33, 6.0),
+        Place("c:e", "E1", "commune", "d:e", 10.2, 105.33, 2.0),
+        Place("b:x", "X", "province", None, 10.2, 105.6, 25.0, land_border=True),
+    ]
+    gazetteer = Gazetteer(places)
+
+    match = gazetteer.lookup(10.2, 105.33)
+    assert (match.place.name, match.district.name, match.province.name) == ("E1", "E", "A")
+    # Inside E but beyond its commune's circle
+    assert gazetteer.lookup(10.2, 105.37).place.name == "E"
+    # W1 and W2 both cover the point: only the province is certain
+    assert gazetteer.lookup(10.2, 105.085).place.name == "A"
+    # Outside every boundary, a land-border circle doesn't answer
+    assert gazetteer.lookup(10.2, 105.6) is None
+
+
+def test_search_ignores_diacritics_and_ranks():
+    index = PlaceSearchIndex(Gazetteer.from_file())
+
+    def names(query):
+        return [place.name for place in index.search(query, 5)]
+
+    assert names("dong thap")[0] == "Đồng Tháp"
+    assert names("ĐỒNG THÁP")[0] == "Đồng Tháp"
+    assert names("tp hcm") == ["Hồ Chí Minh"]
+    # Name prefixes before word prefixes inside names, provinces first
+    assert names("thap")[:2] == ["Tháp Mười", "Đồng Tháp"]
+    assert names("quang")[:2] == ["Quảng Nam", "Quảng Ninh"]
+    # Typos fall back to trigram similarity
+    assert names("nghe ann")[0] == "Nghệ An"
+    assert [match for _, match in index.search_with_match("London")] in ([], [FUZZY])
+    # Districts and communes, with their province
+    assert [(place.name, index.gazetteer.hierarchy(place)[0].name) for place in index.search("phuc xa", 1)] == [
+        ("Phúc Xá", "Hà Nội")
+    ]
+
+
+class FakePhoton:
+    def __init__(self, features):
+        self.features = features
+        self.queries = []
+
+    async def search_location(self, query, limit=10):
+        self.queries.append(query)
+        return {"features": [
+            {"properties": {"name": name, "country": "Việt Nam", "state": state, "osm_type": "R"},
+             "geometry": {"coordinates": [105.9, 21.0]}}
+            for name, state in self.features
+        ]}
+
+
+@pytest.mark.asyncio
+async def test_fuzzy_matches_do_not_skip_photon():
+    """Landmarks close to a place name ("Vinh Ha Long" ~ "Vĩnh Long") still go to Photon."""
+    index = PlaceSearchIndex(Gazetteer.from_file())
+
+    for query, landmark, state, wrong in [
+        ("Vinh Ha Long", "Vịnh Hạ Long", "Quảng Ninh", "Vĩnh Long"),
+        ("Ho Tay", "Hồ Tây", "Hà Nội", "Hòa Thọ Tây"),
+        ("Tan Son Nhat", "Sân bay Tân Sơn Nhất", "Hồ Chí Minh", "Tân Sơn Nhì"),
+        ("Noi Bai", "Sân bay Nội Bài", "Hà Nội", "Đại Bái"),
+    ]:
+        assert wrong in [place.name for place in index.search(query, 5)]
+        photon = FakePhoton([(landmark, state)])
+        result = await SearchLocationUseCase(photon, index).execute(query, limit=5)
+        assert photon.queries == [query]
+        assert result.results[0].name == landmark
+
+    # Nothing from Photon: the suggestions are returned
+    result = await SearchLocationUseCase(FakePhoton([]), index).execute("Vinh Ha Long", limit=5)
+    assert result.results[0].name == "Vĩnh Long"
+
+    # Name (prefix) matches are answered locally, districts included
+    photon = FakePhoton([])
+    result = await SearchLocationUseCase(photon, index).execute("dong thap", limit=5)
+    assert result.results[0].name == "Đồng Tháp" and photon.queries == []
+    result = await SearchLocationUseCase(photon, index).execute("Gia Lam", limit=5)
+    assert (result.results[0].name, result.results[0].state) == ("Gia Lâm", "Hà Nội") and photon.queries == []
@@ -0,0 +1,75 @@
+"""
+Tests for GBIF species key resolution and its persistent cache.
+"""
+import datetime
+
+import httpx
+import pytest
+from sqlalchemy import update
+
+from app.infrastructure.cache.species_key_cache import SpeciesKeyCache
+from app.infrastructure.database.models.gbif_species_key_model import GbifSpeciesKeyModel
+from app.infrastructure.external_services.gbif_service import GBIFService
+
+MATCHES = {
+    "Nilaparvata lugens": {"usageKey": 101, "speciesKey": 101, "matchType": "EXACT"},
+    "Sogatella furcifera": {"usageKey": 202, "acceptedUsageKey": 201, "matchType": "EXACT"},
+    "Nosuch pestus": {"matchType": "NONE"},
+}
+
+
+@pytest.fixture
+def gbif(mock_httpx):
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        path = request.url.path.rsplit("/v1", 1)[1]
+        calls.append(path)
+        if path == "/species/match":
+            return httpx.Response(200, json=MATCHES[request.url.params["name"]])
+        year = datetime.date.today().year
+        return httpx.Response(200, json={"results": [{"year": year}, {"year": year - 1}]})
+
+    mock_httpx(handler)
+    return calls
+
+
+@pytest.mark.asyncio
+async def test_keys_are_matched_once_and_persisted(session_factory, gbif):
+    service = GBIFService(species_keys=SpeciesKeyCache(session_factory))
+    names = list(MATCHES)
+
+    assert await service.resolve_species_keys(names) == {
+        "Nilaparvata lugens": 101, "Sogatella furcifera": 201, "Nosuch pestus": None
+    }
+    assert gbif.count("/species/match") == 3
+
+    # A new process (empty memory) reads the table; no match is cached too
+    restarted = GBIFService(species_keys=SpeciesKeyCache(session_factory))
+    assert await restarted.resolve_species_keys(names + ["nilaparvata  LUGENS"]) == {
+        "Nilaparvata lugens": 101, "Sogatella furcifera": 201, "Nosuch pestus": None,
+        "nilaparvata  LUGENS": 101
+    }
+    assert gbif.count("/species/match") == 3
+
+    # Expired entries are matched again
+    async with session_factory() as session:
+        await session.execute(update(GbifSpeciesKeyModel).values(resolved_at=datetime.datetime(2000, 1, 1)))
+        await session.commit()
+    restarted = GBIFService(species_keys=SpeciesKeyCache(session_factory))
+    await restarted.resolve_species_keys(names)
+    assert gbif.count("/species/match") == 6
+
+
+@pytest.mark.asyncio
+async def test_pest_forecast_only_queries_occurrences_when_keys_cached(session_factory, gbif):
+    service = GBIFService(species_keys=SpeciesKeyCache(session_factory))
+    pests = ["Nilaparvata lugens", "Sogatella furcifera", "Nosuch pestus"]
+
+    first = await service.get_pest_risk_forecast(21.59, 105.84, pest_scientific_names=pests)
+    assert sorted(first["pest_summary"]) == ["Nilaparvata lugens", "Sogatella furcifera"]
+    assert first["pest_summary"]["Sogatella furcifera"]["species_key"] == 201
+
+    gbif.clear()
+    await service.get_pest_risk_forecast(21.59, 105.84, pest_scientific_names=pests)
+    assert gbif == ["/occurrence/search", "/occurrence/search"]
@@ -0,0 +1,117 @@
+"""
+Tests for the POST /satellite/history/bulk endpoint.
+"""
+import datetime
+import json
+
+import httpx
+import pytest
+import pytest_asyncio
+
+from app.application.use_cases.satellite_history_use_cases import StreamBulkHistoryUseCase
+from app.domain.entities.user import User
+from app.infrastructure.database.models.farm_model import FarmModel
+from app.infrastructure.database.models.satellite_data_model import SatelliteDataModel
+from app.infrastructure.database.models.user_model import UserModel
+from app.infrastructure.repositories.satellite_repository_impl import SatelliteRepositoryImpl
+from app.main import app
+from app.presentation.deps import get_current_user, get_session_factory
+
+URL = "/api/v1/satellite/history/bulk"
+JUNE = {"start_date": "2025-06-01", "end_date": "2025-06-30"}
+
+
+@pytest_asyncio.fixture
+async def client(session_factory):
+    """Signed in as user 1, who owns farm 1; user 2 owns farm 2."""
+    async with session_factory() as db:
+        db.add_all([
+            UserModel(id=1, email="a@example.com", username="a", hashed_password="x"),
+            UserModel(id=2, email="b@example.com", username="b", hashed_password="x"),
+        ])
+        db.add_all([
+            FarmModel(id=1, name="mine", coordinates=[], user_id=1),
+            FarmModel(id=2, name="theirs", coordinates=[], user_id=2),
+        ])
+        await db.commit()
+
+    app.dependency_overrides[get_current_user] = lambda: User(
+        id=1, email="a@example.com", username="a", hashed_password="x"
+    )
+    app.dependency_overrides[get_session_factory] = lambda: session_factory
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
+    app.dependency_overrides.clear()
+
+
+async def _observe(session_factory, farm_id: int, day: int, value: float) -> None:
+    async with session_factory() as db:
+        db.add(SatelliteDataModel(
+            farm_id=farm_id, data_type="NDVI", acquisition_date=datetime.date(2025, 6, day), mean_value=value
+        ))
+        await db.commit()
+
+
+@pytest.mark.asyncio
+async def test_only_the_callers_farms_are_returned(client, session_factory):
+    await _observe(session_factory, 1, 1, 0.4)
+    await _observe(session_factory, 2, 1, 0.9)
+
+    # Asking for another user's farm by id doesn't return it either
+    for farm_ids in (None, [1, 2], [2]):
+        response = await client.post(URL, json={**JUNE, "farm_ids": farm_ids})
+        assert response.status_code == 200
+        series = response.json()["series"]
+        assert [s["farm_id"] for s in series] == ([] if farm_ids == [2] else [1])
+
+
+@pytest.mark.asyncio
+async def test_empty_result_and_bad_dates(client):
+    response = await client.post(URL, json=JUNE)
+    assert response.status_code == 200
+    assert response.json() == {**JUNE, "series": []}
+
+    response = await client.post(URL, json={"start_date": "2025-06-30", "end_date": "2025-06-01"})
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_non_finite_values_are_null(client, session_factory):
+    # SQLite stores NaN as NULL; infinity is kept
+    await _observe(session_factory, 1, 1, float("inf"))
+    await _observe(session_factory, 1, 2, 0.5)
+
+    response = await client.post(URL, json=JUNE)
+    assert response.status_code == 200
+    [series] = json.loads(response.content)["series"]
+    assert series["values"] == [None, 0.5]
+
+    encoded = StreamBulkHistoryUseCase._encode_series((1, "NDVI"), ["2025-06-01"], [float("nan")])
+    assert json.loads(encoded)["values"] == [None]
+
+
+@pytest.mark.asyncio
+async def test_database_errors(client, session_factory, monkeypatch):
+    await _observe(session_factory, 1, 1, 0.4)
+    await _observe(session_factory, 1, 2, 0.5)
+    rows_before_failure = [0]
+
+    async def failing_stream(self, *args):
+        for _ in range(rows_before_failure[0]):
+            yield (1, "NDVI", datetime.date(2025, 6, 1), 0.4)
+        raise RuntimeError("database is locked")
+
+    monkeypatch.setattr(SatelliteRepositoryImpl, "stream_history", failing_stream)
+
+    # Before the first row: a proper error status, not an empty 200
+    response = await client.post(URL, json=JUNE)
+    assert response.status_code == 500
+
+    # Mid-stream: the document is still valid JSON and says it's incomplete
+    rows_before_failure[0] = 1
+    response = await client.post(URL, json=JUNE)
+    assert response.status_code == 200
+    body = response.json()
+    assert body["series"][0]["values"] == [0.4]
+    assert "incomplete" in body["error"]
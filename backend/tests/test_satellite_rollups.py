@@ -0,0 +1,114 @@
+"""
+Tests for satellite rollups and bulk history.
+"""
+import datetime
+import json
+
+import pytest
+import pytest_asyncio
+
+from app.application.dto.satellite_history_dto import BulkHistoryRequest
+from app.application.use_cases.satellite_history_use_cases import StreamBulkHistoryUseCase
+from app.infrastructure.database.models.farm_model import FarmModel
+from app.infrastructure.database.models.satellite_data_model import SatelliteDataModel
+from app.infrastructure.database.models.user_model import UserModel
+from app.infrastructure.database.satellite_rollups import bucket_end, bucket_start, choose_granularity
+from app.infrastructure.repositories.satellite_repository_impl import SatelliteRepositoryImpl
+
+
+@pytest_asyncio.fixture
+async def session(session_factory):
+    async with session_factory() as db:
+        db.add(UserModel(id=1, email="a@example.com", username="a", hashed_password="x"))
+        db.add(FarmModel(id=1, name="f", coordinates=[], user_id=1))
+        await db.commit()
+        yield db
+
+
+def test_bucket_boundaries_and_granularity_choice():
+    """Weeks start on Monday; December opens the next winter-spring season."""
+    assert bucket_start(datetime.date(2025, 3, 13), "week") == datetime.date(2025, 3, 10)
+    assert bucket_start(datetime.date(2025, 3, 13), "month") == datetime.date(2025, 3, 1)
+    assert bucket_start(datetime.date(2025, 3, 13), "season") == datetime.date(2024, 12, 1)
+    assert bucket_start(datetime.date(2025, 12, 2), "season") == datetime.date(2025, 12, 1)
+    assert bucket_start(datetime.date(2025, 7, 1), "season") == datetime.date(2025, 5, 1)
+    assert bucket_end(datetime.date(2024, 2, 1), "month") == datetime.date(2024, 2, 29)
+    assert bucket_end(datetime.date(2024, 12, 1), "season") == datetime.date(2025, 4, 30)
+    assert bucket_end(datetime.date(2025, 9, 1), "season") == datetime.date(2025, 11, 30)
+
+    start = datetime.date(2025, 1, 1)
+    assert choose_granularity(start, start + datetime.timedelta(days=60)) is None
+    assert choose_granularity(start, start + datetime.timedelta(days=365)) == "week"
+    assert choose_granularity(start, start + datetime.timedelta(days=3 * 365)) == "month"
+    assert choose_granularity(start, start + datetime.timedelta(days=20 * 365)) == "season"
+
+
+@pytest.mark.asyncio
+async def test_rollups_updated_on_save(session):
+    """Each saved observation is folded into its week, month and season buckets."""
+    repo = SatelliteRepositoryImpl(session)
+    for day, value in ((3, 0.2), (10, 0.6), (5, 0.4)):
+        await repo.save_data(SatelliteDataModel(
+            farm_id=1, data_type="NDVI", acquisition_date=datetime.date(2025, 6, day), mean_value=value
+        ))
+
+    [month] = await repo.get_rollups(1, "NDVI", "month", datetime.date(2025, 6, 1), datetime.date(2025, 6, 30))
+    assert month.count == 3
+    assert month.mean_value == pytest.approx(0.4)
+    assert (month.min_value, month.max_value) == (0.2, 0.6)
+    assert (month.last_date, month.last_value) == (datetime.date(2025, 6, 10), 0.6)
+
+    weeks = await repo.get_rollups(1, "NDVI", "week", datetime.date(2025, 6, 1), datetime.date(2025, 6, 30))
+    assert [(w.bucket_start.day, w.count) for w in weeks] == [(2, 2), (9, 1)]
+
+    latest = await repo.get_latest_record(1, "NDVI", datetime.date(2025, 1, 1), datetime.date(2025, 12, 31))
+    assert latest.acquisition_date == datetime.date(2025, 6, 10)
+
+
+@pytest.mark.asyncio
+async def test_edge_rollups_are_clipped_to_the_range(session):
+    """Buckets sticking out of the range only count the observations inside it."""
+    repo = SatelliteRepositoryImpl(session)
+    for month, day, value in ((5, 20, 0.1), (6, 3, 0.2), (7, 10, 0.6), (8, 1, 0.4), (8, 25, 0.8)):
+        await repo.save_data(SatelliteDataModel(
+            farm_id=1, data_type="NDVI", acquisition_date=datetime.date(2025, month, day), mean_value=value
+        ))
+
+    months = await repo.get_rollups(1, "NDVI", "month", datetime.date(2025, 5, 25), datetime.date(2025, 8, 10))
+    assert [(m.bucket_start.month, m.count, m.mean_value) for m in months] == [(6, 1, 0.2), (7, 1, 0.6), (8, 1, 0.4)]
+    assert (months[-1].last_date, months[-1].max_value) == (datetime.date(2025, 8, 1), 0.4)
+
+    [season] = await repo.get_rollups(1, "NDVI", "season", datetime.date(2025, 6, 1), datetime.date(2025, 7, 31))
+    assert (season.bucket_start, season.count) == (datetime.date(2025, 5, 1), 2)
+    assert (season.min_value, season.max_value) == (0.2, 0.6)
+
+    # The stored buckets are untouched
+    [stored] = await repo.get_rollups(1, "NDVI", "season", datetime.date(2025, 5, 1), datetime.date(2025, 8, 31))
+    assert stored.count == 5
+
+
+@pytest.mark.asyncio
+async def test_bulk_history_streams_columnar_series(session, session_factory):
+    """One stream covers every requested farm/data type, restricted to the owner's farms."""
+    session.add(UserModel(id=2, email="b@example.com", username="b", hashed_password="x"))
+    session.add(FarmModel(id=2, name="other", coordinates=[], user_id=2))
+    session.add_all([
+        SatelliteDataModel(farm_id=1, data_type="NDVI", acquisition_date=datetime.date(2025, 6, 2), mean_value=0.5),
+        SatelliteDataModel(farm_id=1, data_type="NDVI", acquisition_date=datetime.date(2025, 6, 1), mean_value=0.4),
+        SatelliteDataModel(farm_id=1, data_type="SOIL_MOISTURE", acquisition_date=datetime.date(2025, 6, 1), mean_value=0.3),
+        SatelliteDataModel(farm_id=2, data_type="NDVI", acquisition_date=datetime.date(2025, 6, 1), mean_value=0.9),
+    ])
+    await session.commit()
+
+    use_case = StreamBulkHistoryUseCase(session_factory)
+    request = BulkHistoryRequest(start_date="2025-06-01", end_date="2025-06-30")
+    body = b"".join([chunk async for chunk in await use_case.execute(1, request)])
+
+    assert json.loads(body) == {
+        "start_date": "2025-06-01",
+        "end_date": "2025-06-30",
+        "series": [
+            {"farm_id": 1, "data_type": "NDVI", "dates": ["2025-06-01", "2025-06-02"], "values": [0.4, 0.5]},
+            {"farm_id": 1, "data_type": "SOIL_MOISTURE", "dates": ["2025-06-01"], "values": [0.3]},
+        ],
+    }
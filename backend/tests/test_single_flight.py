@@ -0,0 +1,42 @@
+"""
+Tests for request coalescing of upstream calls.
+"""
+import asyncio
+
+import pytest
+
+from app.infrastructure.cache.single_flight import SingleFlight, request_key
+
+
+def test_request_key_normalizes_params():
+    assert request_key("u", {"b": 2, "a": 1.00000001}) == request_key("u", {"a": 1.0, "b": 2, "c": None})
+    assert request_key("u", {"a": 1}) != request_key("v", {"a": 1})
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_share_one_flight():
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        if calls == 2:
+            raise RuntimeError("upstream 429")
+        return calls
+
+    flight = SingleFlight()
+    assert await asyncio.gather(*(flight.do("k", fetch) for _ in range(10))) == [1] * 10
+    assert (flight.calls, flight.coalesced, len(flight)) == (1, 9, 0)
+
+    # Errors are shared too, and nothing is remembered afterwards
+    results = await asyncio.gather(*(flight.do("k", fetch) for _ in range(3)), return_exceptions=True)
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert await flight.do("k", fetch) == 3
+
+    # A cancelled caller doesn't cancel the call for the others
+    first = asyncio.ensure_future(flight.do("k", fetch))
+    second = asyncio.ensure_future(flight.do("k", fetch))
+    await asyncio.sleep(0)
+    first.cancel()
+    assert await second == 4
@@ -0,0 +1,75 @@
+"""
+Tests for the authenticated user cache.
+"""
+import pytest
+
+from app.domain.entities.user import User
+from app.infrastructure.cache.ttl_cache import TTLCache
+from app.infrastructure.cache.user_cache import auth_user_cache, invalidate_cached_user
+from app.infrastructure.security.jwt import create_access_token
+from app.presentation.deps import get_current_user
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class CountingUserRepository:
+    def __init__(self, user: User):
+        self.user = user
+        self.calls = 0
+
+    async def get_by_id(self, id: int):
+        self.calls += 1
+        return self.user.model_copy() if self.user.id == id else None
+
+
+def test_ttl_cache_expires_entries():
+    """Entries are dropped once their TTL elapses."""
+    clock = FakeClock()
+    cache = TTLCache(max_size=10, ttl_seconds=5, clock=clock)
+    cache.set("a", 1)
+
+    clock.now = 4.9
+    assert cache.get("a") == 1
+
+    clock.now = 5.0
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    """The least recently used entry is evicted when the cache is full."""
+    cache = TTLCache(max_size=2, ttl_seconds=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+
+@pytest.mark.asyncio
+async def test_get_current_user_uses_cache_until_invalidated():
+    """Only the first request hits the repository until the entry is invalidated."""
+    auth_user_cache.clear()
+    user = User(id=42, email="farmer@example.com", username="farmer", hashed_password="x")
+    repository = CountingUserRepository(user)
+    token = create_access_token(subject=user.id)
+
+    first = await get_current_user(token=token, repository=repository)
+    second = await get_current_user(token=token, repository=repository)
+
+    assert first.id == second.id == 42
+    assert repository.calls == 1
+
+    invalidate_cached_user(42)
+    await get_current_user(token=token, repository=repository)
+    assert repository.calls == 2
+    auth_user_cache.clear()
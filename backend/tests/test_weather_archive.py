@@ -0,0 +1,101 @@
+"""
+Tests for the local weather archive: incremental backfill and daily aggregates.
+"""
+import datetime
+
+import pytest
+import pytest_asyncio
+
+from app.application.use_cases import weather_use_cases
+from app.application.use_cases.weather_use_cases import (
+    BackfillWeatherArchiveUseCase,
+    GetDailyWeatherHistoryUseCase,
+    date_ranges,
+)
+from app.infrastructure.repositories.weather_archive_repository_impl import SQLAlchemyWeatherArchiveRepository
+
+
+class FakeArchive:
+    def __init__(self):
+        self.calls = []
+
+    async def get_historical_data(self, latitude, longitude, start_date, end_date):
+        self.calls.append((start_date, end_date))
+        day = datetime.date.fromisoformat(start_date)
+        last = datetime.date.fromisoformat(end_date)
+        hourly = {"time": [], "temperature_2m": [], "relative_humidity_2m": [], "precipitation": [], "wind_speed_10m": []}
+        while day <= last:
+            for hour in range(24):
+                hourly["time"].append(f"{day.isoformat()}T{hour:02d}:00")
+                hourly["temperature_2m"].append(20.0 + hour)
+                hourly["relative_humidity_2m"].append(95.0 if hour < 6 else 70.0)
+                hourly["precipitation"].append(0.5 if hour < 4 else 0.0)
+                hourly["wind_speed_10m"].append(float(hour))
+            day += datetime.timedelta(days=1)
+        return {"hourly": hourly}
+
+
+@pytest_asyncio.fixture
+async def repository(session_factory):
+    async with session_factory() as db:
+        yield SQLAlchemyWeatherArchiveRepository(db)
+
+
+def test_date_ranges():
+    d = datetime.date(2025, 1, 1)
+    days = [d, d + datetime.timedelta(days=1), d + datetime.timedelta(days=2), d + datetime.timedelta(days=5)]
+    assert date_ranges(days, max_days=2) == [
+        (d, d + datetime.timedelta(days=1)),
+        (d + datetime.timedelta(days=2), d + datetime.timedelta(days=2)),
+        (d + datetime.timedelta(days=5), d + datetime.timedelta(days=5)),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_backfill_fetches_only_missing_days(repository):
+    archive = FakeArchive()
+    use_case = BackfillWeatherArchiveUseCase(archive, repository)
+    start = datetime.date(2025, 3, 1)
+
+    assert await use_case.execute(21.59, 105.84, start, start + datetime.timedelta(days=2)) == 72
+    # Extending the range only downloads the new days
+    assert await use_case.execute(21.59, 105.84, start, start + datetime.timedelta(days=4)) == 48
+    assert archive.calls == [("2025-03-01", "2025-03-03"), ("2025-03-04", "2025-03-05")]
+    assert await use_case.execute(21.59, 105.84, start, start + datetime.timedelta(days=4)) == 0
+    assert len(archive.calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_daily_aggregates(repository):
+    archive = FakeArchive()
+    result = await GetDailyWeatherHistoryUseCase(archive, repository).execute(
+        21.59, 105.84, datetime.date(2025, 3, 1), datetime.date(2025, 3, 2)
+    )
+
+    assert result.count == 2 and len(archive.calls) == 1
+    day = result.days[0]
+    assert (day.date, day.hours) == ("2025-03-01", 24)
+    assert (day.temperature_min, day.temperature_max, day.temperature_mean) == (20.0, 43.0, 31.5)
+    assert (day.precipitation_sum, day.humid_hours, day.wind_speed_max) == (2.0, 6, 23.0)
+
+    with pytest.raises(ValueError):
+        await GetDailyWeatherHistoryUseCase(archive, repository).execute(
+            21.59, 105.84, datetime.date(2025, 3, 2), datetime.date(2025, 3, 1)
+        )
+
+
+@pytest.mark.asyncio
+async def test_on_demand_backfill_is_bounded(repository, monkeypatch):
+    monkeypatch.setattr(weather_use_cases.settings, "WEATHER_ARCHIVE_ON_DEMAND_MAX_DAYS", 10)
+    archive = FakeArchive()
+    use_case = GetDailyWeatherHistoryUseCase(archive, repository)
+    start, end = datetime.date(2024, 1, 1), datetime.date(2024, 12, 31)
+
+    # A year-long first request downloads only its latest 10 days, in one call
+    result = await use_case.execute(21.59, 105.84, start, end)
+    assert archive.calls == [("2024-12-22", "2024-12-31")]
+    assert result.count == 10 and result.days[0].date == "2024-12-22"
+
+    # The next request continues with the 10 days before them
+    await use_case.execute(21.59, 105.84, start, end)
+    assert archive.calls[1] == ("2024-12-12", "2024-12-21")
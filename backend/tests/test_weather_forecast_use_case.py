@@ -0,0 +1,68 @@
+"""
+Tests for GetWeatherForecastUseCase: concurrent geocoding and response formats.
+"""
+import asyncio
+import time
+
+import pytest
+
+from app.application.use_cases import weather_use_cases
+from app.application.use_cases.weather_use_cases import GetWeatherForecastUseCase, forecast_columns, parse_forecast
+
+FORECAST = {"current": {"time": "2025-06-01T10:00", "temperature_2m": 30.0}, "hourly": {"time": ["2025-06-01T00:00"]}}
+
+
+class FakeOpenMeteo:
+    async def get_forecast(self, latitude, longitude, hours_ahead=24):
+        await asyncio.sleep(0.05)
+        return FORECAST
+
+
+class FakePhoton:
+    def __init__(self, delay):
+        self.delay = delay
+
+    async def reverse_geocode(self, latitude, longitude, limit=1):
+        await asyncio.sleep(self.delay)
+        return {"features": [{"properties": {"name": "Vientiane", "country": "Laos"}}]}
+
+
+@pytest.mark.asyncio
+async def test_geocode_runs_concurrently_and_degrades(monkeypatch):
+    monkeypatch.setattr(weather_use_cases.settings, "WEATHER_GEOCODE_TIMEOUT_SECONDS", 0.2)
+
+    # Both take 50 ms: total is ~50 ms, not 100 ms
+    use_case = GetWeatherForecastUseCase(FakeOpenMeteo(), FakePhoton(0.05))
+    started = time.monotonic()
+    result = await use_case.execute(17.97, 102.60)
+    assert time.monotonic() - started < 0.09
+    assert (result.location.name, result.location.country) == ("Vientiane", "Laos")
+
+    # A slow geocoder doesn't hold the forecast beyond its deadline
+    started = time.monotonic()
+    result = await GetWeatherForecastUseCase(FakeOpenMeteo(), FakePhoton(5)).execute(17.97, 102.60)
+    assert time.monotonic() - started < 0.5
+    assert result.location.name == "Unknown"
+    assert result.current.temperature_2m == 30.0
+
+    # Points in Vietnam are named from the gazetteer without calling Photon
+    # (a ward of Thái Nguyên city)
+    result = await GetWeatherForecastUseCase(FakeOpenMeteo(), FakePhoton(5)).execute(21.59, 105.84)
+    assert (result.location.name, result.location.country) == ("Phan Đình Phùng", "Việt Nam")
+
+
+def test_columnar_matches_rows():
+    forecast = {"hourly": {
+        "time": ["2025-06-01T00:00", "2025-06-01T01:00", "2025-06-01T02:00"],
+        "temperature_2m": [25.1, 24.8, 24.5],
+        "relative_humidity_2m": [90, 92, 93],
+        "weather_code": [3, 61, 61],
+        "wind_speed_10m": [4.0, 3.6, 3.2],
+        "precipitation": [0.0, 0.4],
+    }}
+    columns = forecast_columns(forecast, hours_ahead=2)
+    _, rows = parse_forecast(forecast, hours_ahead=2)
+
+    assert list(columns) == ["time", *(name for name in rows[0].model_dump() if name != "time")]
+    for i, row in enumerate(rows):
+        assert {name: values[i] for name, values in columns.items()} == row.model_dump()
@@ -0,0 +1,44 @@
+"""
+Tests for the scheduled forecast prefetch.
+"""
+import time
+
+import httpx
+import pytest
+
+from app.application.use_cases.weather_use_cases import PrefetchWeatherForecastsUseCase
+from app.infrastructure.cache import forecast_cache as forecast_cache_module
+from app.infrastructure.cache.forecast_cache import ForecastCache
+from app.infrastructure.external_services import weather_service
+
+
+@pytest.mark.asyncio
+async def test_prefetch_refreshes_cells_in_paced_chunks(monkeypatch, mock_httpx):
+    starts = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        starts.append(time.monotonic())
+        lats = request.url.params["latitude"].split(",")
+        body = [{"latitude": float(lat), "run": len(starts), "current": {}, "hourly": {}} for lat in lats]
+        return httpx.Response(200, json=body if len(body) > 1 else body[0])
+
+    mock_httpx(handler)
+    monkeypatch.setattr(weather_service.settings, "WEATHER_BATCH_MAX_LOCATIONS", 2)
+    monkeypatch.setattr(weather_service, "forecast_cache", ForecastCache(ttl_func=lambda t: 60))
+    monkeypatch.setattr(forecast_cache_module.settings, "WEATHER_GRID_RESOLUTION_DEG", 0.05)
+
+    # 6 farms in 5 grid cells -> 3 chunks
+    points = [(21.591, 105.841), (21.593, 105.844), (21.651, 105.841), (21.701, 105.841),
+              (21.751, 105.841), (21.801, 105.841)]
+    service = weather_service.OpenMeteoService()
+    use_case = PrefetchWeatherForecastsUseCase(service)
+
+    assert await use_case.execute(points, concurrency=3, requests_per_minute=600) == (5, 0)
+    assert len(starts) == 3
+    assert starts[2] - starts[0] >= 0.18
+
+    # Served from the cache afterwards; a second prefetch replaces fresh entries
+    forecasts = await service.get_forecasts(points[:1])
+    assert len(starts) == 3 and forecasts[0]["run"] == 1
+    await use_case.execute(points[:1])
+    assert (await service.get_forecasts(points[:1]))[0]["run"] == 4